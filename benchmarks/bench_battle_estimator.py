@@ -0,0 +1,79 @@
+# Vectorized Monte Carlo battle estimator versus the scalar engine loop.
+#
+# Estimates win rate, turns and HP lost for each enemy both ways, so the
+# numbers can be compared, and reports battles per second for each.
+#
+# Usage: python benchmarks/bench_battle_estimator.py [--battles N] [--level N]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import (
+    ATTACK, VICTORY, Enemy, GameEngine, GameWorld, Player,
+    estimate_battle_outcomes, player_at_level
+)
+
+class CountingAttackPolicy:
+    """Always attacks, counting turns and remembering the player's health."""
+    def __init__(self):
+        self.turns = 0
+        self.last_health = 0
+
+    def choose_action(self, player, enemy):
+        self.turns += 1
+        # A winning turn ends before the enemy can strike back, so this is
+        # the player's health at the end of a victory (before any level up)
+        self.last_health = player.health
+        return ATTACK
+
+def scalar_estimate(level, enemy, battles, seed):
+    engine = GameEngine(rng=random.Random(seed))
+    policy = CountingAttackPolicy()
+    start_health = player_at_level(level).health
+    wins = hp_lost = 0
+    for _ in range(battles):
+        player = player_at_level(level)
+        fresh_enemy = Enemy(enemy.name, enemy.health, enemy.strength, enemy.loot)
+        if engine.battle(player, fresh_enemy, policy) == VICTORY:
+            wins += 1
+            hp_lost += start_health - policy.last_health
+        else:
+            hp_lost += start_health
+    return wins / battles, policy.turns / battles, hp_lost / battles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--battles', type=int, default=100_000,
+                        help="battles per enemy (default: 100000)")
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+    enemies = list(GameWorld(Player("Hero")).enemies.values())
+
+    started = time.perf_counter()
+    scalar = [scalar_estimate(args.level, enemy, args.battles, args.seed) for enemy in enemies]
+    scalar_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = estimate_battle_outcomes(args.level, enemies, args.battles, args.seed)
+    vectorized_time = time.perf_counter() - started
+
+    print(f"{'enemy':<18} {'win rate':>17} {'turns':>15} {'HP lost':>15}")
+    print(f"{'':<18} {'scalar':>8} {'numpy':>8} {'scalar':>7} {'numpy':>7} {'scalar':>7} {'numpy':>7}")
+    for enemy, (win_rate, turns, hp_lost), estimate in zip(enemies, scalar, vectorized):
+        print(f"{enemy.name:<18} {win_rate:>8.1%} {estimate.win_rate:>8.1%} "
+              f"{turns:>7.2f} {estimate.expected_turns:>7.2f} "
+              f"{hp_lost:>7.2f} {estimate.expected_hp_lost:>7.2f}")
+
+    total = args.battles * len(enemies)
+    print(f"\nscalar:     {total / scalar_time:>12,.0f} battles/s")
+    print(f"vectorized: {total / vectorized_time:>12,.0f} battles/s "
+          f"({scalar_time / vectorized_time:.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Operation rates of the calculator's numeric backends, and power limits.
+#
+# Times each of the six operations under the float, decimal and fraction
+# backends, after checking that results keep the backend's type, that
+# modulus follows the divisor's sign and that expression functions raise
+# the same errors everywhere. Then times powers that
+# would stall a plain a ** b on Python numbers: each must return or raise
+# in well under a second, including formatting results of about a million
+# digits.
+#
+# Usage: python benchmarks/bench_calculator_backends.py [--operations N]
+
+import argparse
+import decimal
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_calculator import (NUMERIC_BACKENDS, CalculationError, DomainError,
+                                ResultTooLargeError, add, divide, evaluate, format_number,
+                                modulus, multiply, power, set_backend, subtract)
+
+NUMBER_TYPES = {"float": float, "decimal": decimal.Decimal, "fraction": Fraction}
+
+# Powers that are instant with the shortcuts or refused by the size limits
+HUGE_POWERS = (
+    ("1", "10^18"),
+    ("-1", "10^18 + 1"),
+    ("2", "10^9"),
+    ("1.000001", "10^12"),
+    ("10", "400"),
+    ("7", "12345"),
+    ("3", "2097152"),
+    ("0.5", "2097152"),
+)
+
+# Expression function calls and the error each must raise in every backend
+FUNCTION_ERRORS = (
+    ("sqrt(-1)", DomainError),
+    ("log(0)", DomainError),
+    ("log(8, 1)", DomainError),
+    ("sin(1e400)", CalculationError),
+    ("exp(10^7)", ResultTooLargeError),
+)
+
+def check_function_errors():
+    messages = {}
+    for name in NUMERIC_BACKENDS:
+        set_backend(name)
+        for expression, error_type in FUNCTION_ERRORS:
+            try:
+                result = evaluate(expression)
+            except error_type as error:
+                messages.setdefault(expression, set()).add(str(error))
+            else:
+                raise AssertionError((name, expression, result))
+    for expression in ("sqrt(-1)", "log(0)", "log(8, 1)"):
+        assert len(messages[expression]) == 1, (expression, messages[expression])
+
+def check_types(name):
+    number_type = NUMBER_TYPES[name]
+    for operation in (add, subtract, multiply, divide, power, modulus):
+        for a, b in ((7, 2), (0.5, 3), ("-7", "3")):
+            result = operation(a, b)
+            assert isinstance(result, number_type), (name, operation.__name__, a, b, result)
+    assert modulus(-7, 3) == 2 and modulus(7, -3) == -2, name
+
+def operation_rates(count, rng):
+    pairs = [(rng.uniform(-100, 100), rng.uniform(0.5, 5)) for _ in range(count)]
+    rates = []
+    for operation in (add, subtract, multiply, divide, power, modulus):
+        started = time.perf_counter()
+        for a, b in pairs:
+            try:
+                operation(a, b)
+            except CalculationError:
+                pass
+        rates.append(count / (time.perf_counter() - started))
+    return rates
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--operations', type=int, default=100_000,
+                        help="operations per measurement (default: 100000)")
+    args = parser.parse_args()
+
+    check_function_errors()
+    names = ("add", "subtract", "multiply", "divide", "power", "modulus")
+    print(f"{'backend':<10}" + "".join(f"{name + '/s':>13}" for name in names))
+    for backend in NUMERIC_BACKENDS:
+        set_backend(backend)
+        check_types(backend)
+        rates = operation_rates(args.operations, random.Random(1234))
+        print(f"{backend:<10}" + "".join(f"{rate:>13,.0f}" for rate in rates))
+
+    print(f"\n{'backend':<10} {'power':<22} {'time (ms)':>10}  result")
+    for backend in NUMERIC_BACKENDS:
+        set_backend(backend)
+        for base, exponent in HUGE_POWERS:
+            exponent_value = parse_exponent(exponent)
+            started = time.perf_counter()
+            try:
+                result = format_number(power(base, exponent_value))
+                result = result if len(result) <= 60 else f"{len(result):,} characters"
+            except CalculationError as error:
+                result = f"{type(error).__name__}: {error}"
+            elapsed = (time.perf_counter() - started) * 1000
+            assert elapsed < 1000, (backend, base, exponent, elapsed)
+            print(f"{backend:<10} {base + ' ^ ' + exponent:<22} {elapsed:>10.3f}  {result}")
+    set_backend("float")
+
+def parse_exponent(text):
+    """Exponents are written as 10^n [+ k] for readability."""
+    if text.startswith("10^"):
+        power_of_ten, _, extra = text[3:].partition(" + ")
+        return 10 ** int(power_of_ten) + int(extra or 0)
+    return int(text)
+
+if __name__ == "__main__":
+    main()
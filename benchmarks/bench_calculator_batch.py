@@ -0,0 +1,86 @@
+# Row-by-row versus vectorized calculator operations, and CSV streaming.
+#
+# Applies each of the six operations to N pairs of numbers, about 1% of
+# them with a zero divisor, first by calling the scalar function per row
+# and then with one apply_elementwise call, and checks that both agree
+# (raised errors on one side, the errors mask on the other). Then writes a
+# CSV file of N rows and times evaluate_csv over it.
+#
+# Usage: python benchmarks/bench_calculator_batch.py [--rows N]
+
+import argparse
+import csv
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_calculator import (add, apply_elementwise, divide, evaluate_csv, modulus,
+                                multiply, power, subtract)
+
+def operands(rows, seed=1234):
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(-100, 100, rows).round(3)
+    b = rng.uniform(-5, 5, rows).round(3)
+    b[rng.random(rows) < 0.01] = 0
+    return a, b
+
+def check(operation, a, b, result):
+    for x, y, value, error in zip(a[:10_000].tolist(), b[:10_000].tolist(),
+                                  result.values.tolist(), result.errors.tolist()):
+        try:
+            expected = operation(x, y)
+        except ArithmeticError:
+            expected = None
+        if expected is None:
+            assert error, (operation.__name__, x, y, expected)
+        else:
+            assert not error and math.isclose(value, expected, rel_tol=1e-12), \
+                (operation.__name__, x, y, value, expected)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help="rows per measurement (default: 1000000)")
+    args = parser.parse_args()
+
+    a, b = operands(args.rows)
+    a_list, b_list = a.tolist(), b.tolist()
+    print(f"{'operation':<10} {'rows/s per row':>15} {'rows/s vector':>15} {'speedup':>8}")
+    for operation in (add, subtract, multiply, divide, power, modulus):
+        started = time.perf_counter()
+        for x, y in zip(a_list, b_list):
+            try:
+                operation(x, y)
+            except ArithmeticError:
+                pass
+        row_rate = args.rows / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        result = apply_elementwise(operation, a, b)
+        vector_rate = args.rows / (time.perf_counter() - started)
+        check(operation, a, b, result)
+        print(f"{operation.__name__:<10} {row_rate:>15,.0f} {vector_rate:>15,.0f} "
+              f"{vector_rate / row_rate:>7.0f}x")
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'input.csv')
+        with open(source, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['a', 'b'])
+            writer.writerows(zip(a_list, b_list))
+        for output in (None, os.path.join(directory, 'output.csv')):
+            started = time.perf_counter()
+            summary = evaluate_csv(source, 'divide', 'a', 'b', output)
+            elapsed = time.perf_counter() - started
+            assert summary.errors == int(np.count_nonzero(b == 0))
+            print(f"\nCSV divide{' with output' if output else ''}: {summary.rows:,} rows, "
+                  f"{summary.errors:,} errors, {summary.rows / elapsed:,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
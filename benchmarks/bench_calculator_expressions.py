@@ -0,0 +1,79 @@
+# Evaluations per second of the calculator's compiled expressions.
+#
+# Each expression is evaluated over many variable values three ways: parsed
+# and compiled on every call, compiled once with a plain tree walk of the
+# parsed nodes, and compiled once to closures (CompiledExpression). The
+# closure results are checked against the tree walk first.
+#
+# Usage: python benchmarks/bench_calculator_expressions.py [--evaluations N]
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_calculator import (BINARY_OPERATORS, CONSTANTS, FUNCTIONS, Binary, Call,
+                                CompiledExpression, Name, Number, Unary, get_backend,
+                                parse_expression)
+
+EXPRESSIONS = (
+    "2^10 * (3 + 4) % 7",
+    "x * 2 + 1",
+    "x^2 + y^2 - 2 * x * y",
+    "sqrt(x^2 + y^2) / (1 + abs(x - y))",
+    "max(x, y, 3) % 7 + sin(x) * cos(y) - log(1 + x)",
+    "((x + 1) * (y - 2) + (x - 3) * (y + 4)) / (x^2 + y^2 + 1)",
+)
+
+def walk(node, env):
+    """Reference evaluator: interpret the node tree on every call."""
+    if isinstance(node, Number):
+        return node.value
+    if isinstance(node, Name):
+        return env[node.name] if node.name in env else CONSTANTS[node.name]
+    if isinstance(node, Unary):
+        value = walk(node.operand, env)
+        return -value if node.op == '-' else value
+    if isinstance(node, Binary):
+        operation = getattr(get_backend(), BINARY_OPERATORS[node.op])
+        return operation(walk(node.left, env), walk(node.right, env))
+    if isinstance(node, Call):
+        return FUNCTIONS[node.name][0](*[walk(arg, env) for arg in node.args])
+    raise TypeError(node)
+
+def rate(function, environments):
+    started = time.perf_counter()
+    for env in environments:
+        function(env)
+    return len(environments) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--evaluations', type=int, default=200_000,
+                        help="evaluations per expression and method (default: 200000)")
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    environments = [{'x': rng.uniform(1, 100), 'y': rng.uniform(1, 100)}
+                    for _ in range(args.evaluations)]
+
+    print(f"{'expression':<58} {'reparse/s':>11} {'tree walk/s':>12} {'compiled/s':>12}")
+    for text in EXPRESSIONS:
+        tree = parse_expression(text)
+        compiled = CompiledExpression(text)
+        for env in environments[:1000]:
+            expected, actual = walk(tree, env), compiled(env)
+            assert math.isclose(actual, expected, rel_tol=1e-12), (text, env, actual, expected)
+
+        reparse = rate(lambda env: CompiledExpression(text)(env),
+                       environments[:max(1, args.evaluations // 20)])
+        tree_walk = rate(lambda env: walk(tree, env), environments)
+        closures = rate(compiled, environments)
+        print(f"{text:<58} {reparse:>11,.0f} {tree_walk:>12,.0f} {closures:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
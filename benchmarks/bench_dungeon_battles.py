@@ -0,0 +1,47 @@
+# Headless battle throughput of the Dungeon Explorer engine.
+#
+# Runs many battles between a fresh level 1 player and each enemy with the
+# always-attack policy and no event listener, and reports battles per second
+# along with the player's win rate.
+#
+# Usage: python benchmarks/bench_dungeon_battles.py [--battles N] [--seed N]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import (
+    VICTORY, AlwaysAttackPolicy, Enemy, GameEngine, GameWorld, Player
+)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--battles', type=int, default=1_000_000,
+                        help="battles per run (default: 1000000)")
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    engine = GameEngine(rng=random.Random(args.seed))
+    policy = AlwaysAttackPolicy()
+    templates = list(GameWorld(Player("Hero"), engine).enemies.values())
+    per_enemy = args.battles // len(templates)
+
+    started = time.perf_counter()
+    for template in templates:
+        wins = 0
+        for _ in range(per_enemy):
+            enemy = Enemy(template.name, template.max_health, template.strength, template.loot)
+            if engine.battle(Player("Hero"), enemy, policy) == VICTORY:
+                wins += 1
+        print(f"{template.name:<18} win rate {wins / per_enemy:6.1%}")
+    elapsed = time.perf_counter() - started
+
+    total = per_enemy * len(templates)
+    print(f"\n{total:,} battles in {elapsed:.2f}s ({total / elapsed:,.0f} battles/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Map generation, routing index build and route query timings.
+#
+# Generates a dungeon, builds its landmark (ALT) routing index and compares
+# A* route queries and O(landmarks) distance bounds against plain BFS.
+#
+# Usage: python benchmarks/bench_dungeon_routing.py [--size N] [--queries N]
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import RoutingIndex, generate_dungeon_map
+
+def bfs_hops(dungeon_map, source, target):
+    """Reference hop count by breadth-first search."""
+    hops = {source: 0}
+    queue = deque([source])
+    while queue:
+        room = queue.popleft()
+        if room == target:
+            return hops[room]
+        for neighbour in dungeon_map.neighbor_ids(room):
+            if neighbour not in hops:
+                hops[neighbour] = hops[room] + 1
+                queue.append(neighbour)
+    return None
+
+def timed(label, function, count=1):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    if count > 1:
+        print(f"{label:<28} {elapsed / count * 1e6:12.1f} us/query")
+    else:
+        print(f"{label:<28} {elapsed:12.2f} s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100_000,
+                        help="locations in the generated map (default: 100000)")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    dungeon_map = timed("generate map", lambda: generate_dungeon_map(args.size, seed=args.seed))
+    index = timed("build routing index", lambda: RoutingIndex(dungeon_map))
+    print(f"{'map memory (CSR arrays)':<28} {(dungeon_map.offsets.itemsize * len(dungeon_map.offsets) + dungeon_map.targets.itemsize * len(dungeon_map.targets)) / 2**20:12.1f} MiB\n")
+
+    rng = random.Random(args.seed)
+    queries = [(rng.randrange(args.size), rng.randrange(args.size))
+               for _ in range(args.queries)]
+
+    routes = timed("A* with landmarks", lambda: [index.shortest_path(source, target)
+                                                 for source, target in queries], len(queries))
+    expected = timed("BFS", lambda: [bfs_hops(dungeon_map, source, target)
+                                     for source, target in queries], len(queries))
+    assert [len(route) - 1 for route in routes] == expected, "routes are not shortest"
+    timed("distance bounds", lambda: [index.distance_bounds(source, target)
+                                      for source, target in queries * 100], len(queries) * 100)
+    print(f"\nmean route length: {sum(expected) / len(expected):.1f} hops")
+
+if __name__ == "__main__":
+    main()
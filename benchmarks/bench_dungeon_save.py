@@ -0,0 +1,86 @@
+# Save, autosave and load times for large Dungeon Explorer worlds.
+#
+# Generates a world with about --entities enemies, plays some headless
+# battles, saves it, and checks that loading (with and without mmap) gives
+# back the same world. Then damages a few enemies, appends an incremental
+# autosave and checks the round trip again.
+#
+# Usage: python benchmarks/bench_dungeon_save.py [--entities N] [--seed N]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import (
+    AlwaysAttackPolicy, GameEngine, GameWorld, Player, autosave_game, load_game,
+    save_game
+)
+
+def world_state(world):
+    """Everything a save must preserve, in comparable form."""
+    player = world.player
+    enemies = world.enemies
+    store = enemies.store
+    return (
+        (player.name, player.health, player.max_health, player.strength,
+         player.experience, player.level, player.inventory, world.current_location),
+        bytes(world.locations.offsets), bytes(world.locations.targets),
+        bytes(enemies.entity_ids),
+        [bytes(column) for column in (store.health, store.max_health, store.strength,
+                                      store.name_ids, store.loot_ids)],
+        store.names.strings, store.items.strings, store.loot_tables.strings,
+        {entity_id: list(items) for entity_id, items in store.inventories.items()},
+    )
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+def check_round_trip(world, path, label):
+    expected = world_state(world)
+    for use_mmap in (True, False):
+        loaded, elapsed = timed(load_game, path, use_mmap=use_mmap)
+        assert world_state(loaded) == expected, f"{label}: loaded world differs"
+        mode = "mmap" if use_mmap else "read"
+        print(f"{label:<10} load ({mode}): {elapsed * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entities', type=int, default=100_000,
+                        help="approximate number of enemies (default: 100000)")
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    world = GameWorld.generate(Player("Hero"), args.entities * 2, args.seed,
+                               enemy_chance=0.5, engine=GameEngine(rng))
+    policy = AlwaysAttackPolicy(rng)
+    for _ in range(200):
+        world.engine.explore(world, policy)
+        world.player.heal(world.player.max_health)
+    print(f"{len(world.enemies.store)} entities on {len(world.locations)} locations")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'world.sav')
+        _, elapsed = timed(save_game, world, path)
+        print(f"full save:          {elapsed * 1000:8.1f} ms, {os.path.getsize(path):,} bytes")
+        check_round_trip(world, path, "full")
+
+        store = world.enemies.store
+        for entity_id in rng.sample(range(len(store)), 100):
+            store.view(entity_id).take_damage(1)
+        store.view(0).add_to_inventory("Autosave Token")
+        size = os.path.getsize(path)
+        _, elapsed = timed(autosave_game, world, path)
+        print(f"autosave:           {elapsed * 1000:8.1f} ms, "
+              f"{os.path.getsize(path) - size:,} bytes appended")
+        check_round_trip(world, path, "autosave")
+
+if __name__ == "__main__":
+    main()
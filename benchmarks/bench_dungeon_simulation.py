@@ -0,0 +1,43 @@
+# Throughput of simulate_playthroughs for increasing worker counts.
+#
+# Every run uses the same seed, so the aggregated reports must be identical
+# regardless of the number of workers; the script checks this and reports
+# playthroughs per second and the speedup over a single process.
+#
+# Usage: python benchmarks/bench_dungeon_simulation.py [--runs N] [--max-workers N]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import SIMULATION_POLICIES, simulate_playthroughs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=20_000,
+                        help="playthroughs per measurement (default: 20000)")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help="largest worker count to try (default: CPU count)")
+    parser.add_argument('--policy', choices=SIMULATION_POLICIES, default='cautious')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    worker_counts = sorted({1, 2, args.max_workers} | {
+        count for count in (4, 8, 16, 32) if count < args.max_workers})
+    baseline = expected = None
+    print(f"{'workers':>8} {'runs/s':>12} {'speedup':>8}")
+    for workers in worker_counts:
+        started = time.perf_counter()
+        report = simulate_playthroughs(args.runs, args.seed, workers, policy=args.policy)
+        rate = args.runs / (time.perf_counter() - started)
+
+        if expected is None:
+            baseline, expected = rate, report.as_dict()
+        assert report.as_dict() == expected, f"report differs with {workers} workers"
+        print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
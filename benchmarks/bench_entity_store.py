@@ -0,0 +1,59 @@
+# Memory per entity: Enemy objects versus the struct-of-arrays EntityStore.
+#
+# Builds the same number of enemies both ways, reports traced memory per
+# entity, and runs a battle against a stored enemy through its facade.
+#
+# Usage: python benchmarks/bench_entity_store.py [--count N]
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import (
+    AlwaysAttackPolicy, Enemy, EntityStore, GameEngine, GameWorld, Player
+)
+
+def measure(build):
+    """Return what build() returned and the bytes it allocated."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000,
+                        help="enemies to create (default: 200000)")
+    args = parser.parse_args()
+    templates = list(GameWorld(Player("Hero")).enemies.values())
+
+    def build_objects():
+        return [Enemy(t.name, t.max_health, t.strength, t.loot)
+                for t in (templates[i % len(templates)] for i in range(args.count))]
+
+    def build_store():
+        store = EntityStore()
+        for i in range(args.count):
+            store.add_enemy(templates[i % len(templates)])
+        return store
+
+    objects, object_bytes = measure(build_objects)
+    del objects
+    store, store_bytes = measure(build_store)
+
+    print(f"Enemy objects: {object_bytes / args.count:7.1f} bytes/entity")
+    print(f"EntityStore:   {store_bytes / args.count:7.1f} bytes/entity "
+          f"({object_bytes / store_bytes:.1f}x smaller)")
+
+    # The facade works with the regular battle rules
+    enemy = store.view(args.count - 1)
+    outcome = GameEngine(rng=random.Random(1)).battle(Player("Hero"), enemy, AlwaysAttackPolicy())
+    print(f"\nBattle against stored {enemy.name}: {outcome}, enemy health {enemy.health}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Cost per event of the real-time mode's EventScheduler.
+#
+# Schedules N events at random times on a fake clock, then runs them in
+# batched ticks, for growing N; the per-event cost should grow only
+# logarithmically. A second check runs the asyncio loop with a few slow
+# timers and reports CPU time used while idle, which stays near zero
+# because the loop sleeps until the next event instead of polling.
+#
+# Usage: python benchmarks/bench_event_scheduler.py [--max-events N]
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_dungeon_explorer_adventure_game import EventScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def time_batched_ticks(count, tick=0.05, seed=1234):
+    """Schedule count events over 60 simulated seconds and run them tick by tick."""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    scheduler = EventScheduler(clock)
+    fired = []
+
+    started = time.perf_counter()
+    for _ in range(count):
+        scheduler.schedule(rng.random() * 60, fired.append, None)
+    # Cancel a tenth of them to exercise lazy deletion
+    for entry in rng.sample(scheduler.queue, count // 10):
+        scheduler.cancel(entry)
+    ticks = 0
+    while scheduler.queue:
+        clock.now += tick
+        scheduler.run_due()
+        ticks += 1
+    elapsed = time.perf_counter() - started
+
+    assert len(fired) == count - count // 10, "some events did not fire exactly once"
+    return elapsed / count * 1e6, ticks
+
+async def idle_cpu(seconds):
+    """CPU seconds used while running the scheduler with sparse timers."""
+    scheduler = EventScheduler()
+    stopped = asyncio.Event()
+    calls = []
+    scheduler.every(0.25, calls.append, None)
+    scheduler.schedule(seconds, stopped.set)
+
+    cpu_started = time.process_time()
+    await scheduler.run(stopped)
+    return time.process_time() - cpu_started, len(calls)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-events', type=int, default=1_000_000,
+                        help="largest number of scheduled events (default: 1000000)")
+    parser.add_argument('--idle-seconds', type=float, default=2.0,
+                        help="wall time for the idle CPU check (default: 2)")
+    args = parser.parse_args()
+
+    print(f"{'events':>10} {'us/event':>10} {'ticks':>8}")
+    count = 1_000
+    while count <= args.max_events:
+        per_event, ticks = time_batched_ticks(count)
+        print(f"{count:>10,} {per_event:>10.2f} {ticks:>8}")
+        count *= 10
+
+    cpu, calls = asyncio.run(idle_cpu(args.idle_seconds))
+    print(f"\nidle loop: {cpu * 1000:.1f} ms CPU over {args.idle_seconds:g}s wall, "
+          f"{calls} timer callbacks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Frame latency and bytes written per turn of the Hangman TerminalRenderer.
+#
+# Replays games guessed by the frequency strategy and draws every turn two
+# ways: the diff-based renderer, and a full redraw of the frame after a
+# clear, like the old os.system('clear') loop printed. Reports time to
+# build and write a frame and bytes sent per turn, plus the cost of
+# spawning the clear command that every old turn paid on top.
+#
+# Usage: python benchmarks/bench_hangman_render.py [--games N]
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_hangman_game import FrequencyStrategy, HangmanGame, TerminalRenderer
+
+class CountingStream:
+    """Text stream that only counts the UTF-8 bytes written to it."""
+    def __init__(self):
+        self.bytes = 0
+        self.writes = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode('utf-8'))
+        self.writes += 1
+
+    def flush(self):
+        pass
+
+def game_turns(game, word):
+    """Game states (guessed letters, attempts left, message) of one game."""
+    strategy = FrequencyStrategy()
+    guessed, attempts_left, message = set(), game.max_attempts, ""
+    turns = [(frozenset(guessed), attempts_left, message)]
+    while attempts_left > 0 and not set(word) <= guessed:
+        guess = strategy.guess(None, game._word_pattern(word, guessed), guessed)
+        guessed.add(guess)
+        if guess in word:
+            message = "✅ Correct guess!"
+        else:
+            attempts_left -= 1
+            message = f"❌ Wrong guess! {attempts_left} attempts remaining."
+        turns.append((frozenset(guessed), attempts_left, message))
+    return turns
+
+def replay(game, games, full_redraw):
+    """Draw every turn of every game; return seconds, turns and the stream."""
+    stream = CountingStream()
+    game.renderer = TerminalRenderer(stream, ansi=True)
+    turns = 0
+    started = time.perf_counter()
+    for word, states in games:
+        game.renderer.reset()
+        for guessed, attempts_left, message in states:
+            if full_redraw:
+                game.renderer.reset()
+            game._display_game_state(word, guessed, attempts_left, message)
+            turns += 1
+    return time.perf_counter() - started, turns, stream
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--games', type=int, default=20_000,
+                        help="games to replay (default: 20000)")
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    game = HangmanGame('easy')
+    words = [word for words in HangmanGame.WORD_CATEGORIES.values() for word in words]
+    games = [(word, game_turns(game, word))
+             for word in (rng.choice(words) for _ in range(args.games))]
+
+    print(f"{'renderer':<14} {'us/frame':>9} {'bytes/turn':>11} {'writes/turn':>12}")
+    for name, full_redraw in (("full redraw", True), ("diff", False)):
+        elapsed, turns, stream = replay(game, games, full_redraw)
+        print(f"{name:<14} {elapsed / turns * 1e6:>9.2f} {stream.bytes / turns:>11.1f} "
+              f"{stream.writes / turns:>12.1f}")
+
+    clear = shutil.which('cls' if os.name == 'nt' else 'clear')
+    if clear:
+        runs = 50
+        started = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([clear], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           env=dict(os.environ, TERM=os.environ.get('TERM', 'xterm')))
+        print(f"\nspawning {clear}: {(time.perf_counter() - started) / runs * 1e6:,.0f} us "
+              f"per turn in the old loop")
+
+if __name__ == "__main__":
+    main()
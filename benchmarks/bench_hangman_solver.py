@@ -0,0 +1,95 @@
+# Hint latency of the bitset HangmanSolver on large dictionaries.
+#
+# Checks the solver's candidate filtering and suggestions against a plain
+# Python reference on a small dictionary, then indexes --words synthetic
+# words of one length and times hints along a game's worth of guesses.
+#
+# Usage: python benchmarks/bench_hangman_solver.py [--words N] [--length N]
+
+import argparse
+import math
+import os
+import random
+import string
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_hangman_game import HangmanGame, HangmanSolver
+
+def random_words(count, length, rng):
+    # Skewed letter frequencies, so words look more like a real dictionary
+    weights = [len(string.ascii_lowercase) - index for index in range(26)]
+    letters = rng.choices("etaoinshrdlcumwfgypbvkjxqz", weights, k=count * length)
+    return ''.join(letters).encode('ascii')
+
+def pattern_for(word, guessed):
+    return ''.join(letter if letter in guessed else '_' for letter in word)
+
+def reference_suggest(words, pattern, guessed):
+    """Straightforward filter and information gain over a list of words."""
+    candidates = [word for word in words if pattern_for(word, guessed) == pattern]
+    if not candidates:
+        return None, 0
+    best, best_score = None, None
+    for letter in string.ascii_lowercase:
+        if letter in guessed:
+            continue
+        outcomes = Counter(tuple(ch == letter for ch in word) for word in candidates)
+        gain = -sum(size / len(candidates) * math.log2(size / len(candidates))
+                    for size in outcomes.values())
+        score = (gain, sum(letter in word for word in candidates))
+        if best_score is None or score > best_score:
+            best, best_score = letter, score
+    return best, len(candidates)
+
+def check_against_reference(rng):
+    length = 5
+    data = random_words(3000, length, rng)
+    words = [data[i:i + length].decode() for i in range(0, len(data), length)]
+    solver = HangmanSolver(data, length)
+    for _ in range(200):
+        secret = rng.choice(words)
+        guessed = set(rng.sample(string.ascii_lowercase, rng.randint(0, 8)))
+        pattern = pattern_for(secret, guessed)
+        letter, count = solver.suggest(pattern, guessed)
+        expected_letter, expected_count = reference_suggest(words, pattern, guessed)
+        assert count == expected_count, (pattern, guessed, count, expected_count)
+        assert letter == expected_letter, (pattern, guessed, letter, expected_letter)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=1_000_000,
+                        help="words in the dictionary (default: 1000000)")
+    parser.add_argument('--length', type=int, default=8,
+                        help="length of every word (default: 8)")
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    check_against_reference(rng)
+
+    data = random_words(args.words, args.length, rng)
+    started = time.perf_counter()
+    solver = HangmanSolver(data, args.length)
+    print(f"indexed {args.words:,} words in {time.perf_counter() - started:.2f}s")
+
+    secret = data[:args.length].decode()
+    guessed = set()
+    print(f"{'guesses':>8} {'candidates':>11} {'hint (ms)':>10}  letter")
+    while set(secret) - guessed:
+        pattern = pattern_for(secret, guessed)
+        started = time.perf_counter()
+        letter, count = solver.suggest(pattern, guessed)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{len(guessed):>8} {count:>11,} {elapsed:>10.2f}  {letter}")
+        guessed.add(letter)
+
+    game = HangmanGame()
+    game.category = "animals"
+    print(f"\nbuilt-in 'animals' first hint for 8 letters: "
+          f"{game.suggest_letter('elephant', set())}")
+
+if __name__ == "__main__":
+    main()
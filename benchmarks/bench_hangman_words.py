@@ -0,0 +1,77 @@
+# Open and pick times of the Hangman WordStore as dictionaries grow.
+#
+# Writes synthetic word lists with N words per category, builds an index
+# for each size, and reports build time, open time and the cost of picking
+# a random word. Open and pick times should stay flat as N grows. Also
+# checks that picks are uniform over the matching words.
+#
+# Usage: python benchmarks/bench_hangman_words.py [--max-words N]
+
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import timeit
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_hangman_game import HangmanGame, WordStore
+
+CATEGORIES = ("animals", "countries", "programming")
+
+def write_word_lists(directory, count, seed=1234):
+    rng = random.Random(seed)
+    for category in CATEGORIES:
+        with open(os.path.join(directory, category + '.txt'), 'w') as file:
+            for _ in range(count):
+                length = rng.randint(3, 14)
+                file.write(''.join(rng.choice(string.ascii_lowercase)
+                                   for _ in range(length)) + '\n')
+
+def check_uniform(store, picks=60_000):
+    """Every built-in word of a category should come up about equally often."""
+    rng = random.Random(1)
+    counts = Counter(store.random_word("animals", rng=rng) for _ in range(picks))
+    expected = set(HangmanGame.WORD_CATEGORIES["animals"])
+    assert set(counts) == expected, "picks do not cover exactly the category's words"
+    mean = picks / len(expected)
+    assert all(abs(count - mean) < mean * 0.1 for count in counts.values()), counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-words', type=int, default=1_000_000,
+                        help="largest words per category (default: 1000000)")
+    args = parser.parse_args()
+
+    check_uniform(HangmanGame.default_word_store())
+
+    print(f"{'words':>10} {'build (s)':>10} {'open (ms)':>10} {'pick (us)':>10}")
+    count = 1_000
+    with tempfile.TemporaryDirectory() as directory:
+        while count <= args.max_words:
+            lists = os.path.join(directory, str(count))
+            os.mkdir(lists)
+            write_word_lists(lists, count)
+            path = os.path.join(directory, f'{count}.idx')
+
+            started = time.perf_counter()
+            WordStore.build_from_directory(lists, path).close()
+            build_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            store = WordStore(path)
+            open_time = time.perf_counter() - started
+            store.random_word("animals", "medium")
+            pick_time = timeit.timeit(lambda: store.random_word("animals", "medium"),
+                                      number=100_000) / 100_000
+            store.close()
+            print(f"{count * len(CATEGORIES):>10,} {build_time:>10.2f} "
+                  f"{open_time * 1000:>10.3f} {pick_time * 1e6:>10.2f}")
+            count *= 10
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Per-password latency of PasswordAnalyzer.analyze_password.
+#
+# Compares the single-pass analysis core against the original multi-pass
+# implementation (kept below as a reference) for lengths 8 to 1024.
+#
+# Usage: python benchmarks/bench_password_analysis.py [--repeat N]
+
+import argparse
+import math
+import os
+import random
+import re
+import string
+import sys
+import timeit
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_check_password_strength import PasswordAnalyzer
+
+LENGTHS = (8, 16, 32, 64, 128, 256, 512, 1024)
+ALPHABET = string.ascii_letters + string.digits + string.punctuation + "éßΩ€ "
+
+def legacy_analyze_password(password):
+    """Original multi-pass analysis, used as the 'before' baseline."""
+    lowercase, uppercase = string.ascii_lowercase, string.ascii_uppercase
+    digits, punctuation = string.digits, string.punctuation
+    normalized_password = unicodedata.normalize('NFKD', password)
+    analysis = {
+        'length': len(normalized_password),
+        'lowercase_count': sum(1 for c in normalized_password if c in lowercase),
+        'uppercase_count': sum(1 for c in normalized_password if c in uppercase),
+        'digit_count': sum(1 for c in normalized_password if c in digits),
+        'special_char_count': sum(1 for c in normalized_password if c in punctuation),
+        'unicode_chars': len(set(normalized_password))
+    }
+    char_sets = set()
+    if any(c in lowercase for c in normalized_password):
+        char_sets.add(lowercase)
+    if any(c in uppercase for c in normalized_password):
+        char_sets.add(uppercase)
+    if any(c in digits for c in normalized_password):
+        char_sets.add(digits)
+    if any(c in punctuation for c in normalized_password):
+        char_sets.add(punctuation)
+    total_possible_chars = sum(len(char_set) for char_set in char_sets)
+    entropy_bits = (
+        analysis['length'] * math.log2(total_possible_chars)
+        if total_possible_chars else 0.0
+    )
+    analysis['patterns'] = {
+        'sequential': bool(re.search(r'(123|abc|qwerty)', normalized_password.lower())),
+        'repeating_chars': bool(re.search(r'(.)\1{2,}', normalized_password)),
+        'common_substitutions': bool(re.search(r'[@]|[1!]|[0o]', normalized_password))
+    }
+    analysis['entropy_bits'] = round(entropy_bits, 2)
+    return analysis
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000,
+                        help="analyses per password length (default: 2000)")
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    analyzer = PasswordAnalyzer()
+
+    print(f"{'length':>8} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for length in LENGTHS:
+        password = ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+        # Both implementations must agree before their timings mean anything
+        expected = legacy_analyze_password(password)
+        actual = analyzer.analyze_password(password)
+        actual.pop('strength_rating')
+        # Only the original detectors existed in the baseline
+        actual['patterns'] = {name: actual['patterns'][name]
+                              for name in expected['patterns']}
+        assert actual == expected, f"analysis mismatch for length {length}"
+
+        before = timeit.timeit(lambda: legacy_analyze_password(password),
+                               number=args.repeat) / args.repeat * 1e6
+        after = timeit.timeit(lambda: analyzer.analyze_password(password),
+                              number=args.repeat) / args.repeat * 1e6
+        print(f"{length:>8} {before:>12.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Throughput of scalar versus NumPy-vectorized password analysis.
+#
+# Checks that PasswordAnalyzer.analyze_batch agrees exactly with
+# analyze_password, then reports passwords per second for both paths.
+#
+# Usage: python benchmarks/bench_password_batch.py [--count N] [--batch-size N]
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_check_password_strength import PasswordAnalyzer
+
+ALPHABET = string.ascii_letters + string.digits + string.punctuation + "éßΩ€ "
+
+def random_passwords(count, seed=1234):
+    """Generate a reproducible mix of password lengths and alphabets."""
+    rng = random.Random(seed)
+    return [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 32)))
+            for _ in range(count)]
+
+def check_batch_matches_scalar(analyzer, passwords):
+    """Compare every field of the batch results with the scalar ones."""
+    batch = analyzer.analyze_batch(passwords)
+    for row, password in enumerate(passwords):
+        expected = analyzer.analyze_password(password)
+        for key, value in expected.items():
+            if key == 'patterns':
+                actual = {name: bool(found[row]) for name, found in batch['patterns'].items()}
+            else:
+                actual = batch[key][row]
+            assert actual == value, f"{key} mismatch for {password!r}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000,
+                        help="passwords to analyze (default: 200000)")
+    parser.add_argument('--batch-size', type=int, default=4096,
+                        help="passwords per analyze_batch call (default: 4096)")
+    args = parser.parse_args()
+
+    analyzer = PasswordAnalyzer()
+    passwords = random_passwords(args.count)
+    check_batch_matches_scalar(analyzer, passwords[:20_000])
+
+    started = time.perf_counter()
+    for password in passwords:
+        analyzer.analyze_password(password)
+    scalar_rate = args.count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for offset in range(0, args.count, args.batch_size):
+        analyzer.analyze_batch(passwords[offset:offset + args.batch_size])
+    batch_rate = args.count / (time.perf_counter() - started)
+
+    print(f"scalar:     {scalar_rate:>12,.0f} passwords/s")
+    print(f"vectorized: {batch_rate:>12,.0f} passwords/s ({batch_rate / scalar_rate:.1f}x)")
+
+if __name__ == "__main__":
+    main()
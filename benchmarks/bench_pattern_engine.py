@@ -0,0 +1,89 @@
+# Per-detector timings and dictionary scaling of the pattern engine.
+#
+# First checks that passwords whose only new detections overlap the
+# original three patterns keep their original rating. Then prints how long
+# each detection stage of the default PatternEngine takes, and shows that
+# the per-password scan cost stays flat as the dictionary detector grows,
+# since all words share one automaton.
+#
+# Usage: python benchmarks/bench_pattern_engine.py [--count N]
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_check_password_strength import (DEFAULT_PATTERN_ENGINE, PasswordAnalyzer,
+                                              build_pattern_engine)
+
+DICTIONARY_SIZES = (0, 1_000, 10_000, 100_000)
+
+# Patterns of the checker before the pattern engine
+ORIGINAL_PATTERNS = ('sequential', 'repeating_chars', 'common_substitutions')
+
+# New patterns that only restate an original one when both are found
+RESTATED_PATTERNS = {'keyboard_walk': 'sequential', 'leetspeak': 'common_substitutions'}
+
+# Passwords that set a new detector and an original one for one weakness
+OVERLAPPING = ('qwerty12', 'abcd1234', 'p@ssw0rd', 'Qwerty!2024x', '1234abcd!!',
+               'l3tm3in99', 'zxcvQWERTY1', 'm0nk3y@abc')
+
+def check_original_ratings(passwords):
+    """Penalizing only the original patterns must give the same rating."""
+    analyzer = PasswordAnalyzer()
+    checked = 0
+    for password in passwords:
+        analysis = analyzer.analyze(password)
+        found = [name for name, exists in analysis.patterns if exists]
+        original = [name for name in found if name in ORIGINAL_PATTERNS]
+        if any(name not in original and RESTATED_PATTERNS.get(name) not in original
+               for name in found):
+            continue
+        expected = analyzer._rate_password_strength(
+            analysis._replace(patterns=tuple((name, True) for name in original)))
+        assert analysis.strength_rating == expected, (password, found, expected)
+        checked += 1
+    return checked
+
+def random_passwords(count, seed=1234):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(8, 24)))
+            for _ in range(count)]
+
+def random_words(count, seed=4321):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+            for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=50_000,
+                        help="passwords to scan (default: 50000)")
+    args = parser.parse_args()
+    passwords = random_passwords(args.count)
+
+    checked = check_original_ratings(OVERLAPPING + tuple(passwords))
+    assert checked >= len(OVERLAPPING)
+    print(f"Original ratings kept for {checked:,} passwords\n")
+
+    print("Per-detector time (default engine):")
+    for stage, seconds in DEFAULT_PATTERN_ENGINE.profile(passwords).items():
+        print(f"  {stage:<70} {seconds / args.count * 1e6:8.2f} us/password")
+
+    print("\nScan cost by dictionary size:")
+    words = random_words(max(DICTIONARY_SIZES))
+    for size in DICTIONARY_SIZES:
+        engine = build_pattern_engine(words[:size])
+        started = time.perf_counter()
+        for password in passwords:
+            engine.scan(password)
+        elapsed = time.perf_counter() - started
+        print(f"  {size:>8} words {elapsed / args.count * 1e6:8.2f} us/password")
+
+if __name__ == "__main__":
+    main()
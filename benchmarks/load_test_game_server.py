@@ -0,0 +1,138 @@
+# Load test for the Dungeon Explorer game server.
+#
+# Connects many simulated players to a running server (or starts one on a
+# Unix socket), has each send a stream of look/stats/inventory/go commands,
+# and reports command latency percentiles, throughput and the server's
+# per-session memory accounting.
+#
+# Usage: python benchmarks/load_test_game_server.py [--clients N] [--commands N]
+#            [--address HOST:PORT | unix:PATH]
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from project_dungeon_explorer_adventure_game import END_OF_RESPONSE
+
+async def connect(address):
+    if address.startswith('unix:'):
+        return await asyncio.open_unix_connection(address[len('unix:'):])
+    host, _, port = address.rpartition(':')
+    return await asyncio.open_connection(host or 'localhost', int(port))
+
+async def request(reader, writer, line):
+    """Send one line and return the reply lines, or None if the server hung up."""
+    writer.write(line.encode('utf-8') + b'\n')
+    reply = []
+    while True:
+        try:
+            raw = await reader.readline()
+        except OSError:
+            return None
+        if not raw:
+            return None
+        text = raw.decode('utf-8').rstrip('\n')
+        if text == END_OF_RESPONSE:
+            return reply
+        reply.append(text)
+
+async def play(address, client, commands, latencies, rng):
+    """One simulated player: wander around and check on itself."""
+    reader, writer = await connect(address)
+    try:
+        if await request(reader, writer, f"Player{client}") is None:
+            return None
+        paths = []
+        for _ in range(commands):
+            choice = rng.random()
+            if choice < 0.4 and paths:
+                line = f"go {rng.choice(paths)}"
+            elif choice < 0.7:
+                line = "look"
+            elif choice < 0.9:
+                line = "stats"
+            else:
+                line = "inventory"
+            started = time.perf_counter()
+            reply = await request(reader, writer, line)
+            latencies.append(time.perf_counter() - started)
+            if reply is None:
+                # Defeated players are disconnected
+                return None
+            for text in reply:
+                if "Paths: " in text:
+                    paths = text.split("Paths: ", 1)[1].split(", ")
+        reply = await request(reader, writer, "memory")
+        return next((text for text in reply or () if "Session memory" in text), None)
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def start_server(address):
+    """Start the game server in a subprocess and wait until it accepts clients."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.join(ROOT, 'project_dungeon_explorer_adventure_game.py'),
+        '--serve', address, stdout=asyncio.subprocess.PIPE)
+    await process.stdout.readline()
+    return process
+
+async def run(args):
+    process = None
+    address = args.address
+    with tempfile.TemporaryDirectory() as directory:
+        if address is None:
+            address = 'unix:' + os.path.join(directory, 'game.sock')
+            process = await start_server(address)
+        try:
+            rng = random.Random(args.seed)
+            latencies = []
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def limited(client):
+                async with semaphore:
+                    return await play(address, client, args.commands, latencies,
+                                      random.Random(rng.random()))
+
+            started = time.perf_counter()
+            memory = await asyncio.gather(*(limited(client) for client in range(args.clients)))
+            elapsed = time.perf_counter() - started
+        finally:
+            if process is not None:
+                process.terminate()
+                await process.wait()
+
+    sizes = [int(text.split(": ")[1].split()[0]) for text in memory if text]
+    print(f"{args.clients} clients, {len(latencies)} commands in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} commands/s)")
+    print(f"latency p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+    if sizes:
+        print(f"session memory: mean {statistics.mean(sizes):,.0f} bytes, "
+              f"max {max(sizes):,} bytes ({len(sizes)} sessions reporting)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--address', help="server to test (default: start one locally)")
+    parser.add_argument('--clients', type=int, default=2000,
+                        help="simulated players (default: 2000)")
+    parser.add_argument('--concurrency', type=int, default=1000,
+                        help="players connected at once (default: 1000)")
+    parser.add_argument('--commands', type=int, default=20,
+                        help="commands per player (default: 20)")
+    parser.add_argument('--seed', type=int, default=1234)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Concurrency stress run for the Hangman ScoreStore.
+#
+# Several processes record scores into one database at the same time, in
+# batches and one by one. Every score must arrive exactly once. The run
+# also times top-K leaderboard queries and shows that they use an index.
+#
+# Usage: python benchmarks/stress_hangman_scores.py [--processes N] [--scores N]
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_hangman_game import WORD_DIFFICULTIES, ScoreStore
+
+def record_scores(task):
+    path, worker, count, batch_size = task
+    rng = random.Random(worker)
+    with ScoreStore(path, batch_size=batch_size) as store:
+        for index in range(count):
+            store.record(f"player{worker}", rng.choice(WORD_DIFFICULTIES),
+                         rng.randint(1, 1000), f"w{worker}-{index}")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, default=8,
+                        help="concurrent writer processes (default: 8)")
+    parser.add_argument('--scores', type=int, default=20_000,
+                        help="scores per process (default: 20000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scores.db')
+        ScoreStore(path).close()
+
+        # Unbatched writes commit once per score, so they get fewer scores
+        runs = ((1, max(1, args.scores // 20)), (64, args.scores))
+        for batch_size, count in runs:
+            tasks = [(path, batch_size * 1000 + worker, count, batch_size)
+                     for worker in range(args.processes)]
+            started = time.perf_counter()
+            with multiprocessing.Pool(args.processes) as pool:
+                written = sum(pool.map(record_scores, tasks))
+            elapsed = time.perf_counter() - started
+            print(f"batch size {batch_size:>3}: {written:>8,} scores from {args.processes} "
+                  f"processes in {elapsed:.2f}s ({written / elapsed:,.0f}/s)")
+
+        with ScoreStore(path) as store:
+            rows = store._query("SELECT COUNT(*), COUNT(DISTINCT word) FROM scores", ())
+            total, distinct = rows[0]
+            expected = sum(args.processes * count for _, count in runs)
+            assert total == distinct == expected, f"{total} rows, {distinct} distinct, " \
+                                                  f"expected {expected}"
+
+            plan = store._query("EXPLAIN QUERY PLAN SELECT player, difficulty, score, word "
+                                "FROM scores WHERE difficulty = ? ORDER BY score DESC, id "
+                                "LIMIT 10", ('hard',))
+            print("leaderboard plan:", "; ".join(row[-1] for row in plan))
+            started = time.perf_counter()
+            for _ in range(1000):
+                store.top(10, difficulty='hard')
+                store.top(10, player='player64000', difficulty='easy')
+            print(f"top-10 queries: {(time.perf_counter() - started) / 2000 * 1e6:.1f} us each")
+    print(f"all {expected:,} scores stored exactly once")
+
+if __name__ == "__main__":
+    main()
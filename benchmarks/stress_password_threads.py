@@ -0,0 +1,79 @@
+# Concurrency stress run for a shared PasswordAnalyzer.
+#
+# One analyzer instance is shared by a thread pool and by many concurrent
+# analyze_async calls. Every result is compared with a single-threaded run,
+# so any state leaking between concurrent analyses shows up as a mismatch.
+#
+# Usage: python benchmarks/stress_password_threads.py [--count N] [--threads N]
+
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_check_password_strength import PasswordAnalyzer
+
+def random_passwords(count, seed=1234):
+    """Mix very weak and very strong passwords so leaked state changes ratings."""
+    rng = random.Random(seed)
+    passwords = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            passwords.append(''.join(rng.choice(string.ascii_lowercase)
+                                     for _ in range(rng.randint(1, 6))))
+        else:
+            alphabet = string.ascii_letters + string.digits + string.punctuation
+            passwords.append(''.join(rng.choice(alphabet)
+                                     for _ in range(rng.randint(20, 64))))
+    return passwords
+
+def count_mismatches(results, expected):
+    return sum(1 for actual, wanted in zip(results, expected) if actual != wanted)
+
+async def analyze_all_async(analyzer, passwords, executor):
+    return await asyncio.gather(*(analyzer.analyze_async(password, executor)
+                                  for password in passwords))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=50_000,
+                        help="passwords per run (default: 50000)")
+    parser.add_argument('--threads', type=int, default=32,
+                        help="worker threads (default: 32)")
+    args = parser.parse_args()
+
+    # Switch threads as often as possible to provoke interleaving
+    sys.setswitchinterval(1e-6)
+
+    analyzer = PasswordAnalyzer()
+    passwords = random_passwords(args.count)
+    expected = [analyzer.analyze_password(password) for password in passwords]
+
+    with ThreadPoolExecutor(args.threads) as executor:
+        started = time.perf_counter()
+        threaded = list(executor.map(analyzer.analyze_password, passwords))
+        threaded_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        awaited = asyncio.run(analyze_all_async(analyzer, passwords, executor))
+        async_time = time.perf_counter() - started
+
+    failures = 0
+    for label, results, elapsed in (("thread pool", threaded, threaded_time),
+                                    ("analyze_async", awaited, async_time)):
+        mismatches = count_mismatches(results, expected)
+        failures += mismatches
+        print(f"{label:<14} {len(results):>8} analyses in {elapsed:6.2f}s, "
+              f"{mismatches} mismatches")
+
+    if failures:
+        sys.exit("Concurrent results differ from the single-threaded run")
+
+if __name__ == "__main__":
+    main()
@@ -2,35 +2,894 @@
 # 21/11/2024
 # Program improved version of the basic calculator.
 
+import abc
+import argparse
+import csv
+import decimal
+import functools
+import itertools
+import math
+import operator
 import os
+import re
+import time
+from collections import namedtuple
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for array and CSV batch operations
+    np = None
+
+# Number types the operations can compute with, and the default number of
+# significant digits of the decimal backend
+NUMERIC_BACKENDS = ("float", "decimal", "fraction")
+DEFAULT_DECIMAL_PRECISION = 28
+
+# Largest exact power, in bits of numerator or denominator, the fraction
+# backend computes; larger ones raise instead of stalling the process
+MAX_EXACT_POWER_BITS = 1 << 22
+
+# Largest number of digits, either side of the point, round() accepts;
+# exact rounding builds 10 ** ndigits
+MAX_ROUND_DIGITS = 1000
+
+# Rows of a CSV file converted and computed at a time in batch mode
+CSV_CHUNK_ROWS = 65_536
+
+# Element-wise result: float values, with NaN where the mask of errors is set
+ArrayResult = namedtuple('ArrayResult', ['values', 'errors'])
+
+# Totals of a CSV batch run
+BatchSummary = namedtuple('BatchSummary', ['rows', 'errors'])
+
+# Nodes of a parsed expression
+Number = namedtuple('Number', ['value'])
+Name = namedtuple('Name', ['name'])
+Unary = namedtuple('Unary', ['op', 'operand'])
+Binary = namedtuple('Binary', ['op', 'left', 'right'])
+Call = namedtuple('Call', ['name', 'args'])
+
+Token = namedtuple('Token', ['kind', 'text', 'position'])
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>\*\*|[-+*/%^(),])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+ASSIGNMENT_PATTERN = re.compile(r"^\s*([A-Za-z_]\w*)\s*=(.*)$")
+
+# Operators of expressions and the backend operations they run;
+# '**' is accepted as another spelling of '^'
+BINARY_OPERATORS = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "divide",
+    "%": "modulus",
+    "^": "power"
+}
+
+def round_number(value, ndigits=None):
+    """Rounds like round(), accepting a whole number of digits of any type."""
+    if ndigits is None:
+        return round(value)
+    # Written so that NaN fails the check too
+    if not abs(ndigits) <= MAX_ROUND_DIGITS:
+        raise ExpressionError(f"round() takes at most {MAX_ROUND_DIGITS:,} digits")
+    if ndigits != int(ndigits):
+        raise ExpressionError("round() needs a whole number of digits")
+    return round(value, int(ndigits))
+
+# Functions available in expressions: (function, min args, max args).
+# They compute in float precision, except where a backend has its own
+# version (see NumericBackend.function)
+FUNCTIONS = {
+    "abs": (abs, 1, 1),
+    "sqrt": (math.sqrt, 1, 1),
+    "exp": (math.exp, 1, 1),
+    "log": (math.log, 1, 2),
+    "sin": (math.sin, 1, 1),
+    "cos": (math.cos, 1, 1),
+    "tan": (math.tan, 1, 1),
+    "floor": (math.floor, 1, 1),
+    "ceil": (math.ceil, 1, 1),
+    "round": (round_number, 1, 2),
+    "min": (min, 1, None),
+    "max": (max, 1, None)
+}
+
+# Constants are floats, converted to the backend's type when used
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed or evaluated."""
+
+class CalculationError(ArithmeticError):
+    """Base class of the errors raised by the six operations."""
+
+class DivisionByZeroError(CalculationError, ZeroDivisionError):
+    """Raised when dividing, taking a modulus or a negative power of zero."""
+
+class ResultTooLargeError(CalculationError, OverflowError):
+    """Raised when a result is too large to compute or represent."""
+
+class DomainError(CalculationError, ValueError):
+    """Raised when a result is not a real number, e.g. (-8) ^ 0.5."""
+
+def _check_domain(name, args):
+    """Raises DomainError for sqrt and log arguments outside their domain."""
+    if name == "sqrt" and args[0] < 0:
+        raise DomainError("Square roots need a non-negative number.")
+    if name == "log":
+        if args[0] <= 0:
+            raise DomainError("Logarithms need a positive number.")
+        if len(args) > 1 and (args[1] <= 0 or args[1] == 1):
+            raise DomainError("Logarithm bases must be positive and not 1.")
+
+class NumericBackend(abc.ABC):
+    """
+    The six operations on one number type.
+
+    Operations take operands already converted with convert() and return
+    that type. Failures raise CalculationError subclasses rather than
+    returning error strings. Modulus takes the sign of the divisor, as
+    with Python floats, in every backend.
+    """
+    name = None
+    negate = staticmethod(operator.neg)
+
+    @abc.abstractmethod
+    def convert(self, value):
+        """Returns value as this backend's number type."""
+
+    def parse(self, text):
+        """Parses a number typed by the user; raises ValueError if invalid."""
+        try:
+            return self.convert(text.strip())
+        except (ArithmeticError, ValueError):
+            raise ValueError(f"Not a number: {text!r}") from None
+
+    def add(self, a, b):
+        return a + b
+
+    def subtract(self, a, b):
+        return a - b
+
+    def multiply(self, a, b):
+        return a * b
+
+    def divide(self, a, b):
+        if b == 0:
+            raise DivisionByZeroError("Division by zero.")
+        return a / b
+
+    def modulus(self, a, b):
+        if b == 0:
+            raise DivisionByZeroError("Division by zero.")
+        return a % b
+
+    def power(self, a, b):
+        """
+        Raises a to the power b, checking the cheap cases first.
+
+        Results that need no arithmetic, such as 1 ^ b or (-1) ^ b, return
+        at once however large b is. Integer exponents go to the exact
+        integer power of the number type (exponentiation by squaring);
+        others need a non-negative base.
+        """
+        if b == 0 or a == 1:
+            return self.convert(1)
+        if b == 1:
+            return a
+        if a == 0:
+            if b < 0:
+                raise DivisionByZeroError("Zero cannot be raised to a negative power.")
+            return a
+        integral = self._is_integer(b)
+        if integral and a == -1:
+            return self.negate(a) if self._is_even(b) else a
+        if integral:
+            return self._integer_power(a, b)
+        if a < 0:
+            raise DomainError("A negative number cannot be raised to a fractional power.")
+        return self._real_power(a, b)
+
+    @abc.abstractmethod
+    def _is_integer(self, value):
+        """Returns whether a number of this type is a whole number."""
+
+    def _is_even(self, value):
+        return value % 2 == 0
+
+    def function(self, name):
+        """
+        Returns the callable for an expression function.
+
+        The float versions in FUNCTIONS are used unless the backend defines
+        a more precise one; results are converted back to its number type.
+        Their errors are raised as CalculationError subclasses, the same in
+        every backend.
+        """
+        function = FUNCTIONS[name][0]
+
+        def checked(*args):
+            _check_domain(name, args)
+            try:
+                return function(*args)
+            except (CalculationError, ExpressionError):
+                raise
+            except (OverflowError, decimal.Overflow):
+                raise ResultTooLargeError("Result is too large.") from None
+            except (ValueError, ZeroDivisionError, decimal.InvalidOperation):
+                raise DomainError(f"{name}() has no result for these arguments.") from None
+        return checked
+
+    @abc.abstractmethod
+    def _integer_power(self, a, b):
+        """Returns a ^ b for a whole-number b."""
+
+    @abc.abstractmethod
+    def _real_power(self, a, b):
+        """Returns a ^ b for a positive a and a fractional b."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+class FloatBackend(NumericBackend):
+    """Binary floating point, fast and approximate."""
+    name = "float"
+    convert = staticmethod(float)
+    add = staticmethod(operator.add)
+    subtract = staticmethod(operator.sub)
+    multiply = staticmethod(operator.mul)
+
+    def _is_integer(self, value):
+        return value.is_integer()
+
+    def _real_power(self, a, b):
+        try:
+            return math.pow(a, b)
+        except OverflowError:
+            raise ResultTooLargeError("Result is too large.") from None
+
+    _integer_power = _real_power
+
+class DecimalBackend(NumericBackend):
+    """Decimal floating point with a chosen number of significant digits."""
+    name = "decimal"
+
+    def __init__(self, precision=DEFAULT_DECIMAL_PRECISION):
+        self.precision = precision
+        # A private context, so the precision does not leak into other code
+        self.context = decimal.Context(
+            prec=precision,
+            traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow])
+
+    def convert(self, value):
+        if isinstance(value, decimal.Decimal):
+            return value
+        if isinstance(value, float):
+            # The shortest repr, so 0.1 becomes Decimal('0.1')
+            return self.context.create_decimal(repr(value))
+        if isinstance(value, Fraction):
+            return self.divide(decimal.Decimal(value.numerator),
+                               decimal.Decimal(value.denominator))
+        return self.context.create_decimal(value)
+
+    def _apply(self, function, *args):
+        try:
+            return function(*args)
+        except decimal.Overflow:
+            raise ResultTooLargeError("Result is too large.") from None
+        except decimal.InvalidOperation:
+            raise DomainError("Result is not a number.") from None
+
+    def negate(self, a):
+        return self.context.minus(a)
+
+    def add(self, a, b):
+        return self._apply(self.context.add, a, b)
+
+    def subtract(self, a, b):
+        return self._apply(self.context.subtract, a, b)
+
+    def multiply(self, a, b):
+        return self._apply(self.context.multiply, a, b)
+
+    def divide(self, a, b):
+        if b == 0:
+            raise DivisionByZeroError("Division by zero.")
+        return self._apply(self.context.divide, a, b)
+
+    def modulus(self, a, b):
+        if b == 0:
+            raise DivisionByZeroError("Division by zero.")
+        remainder = self._apply(self.context.remainder, a, b)
+        # Decimal remainders take the sign of the dividend; match floats
+        if remainder and (remainder < 0) != (b < 0):
+            remainder = self.add(remainder, b)
+        return remainder
+
+    def _is_integer(self, value):
+        return value.is_finite() and value == value.to_integral_value()
+
+    def _is_even(self, value):
+        # Read the units digit, as value % 2 fails beyond the precision
+        _, digits, exponent = value.as_tuple()
+        return exponent > 0 or digits[len(digits) + exponent - 1] % 2 == 0
+
+    def _real_power(self, a, b):
+        return self._apply(self.context.power, a, b)
+
+    _integer_power = _real_power
+
+    def function(self, name):
+        # sqrt, exp and log keep the backend's precision
+        if name in ("sqrt", "exp", "log"):
+            return getattr(self, name)
+        return super().function(name)
+
+    def sqrt(self, x):
+        x = self.convert(x)
+        _check_domain("sqrt", (x,))
+        return self._apply(self.context.sqrt, x)
+
+    def exp(self, x):
+        return self._apply(self.context.exp, self.convert(x))
+
+    def log(self, x, base=None):
+        """Natural logarithm of x, or its logarithm in base."""
+        x = self.convert(x)
+        if base is None:
+            _check_domain("log", (x,))
+            return self._apply(self.context.ln, x)
+        base = self.convert(base)
+        _check_domain("log", (x, base))
+        return self.divide(self._apply(self.context.ln, x), self._apply(self.context.ln, base))
+
+    def __repr__(self):
+        return f"DecimalBackend(precision={self.precision})"
+
+class FractionBackend(NumericBackend):
+    """
+    Exact rational numbers; fractional exponents are not supported.
+
+    Expression functions such as sqrt compute in float precision, as their
+    results are rarely rational.
+    """
+    name = "fraction"
+
+    def convert(self, value):
+        if isinstance(value, Fraction):
+            return value
+        if isinstance(value, float):
+            # The shortest repr, so 0.1 becomes 1/10
+            return Fraction(repr(value))
+        return Fraction(value)
+
+    def _is_integer(self, value):
+        return value.denominator == 1
+
+    def _is_even(self, value):
+        return value.numerator % 2 == 0
+
+    def _integer_power(self, a, b):
+        exponent = b.numerator
+        bits = abs(exponent) * max(a.numerator.bit_length(), a.denominator.bit_length())
+        if bits > MAX_EXACT_POWER_BITS:
+            raise ResultTooLargeError(
+                f"Result would have about {int(bits * math.log10(2)):,} digits.")
+        return a ** exponent
+
+    def _real_power(self, a, b):
+        raise DomainError("Fractional exponents have no exact result; "
+                          "use the float or decimal backend.")
+
+def format_number(value):
+    """
+    Formats a result for display.
+
+    Exact results too long for Python's integer to string conversion are
+    shown as a decimal approximation, with the number of digits of their
+    integer part.
+    """
+    try:
+        return str(value)
+    except ValueError:
+        value = Fraction(value)
+        # Exact results can have more digits than a default context's Emax;
+        # guard digits absorb the rounding of the intermediate steps
+        context = decimal.Context(prec=DEFAULT_DECIMAL_PRECISION + 10,
+                                  Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+        approximation = context.divide(_approximate_integer(value.numerator, context),
+                                       _approximate_integer(value.denominator, context))
+        context.prec = DEFAULT_DECIMAL_PRECISION
+        approximation = context.plus(approximation)
+        digits = approximation.adjusted() + 1
+        return f"{approximation} ({digits:,} digits)" if digits > 0 else str(approximation)
+
+def _approximate_integer(value, context):
+    """
+    Converts an integer of any size to a Decimal rounded to the context.
+
+    Only the leading bits are converted, then scaled by a power of two, as
+    Decimal(value) takes quadratic time in the number of digits.
+    """
+    shift = max(0, value.bit_length() - 4 * context.prec)
+    return context.multiply(decimal.Decimal(value >> shift),
+                            context.power(2, shift))
+
+def make_backend(name, precision=DEFAULT_DECIMAL_PRECISION):
+    """Creates the numeric backend called name ('float', 'decimal' or 'fraction')."""
+    if name == "float":
+        return FloatBackend()
+    if name == "decimal":
+        return DecimalBackend(precision)
+    if name == "fraction":
+        return FractionBackend()
+    raise ValueError(f"Unknown numeric backend: {name!r}")
+
+# Backend used by add, subtract, multiply, divide, power and modulus
+_backend = FloatBackend()
+
+def get_backend():
+    """Returns the numeric backend the operations currently use."""
+    return _backend
+
+def set_backend(backend, precision=DEFAULT_DECIMAL_PRECISION):
+    """
+    Selects the numeric backend of the six operations and of expressions.
+
+    Args:
+        backend: A NumericBackend, or a name from NUMERIC_BACKENDS
+        precision (int): Significant digits, for the decimal backend
+
+    Returns:
+        NumericBackend: The backend used before
+    """
+    global _backend
+    previous = _backend
+    _backend = make_backend(backend, precision) if isinstance(backend, str) else backend
+    return previous
 
 def clear_screen():
     """Clears the console screen."""
     os.system('cls' if os.name == 'nt' else 'clear')
 
+# The six operations convert their operands with the selected backend and
+# always return its number type, or raise a CalculationError
+
 def add(a, b):
     """Returns the sum of two numbers."""
-    return a + b
+    backend = _backend
+    return backend.add(backend.convert(a), backend.convert(b))
 
 def subtract(a, b):
     """Returns the difference between two numbers."""
-    return a - b
+    backend = _backend
+    return backend.subtract(backend.convert(a), backend.convert(b))
 
 def multiply(a, b):
     """Returns the product of two numbers."""
-    return a * b
+    backend = _backend
+    return backend.multiply(backend.convert(a), backend.convert(b))
 
 def divide(a, b):
-    """Returns the division of two numbers, handling division by zero."""
-    return a / b if b != 0 else "Error: Division by zero."
+    """Returns the division of two numbers; raises DivisionByZeroError for b = 0."""
+    backend = _backend
+    return backend.divide(backend.convert(a), backend.convert(b))
 
 def power(a, b):
     """Returns the first number raised to the power of the second."""
-    return a ** b
+    backend = _backend
+    return backend.power(backend.convert(a), backend.convert(b))
 
 def modulus(a, b):
-    """Returns the remainder when the first number is divided by the second."""
-    return a % b if b != 0 else "Error: Division by zero."
+    """Returns the remainder of a / b, with the sign of b; raises DivisionByZeroError for b = 0."""
+    backend = _backend
+    return backend.modulus(backend.convert(a), backend.convert(b))
+
+if np is not None:
+    # NumPy versions of add, subtract, multiply, divide, power and modulus
+    ARRAY_OPERATIONS = {
+        "add": np.add,
+        "subtract": np.subtract,
+        "multiply": np.multiply,
+        "divide": np.divide,
+        "power": np.power,
+        "modulus": np.mod
+    }
+
+def apply_elementwise(operation, a, b):
+    """
+    Applies one of the six operations to whole arrays in a single call.
+
+    Division and modulus by zero, and powers that are not real numbers or
+    overflow, are reported in the errors mask instead of as strings; their
+    values are NaN. Operands are broadcast, so either may be a scalar.
+    Arrays are always float64, whatever the numeric backend.
+
+    Args:
+        operation: Operation name ('add', ..., 'modulus') or the function
+        a: First operand (array, list, CSV column or number)
+        b: Second operand
+
+    Returns:
+        ArrayResult: Float array of results and boolean array of errors
+    """
+    if np is None:
+        raise RuntimeError("apply_elementwise requires NumPy to be installed")
+    name = getattr(operation, '__name__', operation)
+    if name not in ARRAY_OPERATIONS:
+        raise ValueError(f"Unknown operation: {name}")
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+
+    with np.errstate(all='ignore'):
+        if name in ("divide", "modulus"):
+            errors = np.broadcast_to(b == 0, np.broadcast_shapes(a.shape, b.shape))
+            values = np.full(errors.shape, np.nan)
+            ARRAY_OPERATIONS[name](a, b, out=values, where=~errors)
+        else:
+            values = ARRAY_OPERATIONS[name](a, b)
+            errors = np.zeros(values.shape, dtype=bool)
+            if name == "power":
+                errors = ~np.isfinite(values) & np.isfinite(a) & np.isfinite(b)
+                values[errors] = np.nan
+    return ArrayResult(values, errors)
+
+def _column_array(values):
+    """Converts CSV cells to floats; cells that are not numbers become NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        column = np.empty(len(values))
+        for index, value in enumerate(values):
+            try:
+                column[index] = float(value)
+            except ValueError:
+                column[index] = np.nan
+        return column
+
+def _column_cells(rows, index):
+    """Returns one column of CSV rows, with '' for rows too short to have it."""
+    return [row[index] if index < len(row) else '' for row in rows]
+
+def evaluate_csv(input_path, operation, left, right, output_path=None,
+                 chunk_rows=CSV_CHUNK_ROWS, result_name=None):
+    """
+    Applies an operation to two columns of a CSV file, chunk by chunk.
+
+    Only chunk_rows rows are held in memory at a time. Rows whose operands
+    are missing or not numbers, or that divide by zero, count as errors
+    and get an empty result cell.
+
+    Args:
+        input_path (str): CSV file with a header row
+        operation (str): Operation name, e.g. 'divide'
+        left (str): Column of the first operands
+        right (str): Column of the second operands, or a number used for
+        every row
+        output_path (str): Optional CSV file: the input rows plus a result
+        column
+        chunk_rows (int): Rows converted and computed at a time
+        result_name (str): Header of the result column (default: operation)
+
+    Returns:
+        BatchSummary: Number of rows and of errors
+    """
+    if np is None:
+        raise RuntimeError("evaluate_csv requires NumPy to be installed")
+    rows = errors = 0
+    with open(input_path, newline='', encoding='utf-8') as source:
+        reader = csv.reader(source)
+        header = next(reader, [])
+        if left not in header:
+            raise ValueError(f"No column named {left!r} in {input_path}")
+        left_index = header.index(left)
+        if right in header:
+            right_index, constant = header.index(right), None
+        else:
+            right_index, constant = None, float(right)
+
+        output = writer = None
+        if output_path is not None:
+            output = open(output_path, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(output)
+            writer.writerow(header + [result_name or operation])
+        try:
+            while True:
+                chunk = list(itertools.islice(reader, chunk_rows))
+                if not chunk:
+                    break
+                a = _column_array(_column_cells(chunk, left_index))
+                b = (constant if right_index is None
+                     else _column_array(_column_cells(chunk, right_index)))
+                values, invalid = apply_elementwise(operation, a, b)
+                invalid = invalid | np.isnan(values)
+                rows += len(chunk)
+                errors += int(np.count_nonzero(invalid))
+                if writer is not None:
+                    cells = values.astype(str).astype(object)
+                    cells[invalid] = ''
+                    # Short rows are padded so results stay in their column
+                    width = len(header)
+                    writer.writerows(row + [''] * (width - len(row)) + [cell]
+                                     for row, cell in zip(chunk, cells.tolist()))
+        finally:
+            if output is not None:
+                output.close()
+    return BatchSummary(rows, errors)
+
+def tokenize(text):
+    """Splits an expression into number, name and operator tokens."""
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ExpressionError(f"Unexpected character {text[position]!r} at {position + 1}")
+        if match.lastgroup != 'space':
+            tokens.append(Token(match.lastgroup, match.group(), position))
+        position = match.end()
+    tokens.append(Token('end', '', position))
+    return tokens
+
+class ExpressionParser:
+    """
+    Recursive descent parser turning an expression into a tree of nodes.
+
+    Precedence, lowest first: + and -, then * / and %, then unary signs,
+    then ^ (right associative, so 2^3^2 is 2^9 and -2^2 is -4).
+    """
+    def __init__(self, text, backend=None):
+        self.text = text
+        self.backend = backend or _backend
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def parse(self):
+        """Returns the root node of the whole expression."""
+        node = self._sum()
+        token = self.tokens[self.index]
+        if token.kind != 'end':
+            raise ExpressionError(f"Unexpected {token.text!r} at {token.position + 1}")
+        return node
+
+    def _next(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _accept(self, *texts):
+        token = self.tokens[self.index]
+        if token.kind == 'op' and token.text in texts:
+            self.index += 1
+            return token.text
+        return None
+
+    def _expect(self, text):
+        if self._accept(text) is None:
+            token = self.tokens[self.index]
+            found = repr(token.text) if token.kind != 'end' else "end of expression"
+            raise ExpressionError(f"Expected {text!r} at {token.position + 1}, found {found}")
+
+    def _sum(self):
+        node = self._product()
+        while True:
+            op = self._accept('+', '-')
+            if op is None:
+                return node
+            node = Binary(op, node, self._product())
+
+    def _product(self):
+        node = self._unary()
+        while True:
+            op = self._accept('*', '/', '%')
+            if op is None:
+                return node
+            node = Binary(op, node, self._unary())
+
+    def _unary(self):
+        op = self._accept('+', '-')
+        if op is not None:
+            return Unary(op, self._unary())
+        return self._power()
+
+    def _power(self):
+        node = self._primary()
+        if self._accept('^', '**') is not None:
+            # The exponent may carry its own sign: 2^-1
+            node = Binary('^', node, self._unary())
+        return node
+
+    def _primary(self):
+        token = self._next()
+        if token.kind == 'number':
+            return Number(self.backend.convert(token.text))
+        if token.kind == 'name':
+            if self._accept('(') is None:
+                return Name(token.text)
+            args = []
+            if self._accept(')') is None:
+                args.append(self._sum())
+                while self._accept(',') is not None:
+                    args.append(self._sum())
+                self._expect(')')
+            return Call(token.text, tuple(args))
+        if token.kind == 'op' and token.text == '(':
+            node = self._sum()
+            self._expect(')')
+            return node
+        found = repr(token.text) if token.kind != 'end' else "end of expression"
+        raise ExpressionError(f"Unexpected {found} at {token.position + 1}")
+
+def parse_expression(text, backend=None):
+    """Parses an expression such as '2^10 * (3 + x) % 7' into a node tree."""
+    return ExpressionParser(text, backend).parse()
+
+def _fold(node, backend):
+    """Replaces constant subexpressions and named constants by numbers."""
+    if isinstance(node, Name):
+        if node.name in CONSTANTS:
+            return Number(backend.convert(CONSTANTS[node.name]))
+        return node
+    if isinstance(node, Unary):
+        node = Unary(node.op, _fold(node.operand, backend))
+        constant = isinstance(node.operand, Number)
+    elif isinstance(node, Binary):
+        node = Binary(node.op, _fold(node.left, backend), _fold(node.right, backend))
+        constant = isinstance(node.left, Number) and isinstance(node.right, Number)
+    elif isinstance(node, Call):
+        if node.name not in FUNCTIONS:
+            raise ExpressionError(f"Unknown function: {node.name}")
+        _, min_args, max_args = FUNCTIONS[node.name]
+        if len(node.args) < min_args or (max_args is not None and len(node.args) > max_args):
+            raise ExpressionError(f"Wrong number of arguments for {node.name}()")
+        node = Call(node.name, tuple(_fold(arg, backend) for arg in node.args))
+        constant = all(isinstance(arg, Number) for arg in node.args)
+    else:
+        return node
+    if constant:
+        try:
+            return Number(_compile(node, backend)(None))
+        except (ArithmeticError, ValueError, TypeError):
+            # Leave it to fail when evaluated, like any other error
+            pass
+    return node
+
+def _names(node):
+    """Returns the variable names used in a node tree."""
+    if isinstance(node, Name):
+        return {node.name}
+    if isinstance(node, Unary):
+        return _names(node.operand)
+    if isinstance(node, Binary):
+        return _names(node.left) | _names(node.right)
+    if isinstance(node, Call):
+        return set().union(*map(_names, node.args))
+    return set()
+
+def _compile(node, backend):
+    """
+    Turns a node tree into nested closures taking a dict of variables.
+
+    Variables are converted to the backend's number type as they are read,
+    and function results after the call, so results keep that type.
+    Operators whose operands are numbers or variables get closures that
+    read them directly, which saves a call per operand.
+    """
+    convert = backend.convert
+    if isinstance(node, Number):
+        value = node.value
+        return lambda env: value
+    if isinstance(node, Name):
+        name = node.name
+        return lambda env: convert(env[name])
+    if isinstance(node, Unary):
+        operand = _compile(node.operand, backend)
+        if node.op == '+':
+            return operand
+        negate = backend.negate
+        return lambda env: negate(operand(env))
+    if isinstance(node, Call):
+        function = backend.function(node.name)
+        args = [_compile(arg, backend) for arg in node.args]
+        if len(args) == 1:
+            arg = args[0]
+            return lambda env: convert(function(arg(env)))
+        return lambda env: convert(function(*[arg(env) for arg in args]))
+
+    function = getattr(backend, BINARY_OPERATORS[node.op])
+    left, right = node.left, node.right
+    if isinstance(left, Name) and isinstance(right, Number):
+        name, value = left.name, right.value
+        return lambda env: function(convert(env[name]), value)
+    if isinstance(left, Name) and isinstance(right, Name):
+        name, other = left.name, right.name
+        return lambda env: function(convert(env[name]), convert(env[other]))
+    if isinstance(right, Number):
+        compiled, value = _compile(left, backend), right.value
+        return lambda env: function(compiled(env), value)
+    if isinstance(left, Number):
+        value, compiled = left.value, _compile(right, backend)
+        return lambda env: function(value, compiled(env))
+    left, right = _compile(left, backend), _compile(right, backend)
+    return lambda env: function(left(env), right(env))
+
+class CompiledExpression:
+    """An expression parsed and compiled once, to be evaluated many times."""
+    def __init__(self, text, backend=None):
+        self.text = text
+        self.backend = backend or _backend
+        try:
+            self.tree = _fold(parse_expression(text, self.backend), self.backend)
+            self.variables = frozenset(_names(self.tree))
+            self._code = _compile(self.tree, self.backend)
+        except RecursionError:
+            raise ExpressionError("Expression is nested too deeply") from None
+
+    def __call__(self, variables=None, **values):
+        """Evaluates the expression with the given variable values."""
+        if variables is None:
+            variables = values
+        elif values:
+            variables = {**variables, **values}
+        try:
+            return self._code(variables)
+        except KeyError as error:
+            raise ExpressionError(f"Unknown variable: {error.args[0]}") from None
+        except TypeError as error:
+            raise ExpressionError(str(error)) from None
+        except RecursionError:
+            raise ExpressionError("Expression is nested too deeply") from None
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+@functools.lru_cache(maxsize=256)
+def _cached_expression(text, backend):
+    return CompiledExpression(text, backend)
+
+def compile_expression(text, backend=None):
+    """Returns the compiled form of an expression, reusing recent ones."""
+    return _cached_expression(text, backend or _backend)
+
+def evaluate(text, variables=None, backend=None):
+    """Evaluates an expression string, e.g. evaluate('x^2 + 1', {'x': 3})."""
+    return compile_expression(text, backend)(variables or {})
+
+def expression_mode(history, variables):
+    """Reads expressions and 'name = expression' assignments until a blank line."""
+    print("\nEnter expressions such as 2^10 * (3 + 4) % 7, or name = expression.")
+    print("Functions: " + ", ".join(FUNCTIONS) + ". Constants: pi, e. "
+          "The last result is 'ans'. Leave empty to return.")
+    while True:
+        line = input("\n> ").strip()
+        if not line:
+            return
+        name = None
+        assignment = ASSIGNMENT_PATTERN.match(line)
+        if assignment:
+            name, line = assignment.group(1), assignment.group(2).strip()
+        try:
+            if name in FUNCTIONS or name in CONSTANTS:
+                raise ExpressionError(f"Cannot assign to {name}")
+            result = evaluate(line, variables)
+        except (ArithmeticError, ValueError) as error:
+            print(f"Error: {error}")
+            continue
+        variables['ans'] = result
+        if name is not None:
+            variables[name] = result
+            history.append(f"Expression: {name} = {line} => Result: {format_number(result)}")
+            print(f"{name} = {format_number(result)}")
+        else:
+            history.append(f"Expression: {line} => Result: {format_number(result)}")
+            print(format_number(result))
 
 def display_history(history):
     """Displays the history of calculations."""
@@ -44,6 +903,7 @@ def display_history(history):
 def calculator():
     """Runs the improved calculator program."""
     history = []  # List to store past calculations
+    variables = {}  # Variables set in expression mode
     operations = {
         "1": ("Addition", add),
         "2": ("Subtraction", subtract),
@@ -57,17 +917,20 @@ def calculator():
         clear_screen()
         print("=== Enhanced Calculator ===")
         print("\nSelect an operation:")
+        print("0. Expression Mode")
         for key, (name, _) in operations.items():
             print(f"{key}. {name}")
         print("7. View History")
         print("8. Clear History")
         print("9. Exit")
 
-        choice = input("\nEnter your choice (1-9): ")
+        choice = input("\nEnter your choice (0-9): ")
 
         if choice == '9':
             print("Goodbye!")
             break
+        elif choice == '0':
+            expression_mode(history, variables)
         elif choice == '7':
             display_history(history)
         elif choice == '8':
@@ -77,19 +940,80 @@ def calculator():
             operation_name, operation_func = operations[choice]
 
             try:
-                num1 = float(input("\nEnter the first number: "))
-                num2 = float(input("Enter the second number: "))
-                result = operation_func(num1, num2)
-
-                # Log the operation to history
-                history.append(f"{operation_name}: {num1} and {num2} => Result: {result}")
-                print(f"\n{operation_name} Result: {result}")
+                num1 = _backend.parse(input("\nEnter the first number: "))
+                num2 = _backend.parse(input("Enter the second number: "))
             except ValueError:
                 print("\nError: Please enter valid numeric values.")
+            else:
+                try:
+                    result = f"Result: {format_number(operation_func(num1, num2))}"
+                except CalculationError as error:
+                    result = f"Error: {error}"
+
+                # Log the operation to history
+                history.append(f"{operation_name}: {num1} and {num2} => {result}")
+                print(f"\n{operation_name} {result}")
         else:
             print("\nInvalid choice! Please select a valid option.")
 
         input("\nPress Enter to continue...")
 
+def parse_args(argv=None):
+    """Parses command line options."""
+    parser = argparse.ArgumentParser(description="Enhanced calculator.")
+    parser.add_argument('expression', nargs='?',
+                        help="evaluate this expression and exit instead of "
+                             "starting the interactive calculator")
+    parser.add_argument('--var', action='append', default=[], metavar='NAME=VALUE',
+                        help="set a variable for the expression (repeatable)")
+    parser.add_argument('--backend', choices=NUMERIC_BACKENDS, default='float',
+                        help="number type to calculate with (default: float)")
+    parser.add_argument('--precision', type=int, default=DEFAULT_DECIMAL_PRECISION,
+                        help="significant digits of the decimal backend "
+                             f"(default: {DEFAULT_DECIMAL_PRECISION})")
+    parser.add_argument('--batch', metavar='CSV',
+                        help="apply --operation to columns --left and --right of a CSV file")
+    parser.add_argument('--operation', default='add',
+                        choices=('add', 'subtract', 'multiply', 'divide', 'power', 'modulus'),
+                        help="operation for --batch (default: add)")
+    parser.add_argument('--left', help="column of first operands for --batch")
+    parser.add_argument('--right', help="column of second operands for --batch, "
+                                        "or a number to use for every row")
+    parser.add_argument('--output', metavar='CSV',
+                        help="write the input rows with a result column to this file")
+    parser.add_argument('--chunk-rows', type=int, default=CSV_CHUNK_ROWS,
+                        help=f"rows processed at a time (default: {CSV_CHUNK_ROWS})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Evaluates one expression, or runs the interactive calculator."""
+    args = parse_args(argv)
+    set_backend(args.backend, args.precision)
+    if args.batch:
+        if args.left is None or args.right is None:
+            raise SystemExit("--batch requires --left and --right")
+        started = time.perf_counter()
+        try:
+            summary = evaluate_csv(args.batch, args.operation, args.left, args.right,
+                                   args.output, args.chunk_rows)
+        except (RuntimeError, ValueError) as error:
+            raise SystemExit(f"Error: {error}")
+        elapsed = time.perf_counter() - started
+        print(f"{args.operation.capitalize()}: {summary.rows} rows, {summary.errors} errors "
+              f"in {elapsed:.2f}s ({summary.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        return
+    if args.expression is None:
+        calculator()
+        return
+    variables = {}
+    try:
+        for setting in args.var:
+            name, _, value = setting.partition('=')
+            variables[name.strip()] = evaluate(value, variables)
+        print(format_number(evaluate(args.expression, variables)))
+    except (ArithmeticError, ValueError) as error:
+        raise SystemExit(f"Error: {error}")
+
 # Run the improved calculator
-calculator()
+if __name__ == "__main__":
+    main()
@@ -2,83 +2,912 @@
 # 21/11/2024
 # password strength checker.
 
+import argparse
+import asyncio
+import collections
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
 import re
 import math
 import secrets
 import string
+import struct
+import threading
+import time
 import unicodedata
+from collections import Counter, namedtuple
 
-class PasswordAnalyzer:
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for analyze_batch
+    np = None
+
+# Characters used for generated passwords, and the sets each must include
+PASSWORD_CHARACTER_SETS = (
+    string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation
+)
+PASSWORD_ALPHABET = ''.join(PASSWORD_CHARACTER_SETS)
+
+# Random bytes requested from the OS at a time when generating in bulk
+GENERATOR_BLOCK_SIZE = 1 << 16
+
+# Generated passwords joined into each write when streaming to a file
+GENERATOR_WRITE_BATCH = 10_000
+
+# Read size used when streaming newline-delimited password files
+AUDIT_CHUNK_SIZE = 1 << 20
+
+# Passwords per vectorized batch when auditing with NumPy, and the longest
+# password put in a batch; the batch array is as wide as its longest
+# password, so longer ones are analyzed one at a time instead
+AUDIT_BATCH_SIZE = 4096
+AUDIT_MAX_BATCH_WIDTH = 256
+
+# Bytes of input handed to each worker in a parallel audit
+AUDIT_SHARD_SIZE = 8 << 20
+
+# Compact per-password result produced by bulk audits
+AuditRecord = namedtuple(
+    'AuditRecord',
+    ['index', 'length', 'entropy_bits', 'strength_rating', 'patterns']
+)
+
+# Class markers written by CHAR_CLASS_TABLE
+LOWERCASE_MARK = '\x01'
+UPPERCASE_MARK = '\x02'
+DIGIT_MARK = '\x03'
+SPECIAL_MARK = '\x04'
+
+def _build_char_class_table():
+    """
+    Build a str.translate() table mapping characters to class markers.
+    
+    Returns:
+        dict: Code point to marker mapping
+    """
+    # Control characters that share a code point with a marker are blanked
+    # so they are never counted as part of a class
+    table = {ord(mark): '\x00' for mark in (LOWERCASE_MARK, UPPERCASE_MARK,
+                                            DIGIT_MARK, SPECIAL_MARK)}
+    for chars, mark in ((string.ascii_lowercase, LOWERCASE_MARK),
+                        (string.ascii_uppercase, UPPERCASE_MARK),
+                        (string.digits, DIGIT_MARK),
+                        (string.punctuation, SPECIAL_MARK)):
+        for char in chars:
+            table[ord(char)] = mark
+    return table
+
+CHAR_CLASS_TABLE = _build_char_class_table()
+
+# Size of each character set, keyed by its count in the analysis results
+CHAR_CLASS_SIZES = (
+    ('lowercase_count', len(string.ascii_lowercase)),
+    ('uppercase_count', len(string.ascii_uppercase)),
+    ('digit_count', len(string.digits)),
+    ('special_char_count', len(string.punctuation))
+)
+
+# Keyboard rows whose runs of KEYBOARD_WALK_LENGTH keys count as walks
+KEYBOARD_ROWS = ('1234567890', 'qwertyuiop', 'asdfghjkl', 'zxcvbnm', '!@#$%^&*()')
+KEYBOARD_WALK_LENGTH = 4
+
+# Base words found in most cracking dictionaries
+COMMON_PASSWORD_WORDS = (
+    'password', 'passwd', 'admin', 'welcome', 'letmein', 'login', 'master',
+    'dragon', 'monkey', 'shadow', 'sunshine', 'princess', 'football',
+    'baseball', 'soccer', 'hockey', 'iloveyou', 'trustno', 'secret',
+    'superman', 'batman', 'starwars', 'whatever', 'freedom', 'hello',
+    'charlie', 'michael', 'jordan', 'summer', 'winter', 'flower', 'cookie'
+)
+
+# Largest automaton (states x alphabet) expanded into a full transition table
+PATTERN_DFA_MAX_TRANSITIONS = 1 << 20
+
+# Dictionary words shorter than this are too likely to match by accident
+DICTIONARY_MIN_LENGTH = 4
+
+# Common leetspeak substitutions and the letters they stand for
+LEETSPEAK_TABLE = str.maketrans({
+    '@': 'a', '4': 'a', '8': 'b', '3': 'e', '9': 'g', '1': 'i', '!': 'i',
+    '|': 'l', '0': 'o', '$': 's', '5': 's', '7': 't', '+': 't'
+})
+
+# Dates: a 19xx/20xx year, a separated day/month/year or a DDMMYYYY run
+DATE_PATTERN = (
+    r'(?<!\d)(?:19|20)\d{2}(?!\d)'
+    r'|(?<!\d)\d{1,2}[-/.]\d{1,2}[-/.](?:\d{4}|\d{2})(?!\d)'
+    r'|(?<!\d)(?:0[1-9]|[12]\d|3[01])(?:0[1-9]|1[0-2])(?:19|20)\d{2}(?!\d)'
+)
+
+class PatternEngine:
+    """
+    Compiled set of weak-pattern detectors.
+    
+    Literal detectors (word lists) share a single Aho-Corasick automaton that
+    is matched against the lowercased password in one pass, so their cost
+    depends on the password length, not on how many detectors or words are
+    registered. Regex detectors are compiled once when registered.
+    
+    Detectors that look for the same weakness share a family, and a
+    password is only penalized once per family.
+    
+    Register detectors up front; the engine is then read-only and can be
+    shared between threads.
+    """
     def __init__(self):
-        # Character set categories
-        self.lowercase = string.ascii_lowercase
-        self.uppercase = string.ascii_uppercase
-        self.digits = string.digits
-        self.punctuation = string.punctuation
+        self.names = []
+        self.families = {}
+        self._regex_detectors = []
+        self._literal_names = []
+        self._leet_targets = []
+        # Automaton: goto transitions, failure links and the detector
+        # bitmask reported when each state is reached
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [0]
+        self._delta = None
+        self._compiled = True
+    
+    def add_regex(self, name, pattern, family=None):
+        """
+        Register a detector that fires when a regular expression matches.
         
-        # Entropy calculation parameters
-        self.entropy_base = 0
-        self.entropy_bits = 0
+        Args:
+            name (str): Pattern name reported in the results
+            pattern (str): Regular expression searched in the password
+            family (str): Family of detectors penalized together (default:
+                the detector's own name)
+        """
+        self.names.append(name)
+        self.families[name] = family or name
+        self._regex_detectors.append((name, re.compile(pattern)))
     
-    def analyze_password(self, password):
+    def add_words(self, name, words, leet_name=None, family=None, leet_family=None):
+        """
+        Register a detector that fires when the password contains a word.
+        
+        Words are matched case-insensitively.
+        
+        Args:
+            name (str): Pattern name reported in the results
+            words (iterable): Literal words to look for
+            leet_name (str): Optional second pattern name reported when a
+                word only appears after reversing leetspeak substitutions
+            family (str): Family of detectors penalized together (default:
+                the detector's own name)
+            leet_family (str): Family of the leet_name pattern (default:
+                its own name)
+        """
+        bit = 1 << len(self._literal_names)
+        self.names.append(name)
+        self.families[name] = family or name
+        self._literal_names.append(name)
+        if leet_name is not None:
+            self.names.append(leet_name)
+            self.families[leet_name] = leet_family or leet_name
+            self._leet_targets.append((bit, leet_name))
+        
+        goto = self._goto
+        for word in words:
+            state = 0
+            for char in word.lower():
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                state = next_state
+            self._output[state] |= bit
+        self._compiled = False
+    
+    def compile(self):
+        """Build the automaton failure links after words were added."""
+        goto, fail, output = self._goto, self._fail, self._output
+        order = []
+        queue = collections.deque(goto[0].values())
+        for state in queue:
+            fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                # A state also reports every word ending at its failure state
+                output[next_state] |= output[fail[next_state]]
+                queue.append(next_state)
+        
+        # Small automatons are expanded into a full transition table so
+        # matching never has to follow failure links
+        alphabet = {char for transitions in goto for char in transitions}
+        self._delta = None
+        if len(goto) * len(alphabet) <= PATTERN_DFA_MAX_TRANSITIONS:
+            delta = [None] * len(goto)
+            delta[0] = dict(goto[0])
+            for state in order:
+                delta[state] = {**delta[fail[state]], **goto[state]}
+            self._delta = delta
+        self._compiled = True
+    
+    def _match_words(self, text):
+        """
+        Run the automaton over text.
+        
+        Returns:
+            int: Bitmask of literal detectors with a word in the text
+        """
+        output = self._output
+        state = found = 0
+        if self._delta is not None:
+            delta = self._delta
+            for char in text:
+                state = delta[state].get(char, 0)
+                found |= output[state]
+            return found
+        
+        goto, fail = self._goto, self._fail
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= output[state]
+        return found
+    
+    def scan(self, text):
+        """
+        Run every detector over a password.
+        
+        Args:
+            text (str): Normalized password
+        
+        Returns:
+            dict: Pattern name to whether it was found, in registration order
+        """
+        if not self._compiled:
+            self.compile()
+        patterns = dict.fromkeys(self.names, False)
+        
+        lowered = text.lower()
+        found = self._match_words(lowered)
+        for bit, name in enumerate(self._literal_names):
+            if found >> bit & 1:
+                patterns[name] = True
+        
+        if self._leet_targets:
+            decoded = lowered.translate(LEETSPEAK_TABLE)
+            if decoded != lowered:
+                leet_found = self._match_words(decoded) & ~found
+                for bit, name in self._leet_targets:
+                    if leet_found & bit:
+                        patterns[name] = True
+        
+        for name, regex in self._regex_detectors:
+            if regex.search(text):
+                patterns[name] = True
+        return patterns
+    
+    def profile(self, passwords):
+        """
+        Time each detection stage over a sample of passwords.
+        
+        Literal detectors share one automaton, so they are timed together.
+        
+        Args:
+            passwords (list): Normalized passwords to scan
+        
+        Returns:
+            dict: Stage name to total seconds spent
+        """
+        if not self._compiled:
+            self.compile()
+        timings = {}
+        
+        started = time.perf_counter()
+        for password in passwords:
+            lowered = password.lower()
+            self._match_words(lowered)
+            if self._leet_targets:
+                decoded = lowered.translate(LEETSPEAK_TABLE)
+                if decoded != lowered:
+                    self._match_words(decoded)
+        timings['automaton (' + ', '.join(self._literal_names) + ')'] = (
+            time.perf_counter() - started)
+        
+        for name, regex in self._regex_detectors:
+            started = time.perf_counter()
+            for password in passwords:
+                regex.search(password)
+            timings[name] = time.perf_counter() - started
+        return timings
+
+def keyboard_walks(rows=KEYBOARD_ROWS, length=KEYBOARD_WALK_LENGTH):
+    """
+    List every run of adjacent keys, in both directions.
+    
+    Args:
+        rows (tuple): Keyboard rows as strings
+        length (int): Number of keys in a walk
+    
+    Returns:
+        list: Keyboard walk strings
+    """
+    walks = []
+    for row in rows:
+        for start in range(len(row) - length + 1):
+            walk = row[start:start + length]
+            walks.extend((walk, walk[::-1]))
+    return walks
+
+def build_pattern_engine(dictionary_words=()):
+    """
+    Build the default set of weak-pattern detectors.
+    
+    Args:
+        dictionary_words (iterable): Extra words for the dictionary detector,
+            in addition to COMMON_PASSWORD_WORDS
+    
+    Returns:
+        PatternEngine: Compiled engine
+    """
+    engine = PatternEngine()
+    engine.add_words('sequential', ('123', 'abc', 'qwerty'))
+    engine.add_regex('repeating_chars', r'(.)\1{2,}')
+    engine.add_regex('common_substitutions', r'[@]|[1!]|[0o]')
+    # Keyboard walks and leetspeak words are penalized like the sequential
+    # runs and substitutions they contain, not a second time
+    engine.add_words('keyboard_walk', keyboard_walks(), family='sequential')
+    engine.add_regex('date', DATE_PATTERN)
+    words = itertools.chain(COMMON_PASSWORD_WORDS, dictionary_words)
+    engine.add_words('dictionary_word',
+                     (word for word in words if len(word) >= DICTIONARY_MIN_LENGTH),
+                     leet_name='leetspeak', leet_family='common_substitutions')
+    engine.compile()
+    return engine
+
+DEFAULT_PATTERN_ENGINE = build_pattern_engine()
+
+# Default bounds of an AnalysisCache
+CACHE_MAX_ENTRIES = 10_000
+CACHE_TTL = 300
+
+# Extra score penalty for breached passwords, enough to rate any of them
+# "Very Weak" regardless of length and composition
+BREACHED_PENALTY = 8
+
+# log2 of the charset size for each combination of present classes, indexed
+# by a bitmask in CHAR_CLASS_SIZES order (0 for no known class)
+LOG2_CHARSET_BY_MASK = [
+    math.log2(total) if total else 0.0
+    for total in (
+        sum(size for bit, (_, size) in enumerate(CHAR_CLASS_SIZES) if mask >> bit & 1)
+        for mask in range(1 << len(CHAR_CLASS_SIZES))
+    )
+]
+
+# Strength ratings by score, and the highest score for each but the last
+STRENGTH_RATINGS = ("Very Weak", "Weak", "Moderate", "Strong", "Very Strong")
+RATING_SCORE_LIMITS = (1, 3, 5, 7)
+
+if np is not None:
+    # Vectorized counterparts of the tables above
+    ASCII_CLASS_LOOKUP = np.array(
+        [ord(CHAR_CLASS_TABLE.get(code, '\x00')) for code in range(128)],
+        dtype=np.uint8)
+    LOG2_CHARSET_BY_MASK = np.array(LOG2_CHARSET_BY_MASK)
+    RATING_LABELS = np.array(STRENGTH_RATINGS, dtype=object)
+
+class PasswordAnalysis(namedtuple('PasswordAnalysis', [
+        'length', 'lowercase_count', 'uppercase_count', 'digit_count',
+        'special_char_count', 'unicode_chars', 'patterns', 'entropy_base',
+        'entropy_bits', 'strength_rating'])):
+    """
+    Immutable result of PasswordAnalyzer.analyze.
+    
+    patterns holds (name, found) pairs and entropy_bits is not rounded.
+    """
+    __slots__ = ()
+    
+    def as_dict(self):
+        """
+        Convert to the dictionary returned by analyze_password.
+        
+        Returns:
+            dict: Detailed password analysis results
+        """
+        return {
+            'length': self.length,
+            'lowercase_count': self.lowercase_count,
+            'uppercase_count': self.uppercase_count,
+            'digit_count': self.digit_count,
+            'special_char_count': self.special_char_count,
+            'unicode_chars': self.unicode_chars,
+            'patterns': dict(self.patterns),
+            'entropy_bits': round(self.entropy_bits, 2),
+            'strength_rating': self.strength_rating
+        }
+
+class AnalysisCache:
+    """
+    Bounded LRU cache of analysis results with a time-to-live.
+    
+    Entries are keyed by a BLAKE2b hash of the password keyed with a random
+    per-instance salt, so plaintext passwords are never stored and keys
+    cannot be compared across processes. Safe to share between threads.
+    """
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used
+                one is evicted
+            ttl (float): Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._salt = secrets.token_bytes(16)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+    
+    def key(self, password):
+        """
+        Derive the cache key for a password.
+        
+        Args:
+            password (str): Password as given to the analyzer
+        
+        Returns:
+            bytes: Salted hash of the password
+        """
+        return hashlib.blake2b(password.encode('utf-8', 'surrogatepass'),
+                               key=self._salt, digest_size=16).digest()
+    
+    def get(self, key):
+        """
+        Look up a cached result, dropping it if it has expired.
+        
+        Args:
+            key (bytes): Key from AnalysisCache.key
+        
+        Returns:
+            PasswordAnalysis: Cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, analysis = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return analysis
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, analysis):
+        """
+        Store a result, evicting the least recently used entry when full.
+        
+        Args:
+            key (bytes): Key from AnalysisCache.key
+            analysis (PasswordAnalysis): Result to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self):
+        """
+        Report cache effectiveness.
+        
+        Returns:
+            dict: Entry count, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __getstate__(self):
+        # Copies (e.g. in audit workers) start empty with their own salt
+        return {'max_entries': self.max_entries, 'ttl': self.ttl}
+    
+    def __setstate__(self, state):
+        self.__init__(state['max_entries'], state['ttl'])
+
+class PasswordAnalyzer:
+    def __init__(self, breached_filter=None, pattern_engine=None, cache=None):
+        """
+        Args:
+            breached_filter (BreachedPasswordFilter): Optional list of known
+                breached passwords checked during analysis
+            pattern_engine (PatternEngine): Weak-pattern detectors (default:
+                DEFAULT_PATTERN_ENGINE)
+            cache (AnalysisCache): Optional cache of recent results; leave
+                unset where even hashed passwords must not be kept in memory
+        """
+        self.breached_filter = breached_filter
+        self.pattern_engine = pattern_engine or DEFAULT_PATTERN_ENGINE
+        self.cache = cache
+    
+    def analyze(self, password):
         """
         Comprehensive password strength analysis.
         
+        The analyzer keeps no per-call state, so one instance can be shared
+        by any number of threads.
+        
         Args:
             password (str): Password to analyze
         
         Returns:
-            dict: Detailed password analysis results
+            PasswordAnalysis: Immutable analysis results
         """
+        if self.cache is None:
+            return self._analyze_uncached(password)
+        
+        key = self.cache.key(password)
+        analysis = self.cache.get(key)
+        if analysis is None:
+            analysis = self._analyze_uncached(password)
+            self.cache.put(key, analysis)
+        return analysis
+    
+    def _analyze_uncached(self, password):
+        """Run the full analysis pipeline for analyze()."""
         # Normalize unicode characters
         normalized_password = unicodedata.normalize('NFKD', password)
+        length = len(normalized_password)
+        
+        # Classify every character in one pass, then count class markers
+        classes = normalized_password.translate(CHAR_CLASS_TABLE)
+        class_counts = (
+            classes.count(LOWERCASE_MARK),
+            classes.count(UPPERCASE_MARK),
+            classes.count(DIGIT_MARK),
+            classes.count(SPECIAL_MARK)
+        )
+        
+        # Calculate character set size from the classes that are present
+        total_possible_chars = 0
+        for count, (_, size) in zip(class_counts, CHAR_CLASS_SIZES):
+            if count:
+                total_possible_chars += size
+        
+        # Entropy calculation. Passwords made only of characters outside the
+        # known sets carry no measurable entropy (and log2(0) is undefined)
+        entropy_bits = (
+            length * math.log2(total_possible_chars)
+            if total_possible_chars else 0.0
+        )
+        
+        analysis = PasswordAnalysis(
+            length, *class_counts,
+            unicode_chars=len(set(normalized_password)),
+            patterns=tuple(self._detect_patterns(normalized_password).items()),
+            entropy_base=total_possible_chars,
+            entropy_bits=entropy_bits,
+            strength_rating=None
+        )
+        return analysis._replace(strength_rating=self._rate_password_strength(analysis))
+    
+    def analyze_password(self, password):
+        """
+        Comprehensive password strength analysis.
+        
+        Args:
+            password (str): Password to analyze
+        
+        Returns:
+            dict: Detailed password analysis results
+        """
+        return self.analyze(password).as_dict()
+    
+    async def analyze_async(self, password, executor=None):
+        """
+        Analyze a password from asyncio code without blocking the event loop.
+        
+        Args:
+            password (str): Password to analyze
+            executor (Executor): Executor to run the analysis on (default:
+                the event loop's default thread pool)
+        
+        Returns:
+            dict: Detailed password analysis results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.analyze_password, password)
+    
+    def _detect_patterns(self, normalized_password):
+        """
+        Detect weak patterns in a normalized password.
+        
+        Args:
+            normalized_password (str): NFKD-normalized password
+        
+        Returns:
+            dict: Pattern name to whether it was found
+        """
+        patterns = self.pattern_engine.scan(normalized_password)
+        if self.breached_filter is not None:
+            patterns['breached'] = normalized_password in self.breached_filter
+        return patterns
+    
+    def analyze_batch(self, passwords):
+        """
+        Vectorized analysis of a batch of passwords with NumPy.
+        
+        The batch is encoded into a fixed-width array of code points, and the
+        character class counts, charset sizes, entropy and score are computed
+        with array operations. Only normalization and pattern detection still
+        run per password. Results match analyze_password exactly.
+        
+        The array is as wide as the longest password, so batches should be
+        sized with that in mind; analyze_many keeps passwords longer than
+        AUDIT_MAX_BATCH_WIDTH out of its batches.
+        
+        Args:
+            passwords (list): Passwords to analyze
+        
+        Returns:
+            dict: The same keys as analyze_password, each holding one NumPy
+            array (or, for 'patterns', a dict of boolean arrays) with an entry
+            per password
+        """
+        if np is None:
+            raise RuntimeError("analyze_batch requires NumPy to be installed")
         
-        # Analyze character composition
-        analysis = {
-            'length': len(normalized_password),
-            'lowercase_count': sum(1 for c in normalized_password if c in self.lowercase),
-            'uppercase_count': sum(1 for c in normalized_password if c in self.uppercase),
-            'digit_count': sum(1 for c in normalized_password if c in self.digits),
-            'special_char_count': sum(1 for c in normalized_password if c in self.punctuation),
-            'unicode_chars': len(set(normalized_password))
+        # Normalize and encode as a (batch, width) array of code points
+        normalized = [unicodedata.normalize('NFKD', password) for password in passwords]
+        lengths = np.fromiter(map(len, normalized), dtype=np.int64, count=len(normalized))
+        width = max(1, int(lengths.max(initial=0)))
+        codes = np.array(normalized, dtype=f'<U{width}').view(np.uint32)
+        codes = codes.reshape(len(normalized), width)
+        valid = np.arange(width) < lengths[:, None]
+        
+        # Character class counts through a lookup table over ASCII
+        classes = np.where(codes < 128, ASCII_CLASS_LOOKUP[np.minimum(codes, 127)], 0)
+        classes[~valid] = 0
+        class_counts = [(classes == class_id).sum(axis=1)
+                        for class_id in range(1, len(CHAR_CLASS_SIZES) + 1)]
+        
+        # Unique characters: sort each row and count value changes, with
+        # padding pushed past every real code point
+        ordered = np.sort(np.where(valid, codes, np.uint32(0xFFFFFFFF)), axis=1)
+        first_of_run = np.ones_like(valid)
+        first_of_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        unicode_chars = (first_of_run & valid).sum(axis=1)
+        
+        # Entropy from a bitmask of the classes that are present
+        class_mask = np.zeros(len(normalized), dtype=np.int64)
+        for bit, counts in enumerate(class_counts):
+            class_mask |= (counts > 0).astype(np.int64) << bit
+        entropy_bits = lengths * LOG2_CHARSET_BY_MASK[class_mask]
+        
+        # Patterns still need per-password regex scans
+        pattern_rows = [self._detect_patterns(password) for password in normalized]
+        pattern_names = list(pattern_rows[0]) if pattern_rows else []
+        patterns = {
+            name: np.fromiter((row[name] for row in pattern_rows), dtype=bool,
+                              count=len(pattern_rows))
+            for name in pattern_names
         }
         
-        # Calculate character set size
-        char_sets = set()
-        if any(c in self.lowercase for c in normalized_password):
-            char_sets.add(self.lowercase)
-        if any(c in self.uppercase for c in normalized_password):
-            char_sets.add(self.uppercase)
-        if any(c in self.digits for c in normalized_password):
-            char_sets.add(self.digits)
-        if any(c in self.punctuation for c in normalized_password):
-            char_sets.add(self.punctuation)
-        
-        # Entropy calculation
-        unique_chars = len(set(normalized_password))
-        total_possible_chars = sum(len(char_set) for char_set in char_sets)
-        self.entropy_base = total_possible_chars
-        self.entropy_bits = analysis['length'] * math.log2(total_possible_chars)
-        
-        # Pattern detection
-        analysis['patterns'] = {
-            'sequential': bool(re.search(r'(123|abc|qwerty)', normalized_password.lower())),
-            'repeating_chars': bool(re.search(r'(.)\1{2,}', normalized_password)),
-            'common_substitutions': bool(re.search(r'[@]|[1!]|[0o]', normalized_password))
+        # Score, mirroring _rate_password_strength
+        score = np.select([lengths >= 16, lengths >= 12, lengths >= 8], [3, 2, 1], 0)
+        for counts in class_counts:
+            score += counts > 0
+        family_found = {}
+        for name, found in patterns.items():
+            family = self.pattern_engine.families.get(name, name)
+            family_found[family] = family_found.get(family, False) | found
+        for found in family_found.values():
+            score -= found
+        if 'breached' in patterns:
+            score -= patterns['breached'] * BREACHED_PENALTY
+        score += np.select([entropy_bits > 60, entropy_bits > 40], [2, 1], 0)
+        ratings = RATING_LABELS[np.searchsorted(RATING_SCORE_LIMITS, score)]
+        
+        return {
+            'length': lengths,
+            'lowercase_count': class_counts[0],
+            'uppercase_count': class_counts[1],
+            'digit_count': class_counts[2],
+            'special_char_count': class_counts[3],
+            'unicode_chars': unicode_chars,
+            'patterns': patterns,
+            # Python's round() keeps the values identical to analyze_password
+            'entropy_bits': np.array([round(bits, 2) for bits in entropy_bits.tolist()]),
+            'score': score,
+            'strength_rating': ratings
         }
+    
+    def analyze_many(self, passwords, start=1, batch_size=AUDIT_BATCH_SIZE):
+        """
+        Analyze an iterable of passwords lazily.
         
-        # Strength rating
-        analysis['entropy_bits'] = round(self.entropy_bits, 2)
-        analysis['strength_rating'] = self._rate_password_strength(analysis)
+        When NumPy is available, passwords are analyzed in vectorized batches
+        of batch_size; otherwise each one goes through analyze. Passwords
+        longer than AUDIT_MAX_BATCH_WIDTH always go through analyze, so one
+        very long line cannot make a batch's array huge. With a cache, each
+        batch only analyzes the passwords it misses, and stores their results.
         
-        return analysis
+        Args:
+            passwords (iterable): Passwords to analyze
+            start (int): Number assigned to the first password
+            batch_size (int): Passwords per vectorized batch
+        
+        Yields:
+            AuditRecord: Compact analysis result for each password
+        """
+        if np is None:
+            for index, password in enumerate(passwords, start):
+                yield self._audit_record(index, password)
+            return
+        
+        passwords = iter(passwords)
+        index = start
+        while True:
+            batch = list(itertools.islice(passwords, batch_size))
+            if not batch:
+                break
+            if self.cache is None:
+                yield from self._batch_records(index, batch)
+            else:
+                yield from self._cached_batch_records(index, batch)
+            index += len(batch)
+    
+    def _batch_records(self, index, batch):
+        """Audit records of one batch, read straight from analyze_batch."""
+        short = [password for password in batch if len(password) <= AUDIT_MAX_BATCH_WIDTH]
+        analysis = self.analyze_batch(short)
+        pattern_names = list(analysis['patterns'])
+        found = zip(*(analysis['patterns'][name].tolist() for name in pattern_names))
+        rows = zip(analysis['length'].tolist(), analysis['entropy_bits'].tolist(),
+                   analysis['strength_rating'].tolist(), found)
+        for password in batch:
+            if len(password) > AUDIT_MAX_BATCH_WIDTH:
+                yield self._audit_record(index, password)
+            else:
+                length, entropy_bits, rating, row = next(rows)
+                yield AuditRecord(
+                    index, length, entropy_bits, rating,
+                    tuple(name for name, exists in zip(pattern_names, row) if exists)
+                )
+            index += 1
+    
+    def _cached_batch_records(self, index, batch):
+        """Audit records of one batch, batching only the cache misses."""
+        analyses = [None] * len(batch)
+        missed = {}
+        for position, password in enumerate(batch):
+            if len(password) > AUDIT_MAX_BATCH_WIDTH:
+                analyses[position] = self.analyze(password)
+                continue
+            key = self.cache.key(password)
+            if key in missed:
+                missed[key].append(position)
+                continue
+            analyses[position] = self.cache.get(key)
+            if analyses[position] is None:
+                missed[key] = [position]
+        
+        fresh = self._batch_analyses([batch[positions[0]] for positions in missed.values()])
+        for (key, positions), analysis in zip(missed.items(), fresh):
+            self.cache.put(key, analysis)
+            for position in positions:
+                analyses[position] = analysis
+        
+        for offset, analysis in enumerate(analyses):
+            yield self._audit_summary(index + offset, analysis)
+    
+    def _batch_analyses(self, passwords):
+        """Run analyze_batch and rebuild the PasswordAnalysis of each password."""
+        analysis = self.analyze_batch(passwords)
+        pattern_names = list(analysis['patterns'])
+        found = zip(*(analysis['patterns'][name].tolist() for name in pattern_names))
+        columns = ('length', 'lowercase_count', 'uppercase_count', 'digit_count',
+                   'special_char_count', 'unicode_chars', 'strength_rating')
+        rows = zip(*(analysis[column].tolist() for column in columns), found)
+        for length, *class_counts, unicode_chars, rating, row in rows:
+            # Recomputed like _analyze_uncached, since the batch rounds entropy
+            total_possible_chars = 0
+            for count, (_, size) in zip(class_counts, CHAR_CLASS_SIZES):
+                if count:
+                    total_possible_chars += size
+            yield PasswordAnalysis(
+                length, *class_counts,
+                unicode_chars=unicode_chars,
+                patterns=tuple(zip(pattern_names, row)),
+                entropy_base=total_possible_chars,
+                entropy_bits=(length * math.log2(total_possible_chars)
+                              if total_possible_chars else 0.0),
+                strength_rating=rating
+            )
+    
+    def _audit_record(self, index, password):
+        """Analyze one password with analyze and summarize it for an audit."""
+        return self._audit_summary(index, self.analyze(password))
+    
+    def _audit_summary(self, index, analysis):
+        """Summarize a PasswordAnalysis as an AuditRecord."""
+        return AuditRecord(
+            index,
+            analysis.length,
+            round(analysis.entropy_bits, 2),
+            analysis.strength_rating,
+            tuple(name for name, exists in analysis.patterns if exists)
+        )
+    
+    def audit_file(self, input_path, output_path=None, output_format='csv',
+                   chunk_size=AUDIT_CHUNK_SIZE, workers=1):
+        """
+        Audit a newline-delimited password file.
+        
+        Results are streamed to the output file one row at a time, so memory
+        use does not depend on the size of the input.
+        
+        Args:
+            input_path (str): File with one password per line
+            output_path (str): Optional CSV/JSONL file for per-password rows
+            output_format (str): 'csv' or 'jsonl'
+            chunk_size (int): Number of bytes read from the input at a time
+            workers (int): Number of processes; more than one shards the file
+                across a process pool (see audit_file_parallel)
+        
+        Returns:
+            AuditSummary: Aggregated counts for the whole file
+        """
+        if workers > 1:
+            return audit_file_parallel(input_path, output_path, output_format,
+                                       workers, analyzer=self)
+        
+        summary = AuditSummary()
+        records = self.analyze_many(iter_password_file(input_path, chunk_size))
+        
+        if output_path is None:
+            for record in records:
+                summary.add(record)
+            return summary
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as output:
+            writer = AuditWriter(output, output_format)
+            for record in records:
+                writer.write(record)
+                summary.add(record)
+        return summary
     
     def _rate_password_strength(self, analysis):
         """
         Rate password strength based on multiple factors.
         
         Args:
-            analysis (dict): Password analysis details
+            analysis (PasswordAnalysis): Password analysis details
         
         Returns:
             str: Strength rating
@@ -86,32 +915,40 @@ class PasswordAnalyzer:
         score = 0
         
         # Length scoring
-        if analysis['length'] >= 16:
+        if analysis.length >= 16:
             score += 3
-        elif analysis['length'] >= 12:
+        elif analysis.length >= 12:
             score += 2
-        elif analysis['length'] >= 8:
+        elif analysis.length >= 8:
             score += 1
         
         # Character diversity scoring
-        if analysis['lowercase_count'] > 0:
+        if analysis.lowercase_count > 0:
             score += 1
-        if analysis['uppercase_count'] > 0:
+        if analysis.uppercase_count > 0:
             score += 1
-        if analysis['digit_count'] > 0:
+        if analysis.digit_count > 0:
             score += 1
-        if analysis['special_char_count'] > 0:
+        if analysis.special_char_count > 0:
             score += 1
         
-        # Penalize for patterns and weak characteristics
-        for pattern, exists in analysis['patterns'].items():
+        # Penalize for patterns and weak characteristics, once per family
+        families = self.pattern_engine.families
+        penalized = set()
+        for pattern, exists in analysis.patterns:
             if exists:
-                score -= 1
+                family = families.get(pattern, pattern)
+                if family not in penalized:
+                    penalized.add(family)
+                    score -= 1
+                # Known breached passwords are in every attacker's wordlist
+                if pattern == 'breached':
+                    score -= BREACHED_PENALTY
         
         # Entropy-based rating
-        if self.entropy_bits > 60:
+        if analysis.entropy_bits > 60:
             score += 2
-        elif self.entropy_bits > 40:
+        elif analysis.entropy_bits > 40:
             score += 1
         
         # Determine strength category
@@ -136,16 +973,550 @@ class PasswordAnalyzer:
         Returns:
             str: Generated strong password
         """
-        # Combine character sets for maximum entropy
-        all_chars = self.lowercase + self.uppercase + self.digits + self.punctuation
-        
         # Use secrets module for cryptographically secure random selection
-        password = ''.join(secrets.choice(all_chars) for _ in range(length))
+        password = ''.join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
         return password
 
-def main():
-    analyzer = PasswordAnalyzer()
+class SecureIndexStream:
+    """
+    Uniformly random indexes below a fixed size.
+    
+    Random bytes are drawn from secrets.token_bytes in large blocks. Bytes
+    that would bias the result (those at or above the largest multiple of
+    size) are rejected, and the rest are reduced modulo size, all with
+    bytes.translate so no Python-level work is done per byte.
+    """
+    def __init__(self, size, block_size=GENERATOR_BLOCK_SIZE):
+        """
+        Args:
+            size (int): Number of possible indexes, from 1 to 256
+            block_size (int): Random bytes requested at a time
+        """
+        if not 0 < size <= 256:
+            raise ValueError("SecureIndexStream size must be between 1 and 256")
+        self.size = size
+        self.block_size = block_size
+        self._reject = bytes(range(256 - 256 % size, 256))
+        self._reduce = bytes(value % size for value in range(256))
+        self._buffer = b''
+        self._offset = 0
+    
+    def take(self, count):
+        """
+        Draw random indexes.
+        
+        Args:
+            count (int): Number of indexes to draw
+        
+        Returns:
+            bytes: count values, each uniformly distributed below size
+        """
+        while len(self._buffer) - self._offset < count:
+            block = secrets.token_bytes(max(self.block_size, count))
+            accepted = block.translate(None, self._reject).translate(self._reduce)
+            self._buffer = self._buffer[self._offset:] + accepted
+            self._offset = 0
+        start = self._offset
+        self._offset += count
+        return self._buffer[start:self._offset]
+
+class SecureCharStream:
+    """Uniformly random characters from an ASCII alphabet."""
+    def __init__(self, alphabet, block_size=GENERATOR_BLOCK_SIZE):
+        """
+        Args:
+            alphabet (str): Distinct ASCII characters to choose from
+            block_size (int): Random bytes requested at a time
+        """
+        if len(set(alphabet)) != len(alphabet) or not alphabet.isascii():
+            raise ValueError("Alphabet must be distinct ASCII characters")
+        self._indexes = SecureIndexStream(len(alphabet), block_size)
+        self._table = alphabet.encode('ascii').ljust(256, b'\x00')
+    
+    def take(self, count):
+        """
+        Draw random characters.
+        
+        Args:
+            count (int): Number of characters to draw
+        
+        Returns:
+            str: count characters from the alphabet
+        """
+        return self._indexes.take(count).translate(self._table).decode('ascii')
+
+class PasswordGenerator:
+    """
+    High-throughput cryptographically secure password generator.
+    
+    Each password gets one character from every required set, inserted at
+    random positions among characters drawn from the full alphabet. This
+    meets the policy directly instead of regenerating until it is met.
+    """
+    def __init__(self, alphabet=PASSWORD_ALPHABET, required_sets=PASSWORD_CHARACTER_SETS,
+                 block_size=GENERATOR_BLOCK_SIZE):
+        """
+        Args:
+            alphabet (str): Characters passwords are drawn from
+            required_sets (tuple): Character sets every password must use
+            block_size (int): Random bytes requested at a time
+        """
+        self.alphabet = alphabet
+        self.required_sets = tuple(required_sets)
+        self.block_size = block_size
+        self._chars = SecureCharStream(alphabet, block_size)
+        self._required = [SecureCharStream(chars, block_size)
+                          for chars in self.required_sets]
+        self._positions = {}
+    
+    def _position_stream(self, size):
+        """Index stream for insertion positions, or None above 256."""
+        if size > 256:
+            return None
+        if size not in self._positions:
+            self._positions[size] = SecureIndexStream(size, self.block_size)
+        return self._positions[size]
+    
+    def generate_many(self, count, length=16):
+        """
+        Generate passwords lazily.
+        
+        Args:
+            count (int): Number of passwords to generate
+            length (int): Length of each password
+        
+        Yields:
+            str: Generated passwords
+        """
+        required_count = len(self._required)
+        if length < required_count:
+            raise ValueError(f"Length must be at least {required_count} "
+                             f"to include every required character set")
+        free_length = length - required_count
+        position_streams = [self._position_stream(free_length + i + 1)
+                            for i in range(required_count)]
+        
+        for _ in range(count):
+            password = self._chars.take(free_length)
+            for chars, positions in zip(self._required, position_streams):
+                size = len(password) + 1
+                position = (positions.take(1)[0] if positions is not None
+                            else secrets.randbelow(size))
+                password = password[:position] + chars.take(1) + password[position:]
+            yield password
+    
+    def write(self, path, count, length=16, batch_size=GENERATOR_WRITE_BATCH):
+        """
+        Stream generated passwords to a file, one per line.
+        
+        Args:
+            path (str): File to write
+            count (int): Number of passwords to generate
+            length (int): Length of each password
+            batch_size (int): Passwords written per file write
+        """
+        passwords = self.generate_many(count, length)
+        with open(path, 'w', encoding='ascii') as output:
+            while True:
+                batch = list(itertools.islice(passwords, batch_size))
+                if not batch:
+                    break
+                output.write('\n'.join(batch) + '\n')
+
+class AuditSummary:
+    """Running histogram of strength ratings and detected patterns."""
+    def __init__(self):
+        self.total = 0
+        self.ratings = Counter()
+        self.patterns = Counter()
     
+    def add(self, record):
+        """
+        Count a single audit record.
+        
+        Args:
+            record (AuditRecord): Result to include in the summary
+        """
+        self.total += 1
+        self.ratings[record.strength_rating] += 1
+        self.patterns.update(record.patterns)
+    
+    def merge(self, other):
+        """
+        Add the counts from another summary.
+        
+        Args:
+            other (AuditSummary): Summary to fold into this one
+        """
+        self.total += other.total
+        self.ratings.update(other.ratings)
+        self.patterns.update(other.patterns)
+    
+    def as_dict(self):
+        """
+        Convert the summary into plain, JSON-serializable data.
+        
+        Returns:
+            dict: Total count plus rating and pattern histograms
+        """
+        return {
+            'total': self.total,
+            'ratings': dict(sorted(self.ratings.items())),
+            'patterns': dict(sorted(self.patterns.items()))
+        }
+
+class BreachedPasswordFilter:
+    """
+    Memory-mapped Bloom filter of breached passwords.
+    
+    The filter file is built once from a wordlist and then opened with mmap,
+    so loading is instant and only the pages touched by lookups become
+    resident. Each lookup checks a fixed number of bits, regardless of how
+    many passwords the wordlist contained. False positives are possible at
+    the rate chosen when building; false negatives are not.
+    
+    File layout: an 8-byte magic string, the bit count (uint64) and the
+    number of hash functions (uint32), followed by the bit array.
+    """
+    MAGIC = b'PWBLOOM1'
+    HEADER = struct.Struct('<8sQI')
+    
+    def __init__(self, path):
+        """
+        Open an existing filter file.
+        
+        Args:
+            path (str): Filter file created by BreachedPasswordFilter.build
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bit_count, self.hash_count = self.HEADER.unpack_from(self._mmap)
+        if magic != self.MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a breached password filter")
+    
+    @classmethod
+    def build(cls, wordlist_path, output_path, expected_items=None,
+              false_positive_rate=0.001):
+        """
+        Build a filter file from a newline-delimited wordlist.
+        
+        The bit array is written through a memory map of the output file, so
+        building does not need the whole filter in process memory.
+        
+        Args:
+            wordlist_path (str): File with one breached password per line
+            output_path (str): Where to write the filter
+            expected_items (int): Number of passwords in the wordlist;
+                counted with an extra pass over the file when omitted
+            false_positive_rate (float): Target false positive probability
+        
+        Returns:
+            BreachedPasswordFilter: The newly built filter, opened for lookups
+        """
+        if expected_items is None:
+            expected_items = sum(1 for _ in iter_password_file(wordlist_path))
+        expected_items = max(1, expected_items)
+        
+        # Standard Bloom filter sizing for n items at false positive rate p
+        bit_count = max(8, math.ceil(
+            -expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / expected_items * math.log(2)))
+        
+        with open(output_path, 'w+b') as file:
+            file.truncate(cls.HEADER.size + (bit_count + 7) // 8)
+            with mmap.mmap(file.fileno(), 0) as bits:
+                cls.HEADER.pack_into(bits, 0, cls.MAGIC, bit_count, hash_count)
+                for password in iter_password_file(wordlist_path):
+                    normalized_password = unicodedata.normalize('NFKD', password)
+                    for position in cls._bit_positions(normalized_password,
+                                                       bit_count, hash_count):
+                        offset = cls.HEADER.size + (position >> 3)
+                        bits[offset] |= 1 << (position & 7)
+        return cls(output_path)
+    
+    @staticmethod
+    def _bit_positions(password, bit_count, hash_count):
+        """
+        Derive the filter bit positions for a password.
+        
+        Uses double hashing over one 128-bit BLAKE2b digest instead of
+        computing a separate hash per position.
+        """
+        digest = hashlib.blake2b(password.encode('utf-8', 'surrogatepass'),
+                                 digest_size=16).digest()
+        first, second = struct.unpack('<QQ', digest)
+        second |= 1
+        return [(first + i * second) % bit_count for i in range(hash_count)]
+    
+    def __contains__(self, password):
+        """
+        Check whether a normalized password may be in the breached list.
+        
+        Args:
+            password (str): NFKD-normalized password
+        
+        Returns:
+            bool: False if definitely not breached, True if probably breached
+        """
+        bits = self._mmap
+        header_size = self.HEADER.size
+        for position in self._bit_positions(password, self.bit_count,
+                                            self.hash_count):
+            if not bits[header_size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def close(self):
+        """Release the memory map."""
+        self._mmap.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __getstate__(self):
+        # Worker processes reopen the file instead of copying the map
+        return {'path': self.path}
+    
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+class AuditWriter:
+    """Writes audit records as CSV or JSON Lines."""
+    FIELDS = AuditRecord._fields
+    
+    def __init__(self, output, output_format='csv'):
+        """
+        Initialize the writer and emit a CSV header if needed.
+        
+        Args:
+            output (file): Text file opened for writing
+            output_format (str): 'csv' or 'jsonl'
+        """
+        if output_format not in ('csv', 'jsonl'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output = output
+        self.output_format = output_format
+        if output_format == 'csv':
+            self.csv_writer = csv.writer(output)
+            self.csv_writer.writerow(self.FIELDS)
+    
+    def write(self, record):
+        """
+        Write one audit record.
+        
+        Args:
+            record (AuditRecord): Result to write
+        """
+        if self.output_format == 'csv':
+            self.csv_writer.writerow(record._replace(patterns=';'.join(record.patterns)))
+        else:
+            self.output.write(json.dumps(record._asdict()) + '\n')
+
+def iter_password_file(path, chunk_size=AUDIT_CHUNK_SIZE, start=0, end=None):
+    """
+    Stream passwords from a newline-delimited file.
+    
+    The file is read in large binary chunks and split on newlines, so only
+    one chunk is held in memory at a time. Blank lines are skipped and
+    undecodable bytes are replaced rather than aborting the audit.
+    
+    A byte range can be given to read a single shard of the file. A line
+    belongs to the shard that contains its first byte, so adjacent shards
+    never skip or repeat a password.
+    
+    Args:
+        path (str): File with one password per line
+        chunk_size (int): Number of bytes read at a time
+        start (int): Byte offset where the shard begins
+        end (int): Byte offset where the shard ends (None for end of file)
+    
+    Yields:
+        str: Each password in the file
+    """
+    remainder = b''
+    with open(path, 'rb') as file:
+        if start > 0:
+            # Skip the line that started in the previous shard
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        
+        while end is None or position < end:
+            size = chunk_size if end is None else min(chunk_size, end - position)
+            chunk = file.read(size)
+            if not chunk:
+                break
+            position += len(chunk)
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+            for line in lines:
+                line = line.rstrip(b'\r')
+                if line:
+                    yield line.decode('utf-8', 'replace')
+        
+        if remainder and end is not None:
+            # The last line started inside this shard; finish reading it
+            remainder += file.readline()
+    remainder = remainder.rstrip(b'\r\n')
+    if remainder:
+        yield remainder.decode('utf-8', 'replace')
+
+def shard_file(path, shard_size=AUDIT_SHARD_SIZE):
+    """
+    Split a file into contiguous byte ranges.
+    
+    Args:
+        path (str): File to split
+        shard_size (int): Approximate number of bytes per shard
+    
+    Returns:
+        list: (start, end) byte offsets covering the whole file
+    """
+    file_size = os.path.getsize(path)
+    return [(start, min(start + shard_size, file_size))
+            for start in range(0, file_size, shard_size)]
+
+# Analyzer owned by each audit worker process
+_worker_analyzer = None
+
+def _init_audit_worker(analyzer):
+    """
+    Install the analyzer used by an audit worker process.
+    
+    Args:
+        analyzer (PasswordAnalyzer): Analyzer copied from the parent process
+    """
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _audit_shard(task):
+    """
+    Audit one byte range of a password file inside a worker process.
+    
+    Args:
+        task (tuple): (path, start, end, keep_records)
+    
+    Returns:
+        tuple: (AuditSummary, list of AuditRecord or None). Record indexes
+        are relative to the start of the shard.
+    """
+    path, start, end, keep_records = task
+    summary = AuditSummary()
+    records = [] if keep_records else None
+    for record in _worker_analyzer.analyze_many(
+            iter_password_file(path, start=start, end=end)):
+        summary.add(record)
+        if keep_records:
+            records.append(record)
+    return summary, records
+
+def audit_file_parallel(input_path, output_path=None, output_format='csv',
+                        workers=None, shard_size=AUDIT_SHARD_SIZE, analyzer=None):
+    """
+    Audit a newline-delimited password file on several processes.
+    
+    The file is split into byte-range shards that workers analyze
+    independently. Shard results are consumed in file order, so both the
+    summary and the output rows are identical for any number of workers.
+    
+    Args:
+        input_path (str): File with one password per line
+        output_path (str): Optional CSV/JSONL file for per-password rows
+        output_format (str): 'csv' or 'jsonl'
+        workers (int): Number of worker processes (default: CPU count)
+        shard_size (int): Approximate number of bytes per shard
+        analyzer (PasswordAnalyzer): Configured analyzer to copy into each
+            worker (default: a new PasswordAnalyzer)
+    
+    Returns:
+        AuditSummary: Aggregated counts for the whole file
+    """
+    if analyzer is None:
+        analyzer = PasswordAnalyzer()
+    workers = workers or os.cpu_count() or 1
+    # Small files still get a few shards per worker so the pool stays busy
+    file_size = os.path.getsize(input_path)
+    shard_size = max(1, min(shard_size, file_size // (workers * 4)))
+    
+    summary = AuditSummary()
+    keep_records = output_path is not None
+    tasks = [(input_path, start, end, keep_records)
+             for start, end in shard_file(input_path, shard_size)]
+    
+    with contextlib.ExitStack() as stack:
+        writer = None
+        if keep_records:
+            output = stack.enter_context(
+                open(output_path, 'w', newline='', encoding='utf-8'))
+            writer = AuditWriter(output, output_format)
+        pool = stack.enter_context(
+            multiprocessing.Pool(workers, initializer=_init_audit_worker,
+                                 initargs=(analyzer,)))
+        
+        for shard_summary, records in pool.imap(_audit_shard, tasks):
+            if writer is not None:
+                # Re-number shard-relative indexes into file order
+                offset = summary.total
+                for record in records:
+                    writer.write(record._replace(index=offset + record.index))
+            summary.merge(shard_summary)
+    return summary
+
+def print_audit_summary(summary):
+    """
+    Print an audit summary as a readable report.
+    
+    Args:
+        summary (AuditSummary): Aggregated audit results
+    """
+    print("\n--- Password Audit Summary ---")
+    print(f"Passwords analyzed: {summary.total}")
+    print("\nStrength ratings:")
+    for rating, count in sorted(summary.ratings.items()):
+        print(f"- {rating}: {count}")
+    print("\nDetected patterns:")
+    for pattern, count in sorted(summary.patterns.items()):
+        print(f"- {pattern.replace('_', ' ')}: {count}")
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Password strength checker.")
+    parser.add_argument('--audit', metavar='FILE',
+                        help="audit a newline-delimited password file")
+    parser.add_argument('--output', metavar='FILE',
+                        help="write per-password audit results or generated "
+                             "passwords to FILE")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv',
+                        help="format of the audit output (default: csv)")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="number of processes used for --audit (default: 1)")
+    parser.add_argument('--breached', metavar='FILTER',
+                        help="flag passwords found in this breached password filter")
+    parser.add_argument('--dictionary', metavar='WORDLIST',
+                        help="extra words for the dictionary pattern detector")
+    parser.add_argument('--build-breached', metavar='WORDLIST',
+                        help="build the --breached filter from a wordlist and exit")
+    parser.add_argument('--false-positive-rate', type=float, default=0.001,
+                        help="false positive rate of a built filter (default: 0.001)")
+    parser.add_argument('--cache-size', type=int, default=0, metavar='N',
+                        help="cache up to N recent analyses (default: 0, disabled)")
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL, metavar='SECONDS',
+                        help=f"lifetime of cached analyses (default: {CACHE_TTL})")
+    parser.add_argument('--generate', type=int, metavar='N',
+                        help="generate N passwords (to --output or stdout) and exit")
+    parser.add_argument('--length', type=int, default=16,
+                        help="length of generated passwords (default: 16)")
+    parser.add_argument('--any-class', action='store_true',
+                        help="do not require every character class in generated passwords")
+    return parser.parse_args(argv)
+
+def run_interactive(analyzer):
+    """Run the interactive password tool menu."""
     while True:
         print("\n--- Password Security Tool ---")
         print("1. Analyze Password")
@@ -193,5 +1564,41 @@ def main():
         else:
             print("Invalid choice. Please try again.")
 
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.generate is not None:
+        generator = PasswordGenerator(required_sets=() if args.any_class
+                                      else PASSWORD_CHARACTER_SETS)
+        if args.output:
+            generator.write(args.output, args.generate, args.length)
+        else:
+            for password in generator.generate_many(args.generate, args.length):
+                print(password)
+        return
+    
+    if args.build_breached:
+        if not args.breached:
+            raise SystemExit("--build-breached requires --breached FILTER")
+        with BreachedPasswordFilter.build(args.build_breached, args.breached,
+                                          false_positive_rate=args.false_positive_rate) as built:
+            print(f"Built {args.breached}: {built.bit_count} bits, "
+                  f"{built.hash_count} hashes")
+        return
+    
+    breached_filter = BreachedPasswordFilter(args.breached) if args.breached else None
+    pattern_engine = None
+    if args.dictionary:
+        pattern_engine = build_pattern_engine(iter_password_file(args.dictionary))
+    cache = AnalysisCache(args.cache_size, args.cache_ttl) if args.cache_size > 0 else None
+    analyzer = PasswordAnalyzer(breached_filter, pattern_engine, cache)
+    
+    if args.audit:
+        summary = analyzer.audit_file(args.audit, args.output, args.format,
+                                     workers=args.workers)
+        print_audit_summary(summary)
+    else:
+        run_interactive(analyzer)
+
 if __name__ == "__main__":
     main()
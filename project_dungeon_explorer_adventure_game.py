@@ -2,8 +2,108 @@
 # 21/11/2024
 # Dungeon Explorer Adventure Game.
 
+import argparse
+import array
+import asyncio
+import heapq
+import itertools
+import math
+import mmap
+import multiprocessing
+import os
 import random
+import statistics
+import struct
+import sys
+import threading
 import time
+from collections import Counter, namedtuple
+from collections.abc import Mapping
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the Monte Carlo estimator
+    np = None
+
+# Chance of meeting a location's enemy on arrival
+ENCOUNTER_CHANCE = 0.6
+
+# Chance that running away from a battle succeeds
+ESCAPE_CHANCE = 0.5
+
+# Range of experience points awarded for a victory
+VICTORY_XP = (10, 50)
+
+# Actions a policy can choose during a battle
+ATTACK = 'attack'
+RUN = 'run'
+
+# Battle outcomes returned by GameEngine.battle
+VICTORY = 'victory'
+ESCAPED = 'escaped'
+DEFEAT = 'defeat'
+
+# Location graph of the built-in world, shared by every GameWorld through
+# DEFAULT_MAP
+DEFAULT_LOCATIONS = {
+    "Village": ("Forest", "Cave", "Mountain"),
+    "Forest": ("Village", "Ancient Ruins"),
+    "Cave": ("Village", "Underground Cavern"),
+    "Mountain": ("Village", "Peak"),
+    "Ancient Ruins": ("Forest",),
+    "Underground Cavern": ("Cave",),
+    "Peak": ("Mountain",)
+}
+
+# Location, name, health, strength and loot of each regular enemy
+ENEMY_TEMPLATES = (
+    ("Forest", "Forest Goblin", 30, 5, ("Rusty Dagger",)),
+    ("Cave", "Cave Troll", 50, 8, ("Stone Hammer",)),
+    ("Mountain", "Mountain Golem", 70, 12, ("Enchanted Gem",)),
+    ("Underground Cavern", "Shadow Creature", 40, 7, ("Dark Crystal",)),
+    ("Ancient Ruins", "Ancient Guardian", 60, 10, ("Mysterious Scroll",))
+)
+
+# Name prefix of rooms on generated maps
+GENERATED_ROOM_PREFIX = "Chamber "
+
+# Landmarks precomputed by a RoutingIndex, and the distance marking rooms
+# that cannot be reached
+ROUTING_LANDMARKS = 8
+UNREACHABLE = 0xFFFFFFFF
+
+# Save file layout: a header, then sections of a 4-byte tag and a payload
+# length. Bump SAVE_VERSION whenever the layout changes
+SAVE_MAGIC = b'DXSAVE'
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct('<6sH')
+SAVE_SECTION = struct.Struct('<4s4xQ')
+
+# Sections save_game always writes; autosaves only append DLTA sections
+SAVE_REQUIRED_SECTIONS = (b'PLYR', b'LOCN', b'MAP ', b'ITEM', b'NAME', b'LOOT',
+                          b'ENTS', b'INVS', b'ELOC')
+
+# Real-time mode timings, in seconds, and health restored per regeneration
+TRAVEL_SECONDS = 1.0
+REGEN_SECONDS = 5.0
+REGEN_AMOUNT = 5
+RESPAWN_SECONDS = 30.0
+
+# Line that ends the server's reply to each command, and the number of
+# connections the server lets queue up while it is busy
+END_OF_RESPONSE = "END"
+SERVER_BACKLOG = 4096
+
+# Playthroughs per task handed to a simulation worker process
+SIMULATION_CHUNK_SIZE = 64
+SIMULATION_POLICIES = ('attack', 'cautious')
+
+# Battles simulated per NumPy chunk by estimate_battle_outcomes
+ESTIMATE_CHUNK_SIZE = 65_536
+
+# Something that happened in the game, reported to GameEngine listeners.
+# actor and target are characters (or location names for travel events)
+GameEvent = namedtuple('GameEvent', ['kind', 'actor', 'target', 'value'])
 
 class GameCharacter:
     """Base class for characters in the game."""
@@ -77,10 +177,15 @@ class Player(GameCharacter):
         
         Args:
             xp (int): Experience points gained
+        
+        Returns:
+            bool: True if the player leveled up
         """
         self.experience += xp
         if self.experience >= 100 * self.level:
             self.level_up()
+            return True
+        return False
     
     def level_up(self):
         """Increase player's stats when leveling up."""
@@ -88,7 +193,6 @@ class Player(GameCharacter):
         self.max_health += 20
         self.health = self.max_health
         self.strength += 5
-        print(f"🎉 {self.name} leveled up to Level {self.level}!")
 
 class Enemy(GameCharacter):
     """Enemy character class."""
@@ -105,51 +209,982 @@ class Enemy(GameCharacter):
         super().__init__(name, health, strength)
         self.loot = loot
 
+class StringTable:
+    """Interns strings so they can be stored as small integer ids."""
+    def __init__(self, strings=()):
+        """
+        Args:
+            strings (iterable): Initial strings, given ids in order
+        """
+        self.strings = []
+        self.ids = {}
+        for string in strings:
+            self.intern(string)
+    
+    def intern(self, string):
+        """
+        Get the id of a string, adding it if needed.
+        
+        Args:
+            string (str): String to intern
+        
+        Returns:
+            int: Id of the string
+        """
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+    
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+    
+    def __len__(self):
+        return len(self.strings)
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for large numbers of characters.
+    
+    Stats live in typed arrays indexed by entity id, names and loot tables
+    are interned, and inventories are arrays of interned item ids created
+    only for entities that carry something. Use view() to get a
+    character-like object for a single entity.
+    """
+    def __init__(self):
+        self.health = array.array('i')
+        self.max_health = array.array('i')
+        self.strength = array.array('i')
+        self.name_ids = array.array('I')
+        self.loot_ids = array.array('I')
+        self.names = StringTable()
+        self.items = StringTable()
+        # Interned loot tables: tuples of item ids
+        self.loot_tables = StringTable()
+        self.inventories = {}
+        # Entities changed since the last save, for incremental autosaves
+        self.dirty = set()
+        # Items already written to the save file
+        self.saved_item_count = 0
+    
+    def add(self, name, health, strength, loot=()):
+        """
+        Add a character at full health.
+        
+        Args:
+            name (str): Character's name
+            health (int): Starting and maximum health
+            strength (int): Character's strength level
+            loot (list): Possible items to drop
+        
+        Returns:
+            int: Entity id of the new character
+        """
+        entity_id = len(self.health)
+        self.health.append(health)
+        self.max_health.append(health)
+        self.strength.append(strength)
+        self.name_ids.append(self.names.intern(name))
+        self.loot_ids.append(self.loot_tables.intern(
+            tuple(self.items.intern(item) for item in loot)))
+        return entity_id
+    
+    def add_enemy(self, template):
+        """
+        Add a fresh copy of an enemy.
+        
+        Args:
+            template (Enemy): Enemy whose name, stats and loot are copied
+        
+        Returns:
+            int: Entity id of the new enemy
+        """
+        return self.add(template.name, template.max_health, template.strength,
+                        template.loot)
+    
+    def view(self, entity_id):
+        """
+        Get a character-like facade for one entity.
+        
+        Args:
+            entity_id (int): Entity to view
+        
+        Returns:
+            StoredCharacter: Facade reading and writing the store's arrays
+        """
+        return StoredCharacter(self, entity_id)
+    
+    def __len__(self):
+        return len(self.health)
+
+class StoredCharacter:
+    """
+    Lightweight facade over one EntityStore entity.
+    
+    Supports the same attributes and methods the game uses on Enemy, so it
+    can be passed to GameEngine.battle. inventory and loot return new lists;
+    use add_to_inventory to change the inventory.
+    """
+    __slots__ = ('store', 'entity_id')
+    
+    def __init__(self, store, entity_id):
+        """
+        Args:
+            store (EntityStore): Store holding the entity
+            entity_id (int): Entity this facade refers to
+        """
+        self.store = store
+        self.entity_id = entity_id
+    
+    @property
+    def name(self):
+        return self.store.names[self.store.name_ids[self.entity_id]]
+    
+    @property
+    def health(self):
+        return self.store.health[self.entity_id]
+    
+    @health.setter
+    def health(self, value):
+        self.store.health[self.entity_id] = value
+        self.store.dirty.add(self.entity_id)
+    
+    @property
+    def max_health(self):
+        return self.store.max_health[self.entity_id]
+    
+    @property
+    def strength(self):
+        return self.store.strength[self.entity_id]
+    
+    @property
+    def loot(self):
+        store = self.store
+        return [store.items[item_id]
+                for item_id in store.loot_tables[store.loot_ids[self.entity_id]]]
+    
+    @property
+    def inventory(self):
+        store = self.store
+        return [store.items[item_id]
+                for item_id in store.inventories.get(self.entity_id, ())]
+    
+    def is_alive(self):
+        """
+        Check if character is alive.
+        
+        Returns:
+            bool: True if health > 0, False otherwise
+        """
+        return self.store.health[self.entity_id] > 0
+    
+    def take_damage(self, damage):
+        """
+        Reduce character's health.
+        
+        Args:
+            damage (int): Amount of damage to inflict
+        """
+        health = self.store.health
+        health[self.entity_id] = max(0, health[self.entity_id] - damage)
+        self.store.dirty.add(self.entity_id)
+    
+    def heal(self, amount):
+        """
+        Restore character's health.
+        
+        Args:
+            amount (int): Health points to restore
+        """
+        health = self.store.health
+        health[self.entity_id] = min(self.store.max_health[self.entity_id],
+                                     health[self.entity_id] + amount)
+        self.store.dirty.add(self.entity_id)
+    
+    def add_to_inventory(self, item):
+        """
+        Add item to character's inventory.
+        
+        Args:
+            item (str): Item to add
+        """
+        store = self.store
+        inventory = store.inventories.get(self.entity_id)
+        if inventory is None:
+            inventory = store.inventories[self.entity_id] = array.array('I')
+        inventory.append(store.items.intern(item))
+        store.dirty.add(self.entity_id)
+
+class DungeonMap(Mapping):
+    """
+    Location graph stored in compressed sparse row (CSR) form.
+    
+    The neighbours of location i are targets[offsets[i]:offsets[i + 1]].
+    It behaves like the dict of neighbour name lists used for
+    GameWorld.locations, so the engine works with either. Generated maps
+    name their rooms on demand instead of storing a string per location.
+    """
+    def __init__(self, offsets, targets, names=None):
+        """
+        Args:
+            offsets (array): Start of each location's neighbours in targets,
+                plus a final end offset
+            targets (array): Neighbour location ids
+            names (StringTable): Location names by id, or None to use
+                generated "Chamber <id>" names
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.names = names
+        self._routing_index = None
+    
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        """
+        Build a map from a dict of neighbour name lists.
+        
+        Args:
+            adjacency (dict): Location name to neighbouring location names
+        
+        Returns:
+            DungeonMap: Equivalent CSR map
+        """
+        names = StringTable(adjacency)
+        offsets = array.array('I', [0])
+        targets = array.array('I')
+        for neighbours in adjacency.values():
+            targets.extend(names.intern(name) for name in neighbours)
+            offsets.append(len(targets))
+        return cls(offsets, targets, names)
+    
+    def name(self, location_id):
+        """Name of a location id."""
+        if self.names is not None:
+            return self.names[location_id]
+        return f"{GENERATED_ROOM_PREFIX}{location_id}"
+    
+    def location_id(self, name):
+        """
+        Id of a location name.
+        
+        Raises:
+            KeyError: If there is no such location
+        """
+        if self.names is not None:
+            return self.names.ids[name]
+        if name.startswith(GENERATED_ROOM_PREFIX):
+            number = name[len(GENERATED_ROOM_PREFIX):]
+            if number.isdigit() and int(number) < len(self):
+                return int(number)
+        raise KeyError(name)
+    
+    def routing_index(self):
+        """RoutingIndex over this map, built on first use and then shared."""
+        if self._routing_index is None:
+            self._routing_index = RoutingIndex(self)
+        return self._routing_index
+    
+    def neighbor_ids(self, location_id):
+        """Ids of the locations adjacent to a location id."""
+        return self.targets[self.offsets[location_id]:self.offsets[location_id + 1]]
+    
+    def __getitem__(self, name):
+        return [self.name(target) for target in self.neighbor_ids(self.location_id(name))]
+    
+    def __contains__(self, name):
+        try:
+            self.location_id(name)
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self):
+        return (self.name(location_id) for location_id in range(len(self)))
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+
+def generate_dungeon_map(size, loop_chance=0.1, seed=None):
+    """
+    Generate a maze-like dungeon of connected rooms.
+    
+    Rooms are laid out on a grid. Every room except the first opens a door
+    to its west or north neighbour, which yields a spanning tree, so every
+    room is reachable; with probability loop_chance it opens both, adding
+    loops.
+    
+    Args:
+        size (int): Number of rooms
+        loop_chance (float): Chance that a room opens an extra door
+        seed (int): Seed for the random layout
+    
+    Returns:
+        DungeonMap: The generated map
+    """
+    rng = random.Random(seed)
+    width = max(1, math.isqrt(size - 1) + 1) if size > 0 else 1
+    sources = array.array('I')
+    destinations = array.array('I')
+    degree = array.array('I', bytes(4 * size))
+    
+    for room in range(1, size):
+        x = room % width
+        doors = []
+        if x > 0:
+            doors.append(room - 1)
+        if room >= width:
+            doors.append(room - width)
+        if len(doors) == 2 and rng.random() >= loop_chance:
+            doors = [doors[rng.random() < 0.5]]
+        for neighbour in doors:
+            sources.append(room)
+            destinations.append(neighbour)
+            degree[room] += 1
+            degree[neighbour] += 1
+    
+    # Counting sort of both directions of every door into CSR order
+    offsets = array.array('I', [0]) * (size + 1)
+    for room in range(size):
+        offsets[room + 1] = offsets[room] + degree[room]
+    fill = array.array('I', offsets[:size])
+    targets = array.array('I', bytes(4 * offsets[size]))
+    for room, neighbour in zip(sources, destinations):
+        targets[fill[room]] = neighbour
+        fill[room] += 1
+        targets[fill[neighbour]] = room
+        fill[neighbour] += 1
+    return DungeonMap(offsets, targets)
+
+DEFAULT_MAP = DungeonMap.from_adjacency(DEFAULT_LOCATIONS)
+
+class RoutingIndex:
+    """
+    Landmark-based (ALT) shortest path index over a DungeonMap.
+    
+    Hop distances from a few far-apart landmark rooms are computed once.
+    By the triangle inequality they bound the distance between any two
+    rooms in O(landmarks) time, and the lower bound steers an A* search
+    that finds exact routes while expanding far fewer rooms than BFS.
+    """
+    def __init__(self, dungeon_map, landmark_count=ROUTING_LANDMARKS):
+        """
+        Args:
+            dungeon_map (DungeonMap): Map to index
+            landmark_count (int): Number of landmarks to precompute
+        """
+        self.map = dungeon_map
+        self.landmark_distances = []
+        self.landmarks = []
+        
+        # Farthest-point selection: each landmark is the room farthest from
+        # the landmarks chosen so far
+        closest = None
+        candidate = 0
+        for _ in range(min(landmark_count, len(dungeon_map))):
+            distances = self._hop_distances(candidate)
+            self.landmarks.append(candidate)
+            self.landmark_distances.append(distances)
+            closest = distances if closest is None else array.array(
+                'I', map(min, closest, distances))
+            candidate = max(range(len(closest)),
+                            key=lambda room: closest[room] if closest[room] != UNREACHABLE else -1)
+    
+    def _hop_distances(self, source):
+        """Breadth-first hop distances from one room to every room."""
+        offsets, targets = self.map.offsets, self.map.targets
+        distances = array.array('I', [UNREACHABLE]) * len(self.map)
+        distances[source] = 0
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for room in frontier:
+                for neighbour in targets[offsets[room]:offsets[room + 1]]:
+                    if distances[neighbour] == UNREACHABLE:
+                        distances[neighbour] = depth
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distances
+    
+    def distance_bounds(self, source, target):
+        """
+        Bound the hop distance between two rooms without searching.
+        
+        Args:
+            source (int): Start location id
+            target (int): Destination location id
+        
+        Returns:
+            tuple: (lower, upper) bounds on the number of hops
+        """
+        lower, upper = 0, UNREACHABLE
+        for distances in self.landmark_distances:
+            to_source, to_target = distances[source], distances[target]
+            lower = max(lower, abs(to_source - to_target))
+            upper = min(upper, to_source + to_target)
+        return lower, upper
+    
+    def shortest_path(self, source, target):
+        """
+        Find a shortest route with A* guided by the landmark bounds.
+        
+        Args:
+            source (int): Start location id
+            target (int): Destination location id
+        
+        Returns:
+            list: Location ids from source to target, or None if unreachable
+        """
+        offsets, targets = self.map.offsets, self.map.targets
+        landmark_targets = [(distances, distances[target])
+                            for distances in self.landmark_distances]
+        if any(to_target == UNREACHABLE and distances[source] != UNREACHABLE
+               for distances, to_target in landmark_targets):
+            return None
+        
+        def estimate(room):
+            return max((abs(distances[room] - to_target)
+                        for distances, to_target in landmark_targets), default=0)
+        
+        hops = {source: 0}
+        previous = {source: None}
+        queue = [(estimate(source), 0, source)]
+        while queue:
+            _, room_hops, room = heapq.heappop(queue)
+            if room == target:
+                path = []
+                while room is not None:
+                    path.append(room)
+                    room = previous[room]
+                return path[::-1]
+            if room_hops > hops[room]:
+                continue
+            for neighbour in targets[offsets[room]:offsets[room + 1]]:
+                neighbour_hops = room_hops + 1
+                if neighbour_hops < hops.get(neighbour, UNREACHABLE):
+                    hops[neighbour] = neighbour_hops
+                    previous[neighbour] = room
+                    heapq.heappush(queue, (neighbour_hops + estimate(neighbour),
+                                           neighbour_hops, neighbour))
+        return None
+    
+    def route(self, source, destination):
+        """
+        Find a shortest route between two named locations.
+        
+        Args:
+            source (str): Start location name
+            destination (str): Destination location name
+        
+        Returns:
+            list: Location names from source to destination, or None if the
+            destination is unknown or unreachable
+        """
+        try:
+            path = self.shortest_path(self.map.location_id(source),
+                                      self.map.location_id(destination))
+        except KeyError:
+            return None
+        if path is None:
+            return None
+        return [self.map.name(location_id) for location_id in path]
+
+class LocationEnemies(Mapping):
+    """
+    Enemies of a generated map, stored in an EntityStore.
+    
+    Behaves like the GameWorld.enemies dict, mapping location names to
+    enemies, with at most one enemy per location.
+    """
+    def __init__(self, dungeon_map, store, entity_ids):
+        """
+        Args:
+            dungeon_map (DungeonMap): Map the enemies live on
+            store (EntityStore): Store holding the enemies
+            entity_ids (array): Entity id for each location id, or -1
+        """
+        self.map = dungeon_map
+        self.store = store
+        self.entity_ids = entity_ids
+    
+    def _entity_id(self, name):
+        try:
+            return self.entity_ids[self.map.location_id(name)]
+        except KeyError:
+            return -1
+    
+    def __getitem__(self, name):
+        entity_id = self._entity_id(name)
+        if entity_id < 0:
+            raise KeyError(name)
+        return self.store.view(entity_id)
+    
+    def __contains__(self, name):
+        return self._entity_id(name) >= 0
+    
+    def __iter__(self):
+        return (self.map.name(location_id)
+                for location_id, entity_id in enumerate(self.entity_ids) if entity_id >= 0)
+    
+    def __len__(self):
+        # Count like __iter__; the store may hold entities placed nowhere
+        return sum(1 for entity_id in self.entity_ids if entity_id >= 0)
+
+class GameEngine:
+    """
+    Game rules without any input or output.
+    
+    Decisions come from a policy object and everything that happens is
+    reported as GameEvent values to the optional on_event listener, so the
+    same rules drive both the interactive game and headless simulations.
+    
+    A policy provides choose_destination(world), returning a location name,
+    and choose_action(player, enemy), returning ATTACK or RUN.
+    """
+    def __init__(self, rng=None, on_event=None):
+        """
+        Args:
+            rng (random.Random): Random number source (default: a new one)
+            on_event (callable): Called with each GameEvent, or None to skip
+                building events entirely
+        """
+        self.rng = rng or random.Random()
+        self.on_event = on_event
+    
+    def _emit(self, kind, actor=None, target=None, value=None):
+        """Report an event to the listener, if there is one."""
+        if self.on_event is not None:
+            self.on_event(GameEvent(kind, actor, target, value))
+    
+    def explore(self, world, policy):
+        """
+        Let the policy pick a destination, travel there and fight any
+        encounter.
+        
+        Args:
+            world (GameWorld): World to explore
+            policy: Decision maker for the destination and battle actions
+        
+        Returns:
+            str: Battle outcome, or None if no battle took place
+        """
+        enemy = self.travel(world, policy.choose_destination(world))
+        if enemy is None:
+            return None
+        return self.battle(world.player, enemy, policy)
+    
+    def travel_to(self, world, destination, policy):
+        """
+        Travel along the shortest route to any reachable location.
+        
+        The journey stops early if an encounter happens on the way.
+        
+        Args:
+            world (GameWorld): World the player is in
+            destination (str): Location to reach
+            policy: Chooses battle actions for encounters on the way
+        
+        Returns:
+            str: Battle outcome, or None if no battle took place
+        """
+        route = world.route_index.route(world.current_location, destination)
+        if route is None:
+            self._emit('invalid_destination', target=destination)
+            return None
+        
+        self._emit('route', target=destination, value=len(route) - 1)
+        for step, location in enumerate(route[1:], 1):
+            enemy = self.travel(world, location, remaining=len(route) - 1 - step)
+            if enemy is not None:
+                return self.battle(world.player, enemy, policy)
+        return None
+    
+    def travel(self, world, destination, remaining=None):
+        """
+        Move the player to an adjacent location.
+        
+        Args:
+            world (GameWorld): World the player is in
+            destination (str): Location to travel to
+            remaining (int): Steps left after this one when following a
+                route; reported as the travel event's value
+        
+        Returns:
+            Enemy: Enemy encountered on arrival, or None
+        """
+        if destination not in world.locations[world.current_location]:
+            self._emit('invalid_destination', target=destination)
+            return None
+        
+        world.current_location = destination
+        self._emit('travel', target=destination, value=remaining)
+        
+        # Random encounter chance
+        if self.rng.random() < ENCOUNTER_CHANCE and destination in world.enemies:
+            enemy = world.enemies[destination]
+            self._emit('encounter', target=enemy)
+            return enemy
+        return None
+    
+    def battle(self, player, enemy, policy):
+        """
+        Resolve combat between the player and an enemy.
+        
+        Args:
+            player (Player): Player character
+            enemy (Enemy): Enemy to fight
+            policy: Chooses ATTACK or RUN each round
+        
+        Returns:
+            str: VICTORY, ESCAPED or DEFEAT, or None if either side was
+            already dead
+        """
+        # Hot loop: bind lookups locally and skip events without a listener
+        rng = self.rng
+        random_value = rng.random
+        emit = self._emit if self.on_event is not None else None
+        choose_action = policy.choose_action
+        
+        while player.is_alive() and enemy.is_alive():
+            action = choose_action(player, enemy)
+            
+            if action == ATTACK:
+                # Player attack, rolling 1 to strength like randint(1, strength)
+                damage = int(random_value() * player.strength) + 1
+                enemy.take_damage(damage)
+                if emit:
+                    emit('attack', player, enemy, damage)
+                
+                # Enemy counterattack
+                if enemy.is_alive():
+                    enemy_damage = int(random_value() * enemy.strength) + 1
+                    player.take_damage(enemy_damage)
+                    if emit:
+                        emit('attack', enemy, player, enemy_damage)
+            elif action == RUN:
+                if random_value() < ESCAPE_CHANCE:
+                    if emit:
+                        emit('escape', player, enemy)
+                    return ESCAPED
+                if emit:
+                    emit('escape_failed', player, enemy)
+                enemy_damage = int(random_value() * enemy.strength) + 1
+                player.take_damage(enemy_damage)
+                if emit:
+                    emit('attack', enemy, player, enemy_damage)
+            
+            # Check battle outcome
+            if not enemy.is_alive():
+                loot = rng.choice(enemy.loot)
+                xp = rng.randint(*VICTORY_XP)
+                player.add_to_inventory(loot)
+                leveled_up = player.gain_experience(xp)
+                if emit:
+                    emit('victory', player, enemy)
+                    emit('experience', player, value=xp)
+                    if leveled_up:
+                        emit('level_up', player, value=player.level)
+                    emit('loot', player, enemy, loot)
+                return VICTORY
+            
+            if not player.is_alive():
+                if emit:
+                    emit('defeat', player, enemy)
+                return DEFEAT
+        return None
+
+class AlwaysAttackPolicy:
+    """Headless policy that travels at random and never runs."""
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng (random.Random): Random source for picking destinations
+        """
+        self.rng = rng or random.Random()
+    
+    def choose_destination(self, world):
+        """Pick a random neighbouring location."""
+        return self.rng.choice(world.locations[world.current_location])
+    
+    def choose_action(self, player, enemy):
+        """Always attack."""
+        return ATTACK
+
+class RunBelowHealthPolicy(AlwaysAttackPolicy):
+    """Headless policy that attacks until its health runs low, then runs."""
+    def __init__(self, run_below=0.3, rng=None):
+        """
+        Args:
+            run_below (float): Fraction of maximum health below which to run
+            rng (random.Random): Random source for picking destinations
+        """
+        super().__init__(rng)
+        self.run_below = run_below
+    
+    def choose_action(self, player, enemy):
+        """Attack, or run once health is below the threshold."""
+        if player.health < self.run_below * player.max_health:
+            return RUN
+        return ATTACK
+
+class InteractivePolicy:
+    """Asks the person at the terminal for every decision."""
+    def choose_destination(self, world):
+        """Show the current location and ask where to go."""
+        print(f"\n🌍 You are currently in {world.current_location}")
+        print("Possible destinations:", ", ".join(world.locations[world.current_location]))
+        return input("Where would you like to go? ").capitalize()
+    
+    def choose_action(self, player, enemy):
+        """Show both characters' health and ask what to do."""
+        print(f"\n{player.name}: {player.health} HP")
+        print(f"{enemy.name}: {enemy.health} HP")
+        action = input("Do you want to (A)ttack or (R)un? ").lower()
+        return {'a': ATTACK, 'r': RUN}.get(action)
+
+def describe_event(event):
+    """
+    Describe a game event as text.
+    
+    Args:
+        event (GameEvent): Event reported by the engine
+    
+    Returns:
+        str: Description, or None for events that are not shown
+    """
+    kind = event.kind
+    if kind == 'travel':
+        return f"🚶 Traveling to {event.target}..."
+    elif kind == 'route':
+        return f"🗺️ Route to {event.target}: {event.value} steps"
+    elif kind == 'invalid_destination':
+        return "❌ You cannot travel there from this location."
+    elif kind == 'encounter':
+        return f"\n⚔️ Encountered {event.target.name}!"
+    elif kind == 'attack':
+        if isinstance(event.actor, Player):
+            return f"You deal {event.value} damage to {event.target.name}"
+        return f"{event.actor.name} deals {event.value} damage to you"
+    elif kind == 'escape':
+        return "🏃 Successfully escaped!"
+    elif kind == 'escape_failed':
+        return "❌ Failed to escape!"
+    elif kind == 'victory':
+        return f"🏆 You defeated {event.target.name}!"
+    elif kind == 'level_up':
+        return f"🎉 {event.actor.name} leveled up to Level {event.value}!"
+    elif kind == 'loot':
+        return f"🎁 Found: {event.value}"
+    elif kind == 'defeat':
+        return "☠️ Game Over! You were defeated."
+    return None
+
+def print_event(event):
+    """
+    Describe a game event on the terminal.
+    
+    Travel pauses for a second: once per single move, or once per route
+    rather than for every step along it.
+    
+    Args:
+        event (GameEvent): Event reported by the engine
+    """
+    text = describe_event(event)
+    if text is not None:
+        print(text)
+    if event.kind == 'route' or (event.kind == 'travel' and event.value is None):
+        time.sleep(1)
+
+# Monte Carlo estimate for one enemy. Each *_ci field is a (low, high)
+# confidence interval around the estimate before it
+BattleEstimate = namedtuple('BattleEstimate', [
+    'enemy', 'battles', 'win_rate', 'win_rate_ci', 'expected_turns', 'turns_ci',
+    'expected_hp_lost', 'hp_lost_ci'
+])
+
+def player_at_level(level, name="Hero"):
+    """
+    Create a fresh player with the stats of a given level.
+    
+    Args:
+        level (int): Level to reach
+        name (str): Player's character name
+    
+    Returns:
+        Player: Player at full health
+    """
+    player = Player(name)
+    for _ in range(level - 1):
+        player.level_up()
+    return player
+
+def _simulate_battle_chunk(rng, player, enemy, count):
+    """
+    Simulate always-attack battles with array operations.
+    
+    Every damage roll is drawn up front: the player needs at most
+    enemy.health turns, since each hit deals at least 1 damage. Cumulative
+    damage then gives the turn each side would fall, and the player wins
+    when the enemy falls first (a dead enemy does not counterattack).
+    
+    Returns:
+        tuple: (won, turns, hp_lost) arrays for count battles
+    """
+    max_turns = enemy.health
+    player_hits = rng.integers(1, player.strength + 1, size=(count, max_turns),
+                               dtype=np.int32).cumsum(axis=1)
+    enemy_hits = rng.integers(1, enemy.strength + 1, size=(count, max_turns),
+                              dtype=np.int32).cumsum(axis=1)
+    
+    # First turn (1-based) at which each side's total damage is lethal
+    kill_turn = (player_hits >= enemy.health).argmax(axis=1) + 1
+    player_down = enemy_hits >= player.health
+    death_turn = np.where(player_down.any(axis=1), player_down.argmax(axis=1) + 1,
+                          max_turns + 1)
+    
+    won = kill_turn <= death_turn
+    turns = np.minimum(kill_turn, death_turn)
+    # The enemy strikes back on every turn before the killing blow
+    damage_taken = np.where(kill_turn > 1,
+                            enemy_hits[np.arange(count), np.maximum(kill_turn - 2, 0)], 0)
+    hp_lost = np.where(won, damage_taken, player.health)
+    return won, turns, hp_lost
+
+def estimate_battle_outcomes(level, enemies, battles=100_000, seed=None,
+                             confidence=0.95, chunk_size=ESTIMATE_CHUNK_SIZE):
+    """
+    Estimate how a player of a given level fares against each enemy.
+    
+    Battles follow the GameEngine rules with a player that always attacks,
+    and are simulated in parallel as NumPy arrays. Results are reproducible
+    for a given seed.
+    
+    Args:
+        level (int): Player level
+        enemies (iterable): Enemy templates, fought at full health
+        battles (int): Battles simulated per enemy
+        seed (int): Seed for the random generator
+        confidence (float): Confidence level of the reported intervals
+        chunk_size (int): Battles simulated per array operation
+    
+    Returns:
+        list: BattleEstimate for each enemy
+    """
+    if np is None:
+        raise RuntimeError("estimate_battle_outcomes requires NumPy to be installed")
+    
+    rng = np.random.default_rng(seed)
+    player = player_at_level(level)
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    
+    def interval(mean, std):
+        margin = z * std / battles ** 0.5
+        return (mean - margin, mean + margin)
+    
+    estimates = []
+    for enemy in enemies:
+        chunks = [_simulate_battle_chunk(rng, player, enemy, min(chunk_size, battles - start))
+                  for start in range(0, battles, chunk_size)]
+        won, turns, hp_lost = (np.concatenate(parts) for parts in zip(*chunks))
+        
+        win_rate = won.mean()
+        estimates.append(BattleEstimate(
+            enemy.name, battles,
+            float(win_rate), interval(float(win_rate), float(won.std())),
+            float(turns.mean()), interval(float(turns.mean()), float(turns.std())),
+            float(hp_lost.mean()), interval(float(hp_lost.mean()), float(hp_lost.std()))
+        ))
+    return estimates
+
 class GameWorld:
     """Manages game world and interactions."""
-    def __init__(self, player):
+    def __init__(self, player, engine=None):
         """
         Initialize game world.
         
         Args:
             player (Player): Player character
+            engine (GameEngine): Rules engine (default: one that prints
+                events to the terminal)
         """
         self.player = player
+        self.engine = engine or GameEngine(on_event=print_event)
         self.current_location = "Village"
-        self.locations = {
-            "Village": ["Forest", "Cave", "Mountain"],
-            "Forest": ["Village", "Ancient Ruins"],
-            "Cave": ["Village", "Underground Cavern"],
-            "Mountain": ["Village", "Peak"],
-            "Ancient Ruins": ["Forest"],
-            "Underground Cavern": ["Cave"],
-            "Peak": ["Mountain"]
-        }
+        # The map and loot tables never change, so every world shares them
+        self.locations = DEFAULT_MAP
         self.enemies = {
-            "Forest": Enemy("Forest Goblin", 30, 5, ["Rusty Dagger"]),
-            "Cave": Enemy("Cave Troll", 50, 8, ["Stone Hammer"]),
-            "Mountain": Enemy("Mountain Golem", 70, 12, ["Enchanted Gem"]),
-            "Underground Cavern": Enemy("Shadow Creature", 40, 7, ["Dark Crystal"]),
-            "Ancient Ruins": Enemy("Ancient Guardian", 60, 10, ["Mysterious Scroll"])
+            location: Enemy(name, health, strength, loot)
+            for location, name, health, strength, loot in ENEMY_TEMPLATES
         }
+        self._route_index = None
     
-    def explore(self):
-        """Manage player exploration and encounters."""
-        print(f"\n🌍 You are currently in {self.current_location}")
-        print("Possible destinations:", ", ".join(self.locations[self.current_location]))
+    @classmethod
+    def generate(cls, player, size, seed=None, enemy_chance=0.3, engine=None):
+        """
+        Create a world on a procedurally generated map.
         
-        choice = input("Where would you like to go? ").capitalize()
+        Enemies are copies of the regular enemy types, placed at random and
+        kept in an EntityStore.
         
-        if choice in self.locations[self.current_location]:
-            self.current_location = choice
-            print(f"🚶 Traveling to {self.current_location}...")
-            time.sleep(1)
-            
-            # Random encounter chance
-            if random.random() < 0.6 and self.current_location in self.enemies:
-                self.battle(self.enemies[self.current_location])
-        else:
-            print("❌ You cannot travel there from this location.")
+        Args:
+            player (Player): Player character
+            size (int): Number of locations
+            seed (int): Seed for the map and enemy placement
+            enemy_chance (float): Chance that a location holds an enemy
+            engine (GameEngine): Rules engine
+        
+        Returns:
+            GameWorld: World starting in the first room
+        """
+        world = cls(player, engine)
+        rng = random.Random(seed)
+        dungeon_map = generate_dungeon_map(size, seed=rng.random())
+        
+        store = EntityStore()
+        templates = [Enemy(name, health, strength, loot)
+                     for _, name, health, strength, loot in ENEMY_TEMPLATES]
+        entity_ids = array.array('i', [-1]) * size
+        for location_id in range(1, size):
+            if rng.random() < enemy_chance:
+                entity_ids[location_id] = store.add_enemy(rng.choice(templates))
+        
+        world.locations = dungeon_map
+        world.enemies = LocationEnemies(dungeon_map, store, entity_ids)
+        world.current_location = dungeon_map.name(0)
+        return world
+    
+    @property
+    def route_index(self):
+        """Routing index over the world's map, built on first use."""
+        if self._route_index is None:
+            dungeon_map = self.locations
+            if not isinstance(dungeon_map, DungeonMap):
+                dungeon_map = DungeonMap.from_adjacency(dungeon_map)
+            self._route_index = dungeon_map.routing_index()
+        return self._route_index
+    
+    def travel_to(self, destination):
+        """
+        Travel to a possibly distant location along the shortest route.
+        
+        Args:
+            destination (str): Location to reach
+        
+        Returns:
+            str: Battle outcome, or None if no battle took place
+        """
+        return self.engine.travel_to(self, destination, InteractivePolicy())
+    
+    def explore(self):
+        """
+        Manage player exploration and encounters.
+        
+        Returns:
+            str: Battle outcome, or None if no battle took place
+        """
+        return self.engine.explore(self, InteractivePolicy())
     
     def battle(self, enemy):
         """
@@ -157,54 +1192,1049 @@ class GameWorld:
         
         Args:
             enemy (Enemy): Enemy to fight
+        
+        Returns:
+            str: Battle outcome
+        """
+        return self.engine.battle(self.player, enemy, InteractivePolicy())
+
+class EventScheduler:
+    """
+    Priority queue of timed callbacks for the real-time mode.
+    
+    Scheduling and running an event cost O(log n) heap operations, and
+    cancelled events are skipped when they reach the front of the queue
+    instead of being searched for. run() sleeps on the event loop until the
+    earliest event is due and then runs every due event as one batch, so
+    the loop never busy-waits.
+    """
+    def __init__(self, clock=time.monotonic):
+        """
+        Args:
+            clock (callable): Returns the current time in seconds
         """
-        print(f"\n⚔️ Encountered {enemy.name}!")
+        self.clock = clock
+        self.queue = []
+        self.sequence = itertools.count()
+        self.wakeup = None
+    
+    def schedule(self, delay, callback, *args):
+        """
+        Run a callback after a delay.
         
-        while self.player.is_alive() and enemy.is_alive():
-            print(f"\n{self.player.name}: {self.player.health} HP")
-            print(f"{enemy.name}: {enemy.health} HP")
-            
-            action = input("Do you want to (A)ttack or (R)un? ").lower()
-            
-            if action == 'a':
-                # Player attack
-                damage = random.randint(1, self.player.strength)
-                enemy.take_damage(damage)
-                print(f"You deal {damage} damage to {enemy.name}")
-                
-                # Enemy counterattack
-                if enemy.is_alive():
-                    enemy_damage = random.randint(1, enemy.strength)
-                    self.player.take_damage(enemy_damage)
-                    print(f"{enemy.name} deals {enemy_damage} damage to you")
-            elif action == 'r':
-                if random.random() < 0.5:
-                    print("🏃 Successfully escaped!")
+        Args:
+            delay (float): Seconds from now
+            callback (callable): Function to call
+            *args: Arguments for the callback
+        
+        Returns:
+            list: Handle that can be passed to cancel()
+        """
+        entry = [self.clock() + delay, next(self.sequence), callback, args]
+        heapq.heappush(self.queue, entry)
+        # Wake run() if this event is due before the one it is waiting for
+        if self.wakeup is not None and self.queue[0] is entry:
+            self.wakeup.set()
+        return entry
+    
+    def every(self, interval, callback, *args):
+        """
+        Run a callback repeatedly, every interval seconds.
+        
+        Args:
+            interval (float): Seconds between calls, greater than zero
+            callback (callable): Function to call
+            *args: Arguments for the callback
+        
+        Returns:
+            list: Handle that can be passed to cancel()
+        """
+        entry = self.schedule(interval, None, *args)
+        
+        def repeat(*args):
+            callback(*args)
+            # Reuse the handle so cancel() keeps working, and step from the
+            # due time rather than now so the schedule does not drift
+            entry[0] += interval
+            entry[1] = next(self.sequence)
+            heapq.heappush(self.queue, entry)
+        
+        entry[2] = repeat
+        return entry
+    
+    def cancel(self, entry):
+        """
+        Cancel a scheduled event.
+        
+        Args:
+            entry (list): Handle returned by schedule() or every()
+        """
+        entry[2] = None
+    
+    def run_due(self, now=None):
+        """
+        Run every event due by a given time.
+        
+        Args:
+            now (float): Time to run events up to (default: the clock)
+        
+        Returns:
+            int: Number of events run
+        """
+        if now is None:
+            now = self.clock()
+        queue = self.queue
+        count = 0
+        while queue and queue[0][0] <= now:
+            _, _, callback, args = heapq.heappop(queue)
+            if callback is not None:
+                callback(*args)
+                count += 1
+        return count
+    
+    async def run(self, stopped):
+        """
+        Process events as they become due until stopped is set.
+        
+        Args:
+            stopped (asyncio.Event): Set to end the loop
+        """
+        self.wakeup = asyncio.Event()
+        try:
+            while not stopped.is_set():
+                self.run_due()
+                timeout = self.queue[0][0] - self.clock() if self.queue else None
+                self.wakeup.clear()
+                waiters = [asyncio.ensure_future(self.wakeup.wait()),
+                           asyncio.ensure_future(stopped.wait())]
+                _, pending = await asyncio.wait(waiters, timeout=timeout,
+                                                return_when=asyncio.FIRST_COMPLETED)
+                for waiter in pending:
+                    waiter.cancel()
+        finally:
+            self.wakeup = None
+
+class RealTimeGame:
+    """
+    Dungeon game that keeps running while the player decides.
+    
+    The player regenerates health over time, defeated enemies respawn and
+    travel takes TRAVEL_SECONDS, all driven by an EventScheduler. Commands
+    are typed at any time; battles are fought by a policy as soon as an
+    encounter happens.
+    """
+    def __init__(self, world, policy=None, scheduler=None, output=print):
+        """
+        Args:
+            world (GameWorld): World to play in
+            policy: Chooses battle actions (default: RunBelowHealthPolicy)
+            scheduler (EventScheduler): Event queue (default: a new one)
+            output (callable): Shows one line of command output
+        """
+        self.world = world
+        self.policy = policy or RunBelowHealthPolicy()
+        self.scheduler = scheduler or EventScheduler()
+        self.output = output
+        self.destination = None
+        self.stopped = None
+        self._arrival = None
+        self._regeneration = None
+    
+    def start(self):
+        """Start the game clock: regeneration and a fresh stop signal."""
+        self.stopped = asyncio.Event()
+        self._regeneration = self.scheduler.every(REGEN_SECONDS, self.regenerate)
+    
+    def close(self):
+        """Stop this game's timers so a shared scheduler can keep running."""
+        self.stop()
+        for entry in (self._regeneration, self._arrival):
+            if entry is not None:
+                self.scheduler.cancel(entry)
+    
+    def regenerate(self):
+        """Restore some of the player's health."""
+        player = self.world.player
+        if player.is_alive() and player.health < player.max_health:
+            player.heal(REGEN_AMOUNT)
+            self.world.engine._emit('regenerate', player, value=player.health)
+    
+    def travel(self, destination):
+        """
+        Set off towards an adjacent location, arriving after TRAVEL_SECONDS.
+        
+        Args:
+            destination (str): Location to travel to
+        """
+        engine = self.world.engine
+        if self.destination is not None:
+            engine._emit('busy', target=self.destination)
+        elif destination not in self.world.locations[self.world.current_location]:
+            engine._emit('invalid_destination', target=destination)
+        else:
+            self.destination = destination
+            engine._emit('depart', target=destination, value=TRAVEL_SECONDS)
+            self._arrival = self.scheduler.schedule(TRAVEL_SECONDS, self.arrive, destination)
+    
+    def arrive(self, destination):
+        """Finish a journey and fight whatever is waiting there."""
+        self.destination = self._arrival = None
+        world = self.world
+        engine = world.engine
+        enemy = engine.travel(world, destination)
+        if enemy is None:
+            return
+        outcome = engine.battle(world.player, enemy, self.policy)
+        if outcome == VICTORY:
+            self.scheduler.schedule(RESPAWN_SECONDS, self.respawn, enemy)
+        elif outcome == DEFEAT:
+            self.stop()
+    
+    def respawn(self, enemy):
+        """Bring a defeated enemy back at full health."""
+        enemy.heal(enemy.max_health)
+        self.world.engine._emit('respawn', target=enemy)
+    
+    def stop(self):
+        """End the game loop."""
+        if self.stopped is not None:
+            self.stopped.set()
+    
+    def command(self, line):
+        """
+        Handle one line typed by the player.
+        
+        Args:
+            line (str): Command such as "go forest", "stats" or "quit"
+        """
+        verb, _, argument = line.strip().partition(' ')
+        verb = verb.lower()
+        player = self.world.player
+        if verb in ('go', 'travel'):
+            self.travel(argument.strip().title())
+        elif verb == 'look':
+            self.output(f"🌍 You are in {self.world.current_location}. Paths: "
+                        + ", ".join(self.world.locations[self.world.current_location]))
+        elif verb == 'stats':
+            self.output(f"🧙 {player.name}: Level {player.level}, "
+                        f"Health {player.health}/{player.max_health}, "
+                        f"Strength {player.strength}, Experience {player.experience}")
+        elif verb == 'inventory':
+            self.output(f"🎒 {player.inventory if player.inventory else 'Empty'}")
+        elif verb == 'quit':
+            self.output("Thanks for playing!")
+            self.stop()
+        elif verb:
+            self.output("Commands: go <place>, look, stats, inventory, quit")
+    
+    async def run(self, lines=None):
+        """
+        Play until the player quits, dies or input ends.
+        
+        Args:
+            lines (asyncio.Queue): Input lines, with None marking the end
+                (default: read from standard input)
+        """
+        self.start()
+        if lines is None:
+            lines = read_lines_async()
+        events = asyncio.ensure_future(self.scheduler.run(self.stopped))
+        try:
+            while not self.stopped.is_set():
+                reader = asyncio.ensure_future(lines.get())
+                done, _ = await asyncio.wait([reader, events],
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if reader not in done:
+                    reader.cancel()
+                    break
+                line = reader.result()
+                if line is None:
                     break
+                self.command(line)
+        finally:
+            self.close()
+            await events
+
+def read_lines_async():
+    """
+    Feed standard input lines into an asyncio queue.
+    
+    A daemon thread does the blocking reads, so the event loop never waits
+    on the terminal and exiting does not wait for a pending read.
+    
+    Returns:
+        asyncio.Queue: Lines without their newline, then None at end of input
+    """
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+    
+    def read():
+        for line in sys.stdin:
+            loop.call_soon_threadsafe(lines.put_nowait, line.rstrip('\n'))
+        loop.call_soon_threadsafe(lines.put_nowait, None)
+    
+    threading.Thread(target=read, daemon=True).start()
+    return lines
+
+def describe_realtime_event(event):
+    """
+    Describe a real-time mode event as text.
+    
+    Args:
+        event (GameEvent): Event reported by the engine
+    
+    Returns:
+        str: Description, or None for events that are not shown
+    """
+    kind = event.kind
+    if kind == 'depart':
+        return f"🚶 Traveling to {event.target} ({event.value:g}s)..."
+    elif kind == 'travel':
+        return f"📍 Arrived at {event.target}"
+    elif kind == 'busy':
+        return f"⏳ Already traveling to {event.target}"
+    elif kind == 'regenerate':
+        return f"💚 Health regenerated to {event.value}"
+    elif kind == 'respawn':
+        return f"👹 {event.target.name} has returned"
+    return describe_event(event)
+
+def print_realtime_event(event):
+    """
+    Describe a real-time mode event on the terminal.
+    
+    Travel already takes simulated time here, so unlike print_event this
+    never sleeps.
+    
+    Args:
+        event (GameEvent): Event reported by the engine
+    """
+    text = describe_realtime_event(event)
+    if text is not None:
+        print(text)
+
+def _is_shared_code(obj):
+    """Whether an object is code or an event loop, which sessions share."""
+    return callable(obj) or isinstance(obj, (type(sys), asyncio.AbstractEventLoop))
+
+def _referents(obj):
+    """Objects directly referenced by containers and plain instances."""
+    if _is_shared_code(obj):
+        return ()
+    if isinstance(obj, dict):
+        return itertools.chain(obj.keys(), obj.values())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return obj
+    referents = list(getattr(obj, '__dict__', {}).values())
+    for cls in type(obj).__mro__:
+        for slot in cls.__dict__.get('__slots__', ()):
+            if hasattr(obj, slot):
+                referents.append(getattr(obj, slot))
+    return referents
+
+def deep_sizeof(root, exclude=()):
+    """
+    Approximate the memory held by an object and everything it references.
+    
+    Follows containers, instance dictionaries and slots. Functions, classes,
+    modules and event loops are not counted, nor is anything whose id is in
+    exclude.
+    
+    Args:
+        root: Object to measure
+        exclude (set): Ids of shared objects to leave out
+    
+    Returns:
+        int: Total size in bytes, as reported by sys.getsizeof
+    """
+    seen = set(exclude)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if _is_shared_code(obj):
+            continue
+        total += sys.getsizeof(obj)
+        stack.extend(_referents(obj))
+    return total
+
+def _reachable_ids(*roots):
+    """Ids of every object deep_sizeof would visit from the roots."""
+    seen = set()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            stack.extend(_referents(obj))
+    return seen
+
+class GameServer:
+    """
+    Hosts many real-time game sessions over a stream socket.
+    
+    The protocol is line based: a client sends its player's name, then one
+    RealTimeGame command per line. The output of each command is followed
+    by an END_OF_RESPONSE line. Events that happen later, such as arriving
+    somewhere or regenerating, are sent when they happen, in between.
+    
+    All sessions share one event scheduler, random generator and battle
+    policy, as well as the default map and enemy templates, so a session
+    only costs its player, enemies and game state.
+    """
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int): Seed for the shared random generator
+        """
+        self.rng = random.Random(seed)
+        self.policy = RunBelowHealthPolicy(rng=self.rng)
+        self.scheduler = EventScheduler()
+        self.sessions = set()
+        self.shared_ids = _reachable_ids(self, DEFAULT_MAP, ENEMY_TEMPLATES)
+    
+    def session_memory(self, game):
+        """
+        Bytes used by one session, not counting shared data.
+        
+        Args:
+            game (RealTimeGame): Session to measure
+        
+        Returns:
+            int: Approximate size of the session
+        """
+        return deep_sizeof(game, self.shared_ids)
+    
+    async def handle(self, reader, writer):
+        """Run one client session until it quits, dies or disconnects."""
+        def output(text):
+            if not writer.is_closing():
+                writer.write(text.encode('utf-8') + b'\n')
+        
+        def on_event(event):
+            text = describe_realtime_event(event)
+            if text is not None:
+                output(text)
+        
+        name = (await reader.readline()).decode('utf-8', 'replace').strip()
+        if not name:
+            writer.close()
+            return
+        world = GameWorld(Player(name), GameEngine(self.rng, on_event))
+        game = RealTimeGame(world, self.policy, self.scheduler, output)
+        game.start()
+        self.sessions.add(game)
+        try:
+            output(f"Welcome, {name}! You are in {world.current_location}.")
+            output(END_OF_RESPONSE)
+            while not game.stopped.is_set():
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('utf-8', 'replace').strip()
+                if line == 'memory':
+                    output(f"📦 Session memory: {self.session_memory(game)} bytes "
+                           f"({len(self.sessions)} sessions)")
                 else:
-                    print("❌ Failed to escape!")
-                    enemy_damage = random.randint(1, enemy.strength)
-                    self.player.take_damage(enemy_damage)
-                    print(f"{enemy.name} deals {enemy_damage} damage to you")
-            
-            # Check battle outcome
-            if not enemy.is_alive():
-                print(f"🏆 You defeated {enemy.name}!")
-                loot = random.choice(enemy.loot)
-                self.player.add_to_inventory(loot)
-                self.player.gain_experience(random.randint(10, 50))
-                print(f"🎁 Found: {loot}")
-            
-            if not self.player.is_alive():
-                print("☠️ Game Over! You were defeated.")
-                exit()
+                    game.command(line)
+                output(END_OF_RESPONSE)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(game)
+            game.close()
+            writer.close()
+    
+    async def serve(self, address):
+        """
+        Accept clients until cancelled.
+        
+        Args:
+            address (str): "HOST:PORT" for TCP, or "unix:PATH" for a Unix
+                domain socket
+        """
+        if address.startswith('unix:'):
+            server = await asyncio.start_unix_server(self.handle, address[len('unix:'):],
+                                                     backlog=SERVER_BACKLOG)
+        else:
+            host, _, port = address.rpartition(':')
+            server = await asyncio.start_server(self.handle, host or None, int(port),
+                                                backlog=SERVER_BACKLOG)
+        stopped = asyncio.Event()
+        events = asyncio.ensure_future(self.scheduler.run(stopped))
+        print(f"🏰 Serving Dungeon Explorer on {address}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            stopped.set()
+            await events
+
+# Metrics of one headless playthrough. death_location is None when the
+# player survived all steps
+PlaythroughResult = namedtuple('PlaythroughResult', [
+    'level', 'experience', 'victories', 'loot', 'death_location', 'steps'
+])
+
+def simulation_rng(seed, run):
+    """
+    Random source for one simulated playthrough.
+    
+    String seeds are hashed with SHA-512, so every (seed, run) pair gets an
+    independent stream that does not depend on which worker plays it.
+    
+    Args:
+        seed (int): Seed of the whole simulation
+        run (int): Index of the playthrough
+    
+    Returns:
+        random.Random: Generator for the playthrough
+    """
+    return random.Random(f"{seed}/{run}")
 
-def main():
+def run_playthrough(rng, policy='attack', run_below=0.3, max_steps=200, map_size=None):
+    """
+    Play one game headlessly until the player dies or max_steps explorations.
+    
+    Args:
+        rng (random.Random): Random source for the world, engine and policy
+        policy (str): 'attack' to always attack, or 'cautious' to run below
+            run_below of maximum health
+        run_below (float): Health fraction used by the cautious policy
+        max_steps (int): Maximum number of explorations
+        map_size (int): Play on a generated map of this size instead of the
+            built-in world
+    
+    Returns:
+        PlaythroughResult: Metrics of the playthrough
+    """
+    if policy == 'attack':
+        decisions = AlwaysAttackPolicy(rng)
+    elif policy == 'cautious':
+        decisions = RunBelowHealthPolicy(run_below, rng)
+    else:
+        raise ValueError(f"Unknown simulation policy: {policy!r}")
+    
+    player = Player("Hero")
+    engine = GameEngine(rng)
+    if map_size:
+        world = GameWorld.generate(player, map_size, rng.random(), engine=engine)
+    else:
+        world = GameWorld(player, engine)
+    
+    victories = steps = 0
+    death_location = None
+    while steps < max_steps:
+        steps += 1
+        outcome = engine.explore(world, decisions)
+        if outcome == VICTORY:
+            victories += 1
+        elif outcome == DEFEAT:
+            death_location = world.current_location
+            break
+    return PlaythroughResult(player.level, player.experience, victories,
+                             tuple(player.inventory), death_location, steps)
+
+class SimulationReport:
+    """Aggregated metrics of many playthroughs."""
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int): Seed the playthroughs were run with
+        """
+        self.seed = seed
+        self.runs = 0
+        self.victories = 0
+        self.steps = 0
+        self.experience = 0
+        self.levels = Counter()
+        self.loot = Counter()
+        self.deaths = Counter()
+    
+    def add(self, result):
+        """
+        Count a single playthrough.
+        
+        Args:
+            result (PlaythroughResult): Playthrough to include in the report
+        """
+        self.runs += 1
+        self.victories += result.victories
+        self.steps += result.steps
+        self.experience += result.experience
+        self.levels[result.level] += 1
+        self.loot.update(result.loot)
+        if result.death_location is not None:
+            self.deaths[result.death_location] += 1
+    
+    def merge(self, other):
+        """
+        Add the counts from another report.
+        
+        Args:
+            other (SimulationReport): Report to fold into this one
+        """
+        self.runs += other.runs
+        self.victories += other.victories
+        self.steps += other.steps
+        self.experience += other.experience
+        self.levels.update(other.levels)
+        self.loot.update(other.loot)
+        self.deaths.update(other.deaths)
+    
+    def as_dict(self):
+        """
+        Convert the report into plain, JSON-serializable data.
+        
+        Returns:
+            dict: Totals plus level, loot and death location histograms
+        """
+        return {
+            'seed': self.seed,
+            'runs': self.runs,
+            'victories': self.victories,
+            'steps': self.steps,
+            'experience': self.experience,
+            'levels': dict(sorted(self.levels.items())),
+            'loot': dict(sorted(self.loot.items())),
+            'deaths': dict(sorted(self.deaths.items()))
+        }
+
+def _simulate_runs(task):
+    """Worker entry point: play a range of runs and summarize them."""
+    seed, start, count, options = task
+    report = SimulationReport(seed)
+    for run in range(start, start + count):
+        report.add(run_playthrough(simulation_rng(seed, run), **options))
+    return report
+
+def simulate_playthroughs(runs, seed=None, workers=None,
+                          chunk_size=SIMULATION_CHUNK_SIZE, **options):
+    """
+    Play many headless games on several processes and aggregate the results.
+    
+    Runs are handed to workers in chunks, and each run draws from its own
+    seeded stream, so the report is identical for any number of workers.
+    
+    Args:
+        runs (int): Number of playthroughs
+        seed (int): Seed for the whole simulation (default: a random one,
+            recorded in the report)
+        workers (int): Number of worker processes (default: CPU count)
+        chunk_size (int): Playthroughs per worker task
+        **options: Passed to run_playthrough
+    
+    Returns:
+        SimulationReport: Aggregated metrics of all playthroughs
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed, start, min(chunk_size, runs - start), options)
+             for start in range(0, runs, chunk_size)]
+    
+    report = SimulationReport(seed)
+    if workers == 1:
+        for task in tasks:
+            report.merge(_simulate_runs(task))
+        return report
+    
+    with multiprocessing.Pool(workers) as pool:
+        for chunk_report in pool.imap_unordered(_simulate_runs, tasks):
+            report.merge(chunk_report)
+    return report
+
+class SaveWriter:
+    """Builds a save file out of length-prefixed sections."""
+    def __init__(self):
+        self.parts = []
+    
+    def section(self, tag, payload):
+        """Append a section, padded so the next one starts 8-byte aligned."""
+        payload = bytes(payload)
+        padding = -len(payload) % 8
+        self.parts.append(SAVE_SECTION.pack(tag, len(payload) + padding))
+        self.parts.append(payload + bytes(padding))
+    
+    def getvalue(self):
+        return b''.join(self.parts)
+
+def _pack_string(string):
+    data = string.encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+def _pack_strings(strings):
+    return struct.pack('<I', len(strings)) + b''.join(map(_pack_string, strings))
+
+def _pack_ids(ids):
+    return struct.pack('<I', len(ids)) + array.array('I', ids).tobytes()
+
+class SaveReader:
+    """Reads values from one save file section."""
+    def __init__(self, buffer, offset=0):
+        self.buffer = buffer
+        self.offset = offset
+    
+    def unpack(self, layout):
+        values = struct.unpack_from(layout, self.buffer, self.offset)
+        self.offset += struct.calcsize(layout)
+        return values
+    
+    def string(self):
+        length, = self.unpack('<I')
+        self.offset += length
+        return bytes(self.buffer[self.offset - length:self.offset]).decode('utf-8')
+    
+    def strings(self):
+        count, = self.unpack('<I')
+        return [self.string() for _ in range(count)]
+    
+    def array(self, typecode, count, zero_copy=False):
+        """
+        Read count fixed-width integers.
+        
+        With zero_copy the result is a memoryview straight over the
+        (memory-mapped) buffer instead of a copy.
+        """
+        size = count * 4
+        view = memoryview(self.buffer)[self.offset:self.offset + size]
+        self.offset += size
+        if zero_copy:
+            return view.cast(typecode)
+        values = array.array(typecode)
+        values.frombytes(view)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+    
+    def ids(self):
+        count, = self.unpack('<I')
+        return self.array('I', count)
+
+def _world_tables(world):
+    """
+    Get the CSR map, entity store and enemy placement of a world.
+    
+    Worlds still using the built-in dictionaries are switched over to a
+    DungeonMap and EntityStore, so later autosaves can be incremental.
+    
+    Returns:
+        tuple: (DungeonMap, EntityStore, entity id per location)
+    """
+    if isinstance(world.enemies, LocationEnemies):
+        return world.enemies.map, world.enemies.store, world.enemies.entity_ids
+    
+    dungeon_map = world.locations
+    if not isinstance(dungeon_map, DungeonMap):
+        dungeon_map = DungeonMap.from_adjacency(dungeon_map)
+    store = EntityStore()
+    entity_ids = array.array('i', [-1]) * len(dungeon_map)
+    for location, enemy in world.enemies.items():
+        entity_id = store.add_enemy(enemy)
+        store.health[entity_id] = enemy.health
+        view = store.view(entity_id)
+        for item in enemy.inventory:
+            view.add_to_inventory(item)
+        entity_ids[dungeon_map.location_id(location)] = entity_id
+    world.locations = dungeon_map
+    world.enemies = LocationEnemies(dungeon_map, store, entity_ids)
+    return dungeon_map, store, entity_ids
+
+def _pack_player(world):
+    player = world.player
+    return (struct.pack('<5i', player.health, player.max_health, player.strength,
+                        player.experience, player.level)
+            + _pack_string(player.name) + _pack_string(world.current_location)
+            + _pack_strings(player.inventory))
+
+def _pack_entity_changes(store, entity_ids):
+    payload = [struct.pack('<I', len(entity_ids))]
+    for entity_id in entity_ids:
+        payload.append(struct.pack('<Ii', entity_id, store.health[entity_id]))
+        payload.append(_pack_ids(store.inventories.get(entity_id, ())))
+    return b''.join(payload)
+
+def save_game(world, path):
+    """
+    Write a complete save of a world and its player.
+    
+    The file is written to a temporary name and then renamed, so an
+    interrupted save never leaves a truncated file behind.
+    
+    Args:
+        world (GameWorld): World to save
+        path (str): Save file path
+    """
+    dungeon_map, store, entity_ids = _world_tables(world)
+    writer = SaveWriter()
+    writer.parts.append(SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION))
+    writer.section(b'PLYR', _pack_player(world))
+    location_names = dungeon_map.names.strings if dungeon_map.names is not None else []
+    writer.section(b'LOCN', _pack_strings(location_names))
+    writer.section(b'MAP ', struct.pack('<II', len(dungeon_map), len(dungeon_map.targets))
+                   + bytes(dungeon_map.offsets) + bytes(dungeon_map.targets))
+    writer.section(b'ITEM', _pack_strings(store.items.strings))
+    writer.section(b'NAME', _pack_strings(store.names.strings))
+    writer.section(b'LOOT', struct.pack('<I', len(store.loot_tables))
+                   + b''.join(_pack_ids(table) for table in store.loot_tables.strings))
+    writer.section(b'ENTS', struct.pack('<I', len(store)) + b''.join(
+        bytes(column) for column in (store.health, store.max_health, store.strength,
+                                     store.name_ids, store.loot_ids)))
+    writer.section(b'INVS', _pack_entity_changes(store, sorted(store.inventories)))
+    writer.section(b'ELOC', struct.pack('<I', len(entity_ids)) + bytes(entity_ids))
+    
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(writer.getvalue())
+    os.replace(temporary_path, path)
+    store.dirty.clear()
+    store.saved_item_count = len(store.items)
+
+def autosave_game(world, path):
+    """
+    Append the changes made since the last save to a save file.
+    
+    Only the player and the entities modified since then are written. Falls
+    back to a full save when there is no save file yet or the world does not
+    track changes.
+    
+    Args:
+        world (GameWorld): World to save
+        path (str): Save file path
+    """
+    if not os.path.exists(path) or not isinstance(world.enemies, LocationEnemies):
+        save_game(world, path)
+        return
+    
+    store = world.enemies.store
+    writer = SaveWriter()
+    writer.section(b'DLTA', _pack_player(world)
+                   + _pack_strings(store.items.strings[store.saved_item_count:])
+                   + _pack_entity_changes(store, sorted(store.dirty)))
+    with open(path, 'ab') as file:
+        file.write(writer.getvalue())
+    store.dirty.clear()
+    store.saved_item_count = len(store.items)
+
+def _read_player(reader):
+    health, max_health, strength, experience, level = reader.unpack('<5i')
+    player = Player(reader.string())
+    player.health, player.max_health, player.strength = health, max_health, strength
+    player.experience, player.level = experience, level
+    current_location = reader.string()
+    player.inventory = reader.strings()
+    return player, current_location
+
+def _apply_entity_changes(reader, store):
+    count, = reader.unpack('<I')
+    for _ in range(count):
+        entity_id, health = reader.unpack('<Ii')
+        store.health[entity_id] = health
+        inventory = reader.ids()
+        if inventory:
+            store.inventories[entity_id] = inventory
+        else:
+            store.inventories.pop(entity_id, None)
+
+def load_game(path, engine=None, use_mmap=True):
+    """
+    Load a world saved with save_game and autosave_game.
+    
+    With use_mmap, the map and entity columns are memoryviews over a
+    copy-on-write memory map of the file. Nothing is copied at load time,
+    pages are read in as they are used, and changes stay in memory until
+    the next save. Stores loaded this way cannot grow.
+    
+    Args:
+        path (str): Save file path
+        engine (GameEngine): Rules engine for the loaded world
+        use_mmap (bool): Map the file instead of reading it
+    
+    Returns:
+        GameWorld: The saved world
+    """
+    with open(path, 'rb') as file:
+        if use_mmap and sys.byteorder == 'little':
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            buffer, use_mmap = file.read(), False
+    
+    magic, version = SAVE_HEADER.unpack_from(buffer)
+    if magic != SAVE_MAGIC:
+        raise ValueError(f"{path} is not a Dungeon Explorer save file")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save file version {version} "
+                         f"(expected {SAVE_VERSION})")
+    
+    store = EntityStore()
+    tags = set()
+    offset = SAVE_HEADER.size
+    while offset < len(buffer):
+        tag, length = SAVE_SECTION.unpack_from(buffer, offset)
+        reader = SaveReader(buffer, offset + SAVE_SECTION.size)
+        offset = reader.offset + length
+        tags.add(tag)
+        
+        if tag == b'PLYR':
+            player, current_location = _read_player(reader)
+        elif tag == b'LOCN':
+            location_names = reader.strings()
+        elif tag == b'MAP ':
+            location_count, target_count = reader.unpack('<II')
+            offsets = reader.array('I', location_count + 1, use_mmap)
+            targets = reader.array('I', target_count, use_mmap)
+        elif tag == b'ITEM':
+            store.items = StringTable(reader.strings())
+        elif tag == b'NAME':
+            store.names = StringTable(reader.strings())
+        elif tag == b'LOOT':
+            count, = reader.unpack('<I')
+            store.loot_tables = StringTable(tuple(reader.ids()) for _ in range(count))
+        elif tag == b'ENTS':
+            count, = reader.unpack('<I')
+            store.health = reader.array('i', count, use_mmap)
+            store.max_health = reader.array('i', count, use_mmap)
+            store.strength = reader.array('i', count, use_mmap)
+            store.name_ids = reader.array('I', count, use_mmap)
+            store.loot_ids = reader.array('I', count, use_mmap)
+        elif tag == b'INVS':
+            _apply_entity_changes(reader, store)
+        elif tag == b'ELOC':
+            count, = reader.unpack('<I')
+            entity_ids = reader.array('i', count, use_mmap)
+        elif tag == b'DLTA':
+            player, current_location = _read_player(reader)
+            for item in reader.strings():
+                store.items.intern(item)
+            _apply_entity_changes(reader, store)
+    
+    missing = [tag.decode('ascii').strip() for tag in SAVE_REQUIRED_SECTIONS if tag not in tags]
+    if missing:
+        raise ValueError(f"Corrupt save: missing {', '.join(missing)} in {path}")
+    
+    dungeon_map = DungeonMap(offsets, targets,
+                             StringTable(location_names) if location_names else None)
+    world = GameWorld(player, engine)
+    world.locations = dungeon_map
+    world.enemies = LocationEnemies(dungeon_map, store, entity_ids)
+    world.current_location = current_location
+    store.saved_item_count = len(store.items)
+    return world
+
+def print_battle_estimates(estimates, level):
+    """
+    Print Monte Carlo battle estimates as a table.
+    
+    Args:
+        estimates (list): BattleEstimate values
+        level (int): Player level they were estimated for
+    """
+    print(f"\n📊 Level {level} player vs each enemy")
+    for estimate in estimates:
+        low, high = estimate.win_rate_ci
+        print(f"{estimate.enemy:<18} win {estimate.win_rate:6.1%} ({low:.1%}-{high:.1%})  "
+              f"turns {estimate.expected_turns:5.2f}  "
+              f"HP lost {estimate.expected_hp_lost:6.2f}")
+
+def print_simulation_report(report):
+    """
+    Print aggregated playthrough metrics.
+    
+    Args:
+        report (SimulationReport): Simulation results
+    """
+    runs = max(report.runs, 1)
+    died = sum(report.deaths.values())
+    print(f"\n📊 {report.runs} playthroughs (seed {report.seed})")
+    print(f"Deaths: {died} ({died / runs:.1%})")
+    print(f"Average victories: {report.victories / runs:.2f}, "
+          f"steps: {report.steps / runs:.2f}, experience: {report.experience / runs:.1f}")
+    print("Levels reached:")
+    for level, count in sorted(report.levels.items()):
+        print(f"  {level:>3}: {count:>8} ({count / runs:.1%})")
+    print("Loot collected:")
+    for item, count in report.loot.most_common():
+        print(f"  {item:<20} {count:>8}")
+    print("Death locations:")
+    for location, count in report.deaths.most_common(10):
+        print(f"  {location:<20} {count:>8}")
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Dungeon Explorer Adventure game.")
+    parser.add_argument('--estimate', type=int, metavar='LEVEL',
+                        help="estimate battle outcomes for a player of LEVEL and exit")
+    parser.add_argument('--battles', type=int, default=100_000,
+                        help="battles per enemy for --estimate (default: 100000)")
+    parser.add_argument('--seed', type=int, help="random seed for simulations and maps")
+    parser.add_argument('--map-size', type=int, metavar='N',
+                        help="play on a generated map with N locations")
+    parser.add_argument('--simulate', type=int, metavar='RUNS',
+                        help="play RUNS headless games and print aggregate stats")
+    parser.add_argument('--policy', choices=SIMULATION_POLICIES, default='attack',
+                        help="decision policy for --simulate (default: attack)")
+    parser.add_argument('--run-below', type=float, default=0.3, metavar='FRACTION',
+                        help="health fraction the cautious policy runs below (default: 0.3)")
+    parser.add_argument('--max-steps', type=int, default=200,
+                        help="explorations per simulated game (default: 200)")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes for --simulate (default: CPU count)")
+    parser.add_argument('--realtime', action='store_true',
+                        help="play in real time: travel takes time, health regenerates "
+                             "and enemies respawn")
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help="host multiplayer sessions on HOST:PORT or unix:PATH")
+    parser.add_argument('--save', metavar='FILE',
+                        help="resume from FILE if it exists and autosave to it")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main game loop."""
+    args = parse_args(argv)
+    if args.estimate is not None:
+        enemies = [Enemy(name, health, strength, loot)
+                   for _, name, health, strength, loot in ENEMY_TEMPLATES]
+        estimates = estimate_battle_outcomes(args.estimate, enemies, args.battles, args.seed)
+        print_battle_estimates(estimates, args.estimate)
+        return
+    if args.simulate is not None:
+        report = simulate_playthroughs(args.simulate, args.seed, args.workers,
+                                       policy=args.policy, run_below=args.run_below,
+                                       max_steps=args.max_steps, map_size=args.map_size)
+        print_simulation_report(report)
+        return
+    if args.serve:
+        try:
+            asyncio.run(GameServer(args.seed).serve(args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
+    
     print("🏰 Welcome to Dungeon Explorer!")
-    player_name = input("Enter your character's name: ")
-    player = Player(player_name)
-    world = GameWorld(player)
+    engine = GameEngine(on_event=print_realtime_event) if args.realtime else None
+    if args.save and os.path.exists(args.save):
+        world = load_game(args.save, engine)
+        player = world.player
+        print(f"Welcome back, {player.name}!")
+    else:
+        player_name = input("Enter your character's name: ")
+        player = Player(player_name)
+        if args.map_size:
+            world = GameWorld.generate(player, args.map_size, args.seed, engine=engine)
+        else:
+            world = GameWorld(player, engine)
+    
+    if args.realtime:
+        print("Commands: go <place>, look, stats, inventory, quit")
+        asyncio.run(RealTimeGame(world).run())
+        if args.save and player.is_alive():
+            save_game(world, args.save)
+        return
     
     while True:
         print("\n--- Game Menu ---")
@@ -212,11 +2242,15 @@ def main():
         print("2. View Character Stats")
         print("3. View Inventory")
         print("4. Quit")
+        print("5. Travel To Location")
         
         choice = input("Choose an option: ")
         
         if choice == '1':
-            world.explore()
+            if world.explore() == DEFEAT:
+                break
+            if args.save:
+                autosave_game(world, args.save)
         elif choice == '2':
             print(f"\n🧙 {player.name}'s Stats:")
             print(f"Level: {player.level}")
@@ -227,8 +2261,17 @@ def main():
             print("\n🎒 Inventory:")
             print(player.inventory if player.inventory else "Empty")
         elif choice == '4':
+            if args.save:
+                save_game(world, args.save)
+                print(f"Game saved to {args.save}")
             print("Thanks for playing!")
             break
+        elif choice == '5':
+            destination = input("Where would you like to travel? ").capitalize()
+            if world.travel_to(destination) == DEFEAT:
+                break
+            if args.save:
+                autosave_game(world, args.save)
 
 if __name__ == "__main__":
     main()
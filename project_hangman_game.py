@@ -2,10 +2,792 @@
 # 20/11/2024
 # Improved Hangman game
 
+import argparse
+import bisect
+import getpass
+import io
+import mmap
+import math
+import multiprocessing
 import random
 import os
+import sqlite3
+import string
+import struct
+import sys
+import threading
 import time
 import json
+from collections import Counter, namedtuple
+
+# Score database, the JSON file it replaces, and how many scores
+# ScoreStore.record buffers before writing them in one transaction
+SCORE_DATABASE = 'hangman_scores.db'
+LEGACY_SCORE_FILE = 'hangman_scores.json'
+SCORE_BATCH_SIZE = 64
+
+# Guessing strategies for headless games, and games per self-play task
+# handed to a worker process
+HANGMAN_STRATEGIES = ("frequency", "random", "solver")
+SELF_PLAY_CHUNK_SIZE = 2000
+
+# Seconds between the computer's guesses, so they can be followed
+AI_TURN_DELAY = 1.0
+
+# Outcome of one headless game
+GameResult = namedtuple('GameResult', ['won', 'wrong_guesses', 'guesses'])
+
+# Word difficulty levels stored in a WordStore, in index order
+WORD_DIFFICULTIES = ("easy", "medium", "hard")
+
+# Letters that guessers usually try last
+RARE_LETTERS = frozenset("jkqvxz")
+
+# English letters from most to least common, for guessing without a solver
+LETTER_FREQUENCY_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+# Longest word a WordStore keeps
+MAX_WORD_LENGTH = 255
+
+# A solver re-indexes its remaining candidates once they are fewer than
+# 1 / SOLVER_COMPACT_RATIO of its words. Above SOLVER_EXACT_LIMIT remaining
+# words, information gain is estimated on a fixed random sample of
+# SOLVER_EXACT_LIMIT words instead
+SOLVER_COMPACT_RATIO = 8
+SOLVER_EXACT_LIMIT = 20_000
+
+# bytes.translate tables turning a column of letters into b'1' where the
+# column holds the letter and b'0' elsewhere
+LETTER_BIT_TABLES = {
+    letter: bytes(0x31 if byte == ord(letter) else 0x30 for byte in range(256))
+    for letter in string.ascii_lowercase
+}
+
+def word_difficulty(word):
+    """
+    Rate how hard a word is to guess.
+    
+    Few distinct letters mean few correct guesses, and rare letters are
+    found late, so both make a word harder.
+    
+    Args:
+        word (str): Lowercase word
+    
+    Returns:
+        str: One of WORD_DIFFICULTIES
+    """
+    letters = set(word)
+    rare_count = len(letters & RARE_LETTERS)
+    if len(letters) <= 4 or rare_count >= 2:
+        return "hard"
+    if len(letters) >= 7 and not rare_count:
+        return "easy"
+    return "medium"
+
+def iter_word_file(path):
+    """
+    Stream the words of a newline-delimited word list.
+    
+    Args:
+        path (str): File with one word per line
+    
+    Yields:
+        str: Each non-empty line, stripped
+    """
+    with open(path, encoding='utf-8', errors='replace') as file:
+        for line in file:
+            word = line.strip()
+            if word:
+                yield word
+
+class WordStore:
+    """
+    Memory-mapped word index for large Hangman dictionaries.
+    
+    Words are grouped into buckets by category, difficulty and length. The
+    words of a bucket all have the same length and are stored back to back,
+    so the i-th word is at offset + i * length and no per-word offsets are
+    needed. Opening an index only reads the header and the bucket table,
+    whose size depends on the number of categories and word lengths rather
+    than the number of words, and picking a word reads just that word.
+    
+    File layout: an 8-byte magic string, the category and bucket counts
+    (uint32 each), the category names (uint16 length + UTF-8 each), the
+    bucket table and then the words as ASCII.
+    """
+    MAGIC = b'HMWORDS1'
+    HEADER = struct.Struct('<8sII')
+    # Category id, difficulty id, word length, word count, data offset
+    BUCKET = struct.Struct('<HBxHIQ')
+
+    def __init__(self, path):
+        """
+        Open an existing word index.
+        
+        Args:
+            path (str): Index file created by WordStore.build
+        """
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load(buffer)
+        except ValueError:
+            buffer.close()
+            raise ValueError(f"{path} is not a Hangman word index") from None
+
+    def _load(self, buffer):
+        """Read the category names and bucket table of an index."""
+        magic, category_count, bucket_count = self.HEADER.unpack_from(buffer)
+        if magic != self.MAGIC:
+            raise ValueError("not a Hangman word index")
+        self._buffer = buffer
+        self.categories = []
+        offset = self.HEADER.size
+        for _ in range(category_count):
+            length, = struct.unpack_from('<H', buffer, offset)
+            offset += 2
+            self.categories.append(bytes(buffer[offset:offset + length]).decode('utf-8'))
+            offset += length
+        self.buckets = [self.BUCKET.unpack_from(buffer, offset + index * self.BUCKET.size)
+                        for index in range(bucket_count)]
+        self._selections = {}
+        self._solvers = {}
+
+    @classmethod
+    def write(cls, categories, file):
+        """
+        Write a word index to a binary file.
+        
+        Words are lowercased. Words that are not plain ASCII letters, or are
+        longer than MAX_WORD_LENGTH, are skipped. Words are held as compact
+        byte strings per bucket while building, not as Python strings.
+        
+        Args:
+            categories (dict): Category name to an iterable of words
+            file: Binary file object to write to
+        
+        Returns:
+            int: Number of words written
+        """
+        names = list(categories)
+        buckets = {}
+        for category_id, name in enumerate(names):
+            for word in categories[name]:
+                word = word.strip().lower()
+                if not (word.isascii() and word.isalpha()) or len(word) > MAX_WORD_LENGTH:
+                    continue
+                key = (category_id, WORD_DIFFICULTIES.index(word_difficulty(word)), len(word))
+                data = buckets.get(key)
+                if data is None:
+                    data = buckets[key] = bytearray()
+                data += word.encode('ascii')
+        
+        encoded_names = [name.encode('utf-8') for name in names]
+        offset = (cls.HEADER.size + sum(2 + len(name) for name in encoded_names)
+                  + len(buckets) * cls.BUCKET.size)
+        file.write(cls.HEADER.pack(cls.MAGIC, len(names), len(buckets)))
+        for name in encoded_names:
+            file.write(struct.pack('<H', len(name)) + name)
+        for (category_id, difficulty_id, length), data in sorted(buckets.items()):
+            file.write(cls.BUCKET.pack(category_id, difficulty_id, length,
+                                       len(data) // length, offset))
+            offset += len(data)
+        for _, data in sorted(buckets.items()):
+            file.write(data)
+        return sum(len(data) // length for (_, _, length), data in buckets.items())
+
+    @classmethod
+    def build(cls, categories, path):
+        """
+        Build an index file and open it.
+        
+        Args:
+            categories (dict): Category name to an iterable of words
+            path (str): Where to write the index
+        
+        Returns:
+            WordStore: The new index, memory-mapped
+        """
+        with open(path, 'wb') as file:
+            cls.write(categories, file)
+        return cls(path)
+
+    @classmethod
+    def build_from_directory(cls, directory, path):
+        """
+        Build an index from a directory of word lists.
+        
+        Every .txt file is one category, named after the file, with one word
+        per line. Files are streamed, never read whole.
+        
+        Args:
+            directory (str): Directory of word lists
+            path (str): Where to write the index
+        
+        Returns:
+            WordStore: The new index, memory-mapped
+        """
+        categories = {
+            os.path.splitext(name)[0]: iter_word_file(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith('.txt')
+        }
+        return cls.build(categories, path)
+
+    @classmethod
+    def from_categories(cls, categories):
+        """
+        Build an in-memory store, for small built-in word lists.
+        
+        Args:
+            categories (dict): Category name to an iterable of words
+        
+        Returns:
+            WordStore: Store backed by a bytes buffer
+        """
+        file = io.BytesIO()
+        cls.write(categories, file)
+        store = cls.__new__(cls)
+        store._load(file.getvalue())
+        return store
+
+    def _selection(self, category, difficulty, length):
+        """
+        Buckets matching a filter, with running word counts for picking.
+        
+        Cached per filter, so repeated picks only cost a random number, a
+        bisection over a handful of buckets and one slice.
+        """
+        key = (category, difficulty, length)
+        selection = self._selections.get(key)
+        if selection is None:
+            category_id = self.categories.index(category)
+            difficulty_id = None if difficulty is None else WORD_DIFFICULTIES.index(difficulty)
+            matching = [bucket for bucket in self.buckets
+                        if bucket[0] == category_id
+                        and difficulty_id in (None, bucket[1])
+                        and length in (None, bucket[2])]
+            totals = []
+            total = 0
+            for bucket in matching:
+                total += bucket[3]
+                totals.append(total)
+            selection = self._selections[key] = (matching, totals)
+        return selection
+
+    def count(self, category, difficulty=None, length=None):
+        """
+        Count the words matching a filter.
+        
+        Args:
+            category (str): Category name
+            difficulty (str): One of WORD_DIFFICULTIES, or None for any
+            length (int): Word length, or None for any
+        
+        Returns:
+            int: Number of matching words
+        """
+        _, totals = self._selection(category, difficulty, length)
+        return totals[-1] if totals else 0
+
+    def random_word(self, category, difficulty=None, length=None, rng=random):
+        """
+        Pick a uniformly random word without reading the others.
+        
+        Args:
+            category (str): Category name
+            difficulty (str): One of WORD_DIFFICULTIES, or None for any
+            length (int): Word length, or None for any
+            rng: Random number source with randrange
+        
+        Returns:
+            str: The word, or None if no word matches
+        
+        Raises:
+            ValueError: If the category or difficulty is unknown
+        """
+        matching, totals = self._selection(category, difficulty, length)
+        if not totals:
+            return None
+        index = rng.randrange(totals[-1])
+        position = bisect.bisect_right(totals, index)
+        _, _, word_length, count, offset = matching[position]
+        start = offset + (index - totals[position] + count) * word_length
+        return bytes(self._buffer[start:start + word_length]).decode('ascii')
+
+    def word_block(self, category, length):
+        """
+        Get all words of a category and length, of any difficulty.
+        
+        Args:
+            category (str): Category name
+            length (int): Word length
+        
+        Returns:
+            bytes: The words back to back, length bytes each
+        """
+        matching, _ = self._selection(category, None, length)
+        return b''.join(self._buffer[offset:offset + count * length]
+                        for _, _, _, count, offset in matching)
+    
+    def solver(self, category, length):
+        """
+        Get a solver over the words of a category and length.
+        
+        Solvers are built on first use and kept, since indexing a large
+        category takes much longer than answering a hint.
+        
+        Args:
+            category (str): Category name
+            length (int): Word length
+        
+        Returns:
+            HangmanSolver: Solver for words of that shape
+        """
+        key = (category, length)
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = self._solvers[key] = HangmanSolver(self.word_block(category, length),
+                                                        length)
+        return solver
+    
+    def close(self):
+        """Release the memory map, if the store has one."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class HangmanSolver:
+    """
+    Candidate filtering and letter suggestions for Hangman.
+    
+    Candidate sets are bitsets held in Python integers, bit i standing for
+    word i. For every position and letter the solver precomputes the set of
+    words with that letter there, so narrowing the candidates to a revealed
+    pattern is a few big-integer ANDs, each processing a machine word of
+    candidates at a time. Suggestions maximize the information gain: the
+    entropy of the patterns a guess could reveal over the remaining words.
+    Splitting very large candidate sets by pattern is slow, so then the
+    gain is estimated on a random sample of the dictionary that is indexed
+    up front; candidate counts are always exact.
+    """
+    def __init__(self, words, length):
+        """
+        Index a block of equal-length words.
+        
+        Args:
+            words (bytes): Lowercase ASCII words back to back
+            length (int): Length of every word
+        """
+        self.words = words
+        self.length = length
+        self.count = len(words) // length if length else 0
+        self.all = (1 << self.count) - 1
+        # positions[p][letter]: words with that letter at position p
+        self.positions = []
+        self.contains = dict.fromkeys(string.ascii_lowercase, 0)
+        for position in range(length):
+            column = words[position::length]
+            letter_bits = {}
+            for letter, table in LETTER_BIT_TABLES.items():
+                # Reversed so the first word ends up as the lowest bit
+                bits = int(column.translate(table)[::-1] or b'0', 2)
+                letter_bits[letter] = bits
+                self.contains[letter] |= bits
+            self.positions.append(letter_bits)
+        
+        self.sample = None
+        if self.count > SOLVER_EXACT_LIMIT:
+            sample = sorted(random.Random(0).sample(range(self.count), SOLVER_EXACT_LIMIT))
+            self.sample = HangmanSolver(
+                b''.join(words[index * length:(index + 1) * length] for index in sample),
+                length)
+    
+    def filter(self, pattern, guessed_letters):
+        """
+        Find the words consistent with what the player has seen.
+        
+        Revealed positions must hold their letter. Hidden positions cannot
+        hold any guessed letter, since every occurrence of a correct guess
+        is revealed and wrong guesses do not occur at all.
+        
+        Args:
+            pattern (str): Word progress, '_' for hidden letters
+            guessed_letters (set): Every letter guessed so far
+        
+        Returns:
+            int: Bitset of candidate words
+        """
+        candidates = self.all
+        for position, letter_bits in enumerate(self.positions):
+            shown = pattern[position]
+            if shown != '_':
+                candidates &= letter_bits.get(shown, 0)
+            else:
+                for letter in guessed_letters:
+                    candidates &= ~letter_bits.get(letter, 0)
+            if not candidates:
+                break
+        return candidates
+    
+    def candidate_words(self, candidates):
+        """
+        List the words of a candidate bitset.
+        
+        Args:
+            candidates (int): Bitset returned by filter
+        
+        Returns:
+            bytes: The candidate words back to back
+        """
+        flags = bin(candidates)[:1:-1]
+        length = self.length
+        words = []
+        index = flags.find('1')
+        while index >= 0:
+            words.append(self.words[index * length:(index + 1) * length])
+            index = flags.find('1', index + 1)
+        return b''.join(words)
+    
+    def _outcome_sizes(self, candidates, letter, hidden_positions):
+        """Split the candidates by the positions a guess would reveal."""
+        groups = [candidates]
+        for position in hidden_positions:
+            bits = self.positions[position][letter]
+            if not bits & candidates:
+                continue
+            split = []
+            for group in groups:
+                hit = group & bits
+                if hit and hit != group:
+                    split.append(hit)
+                    split.append(group ^ hit)
+                else:
+                    split.append(group)
+            groups = split
+        return [group.bit_count() for group in groups]
+    
+    def suggest(self, pattern, guessed_letters):
+        """
+        Suggest the letter with the highest information gain.
+        
+        Ties go to the letter most likely to be in the word.
+        
+        Args:
+            pattern (str): Word progress, '_' for hidden letters
+            guessed_letters (set): Every letter guessed so far
+        
+        Returns:
+            tuple: (letter, candidate count), with letter None when no
+            word matches or every letter has been guessed
+        """
+        candidates = self.filter(pattern, guessed_letters)
+        count = candidates.bit_count()
+        if not count:
+            return None, 0
+        if count > SOLVER_EXACT_LIMIT and self.sample is not None:
+            letter, _ = self.sample.suggest(pattern, guessed_letters)
+            if letter is not None:
+                return letter, count
+        if count * SOLVER_COMPACT_RATIO <= self.count:
+            # Small candidate sets are cheaper to re-index than to split
+            return HangmanSolver(self.candidate_words(candidates),
+                                 self.length).suggest(pattern, guessed_letters)
+        
+        hidden_positions = [position for position, shown in enumerate(pattern)
+                            if shown == '_']
+        best, best_score = None, None
+        for letter in string.ascii_lowercase:
+            if letter in guessed_letters:
+                continue
+            gain = 0.0
+            for size in self._outcome_sizes(candidates, letter, hidden_positions):
+                gain -= size / count * math.log2(size / count)
+            score = (gain, (candidates & self.contains[letter]).bit_count())
+            if best_score is None or score > best_score:
+                best, best_score = letter, score
+        return best, count
+
+class ScoreStore:
+    """
+    SQLite score history with per-player and per-difficulty leaderboards.
+    
+    The database runs in WAL mode, so games in other processes can read
+    while one writes, and each write is an atomic transaction, so a crash
+    never leaves a half-written file. Writers wait for each other's locks
+    instead of failing. Leaderboard queries are answered from indexes on
+    (difficulty, score) and (player, difficulty, score).
+    """
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, path=SCORE_DATABASE, batch_size=SCORE_BATCH_SIZE):
+        """
+        Open or create a score database.
+        
+        A new database imports the high score from LEGACY_SCORE_FILE, if
+        that file exists next to it.
+        
+        Args:
+            path (str): Database file
+            batch_size (int): Scores buffered by record() before a write
+        """
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            version, = connection.execute("PRAGMA user_version").fetchone()
+            if version > self.SCHEMA_VERSION:
+                raise ValueError(f"{path} uses a newer score schema ({version})")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    player TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    word TEXT,
+                    played_at REAL NOT NULL
+                )""")
+            # One index per filter combination of top() and best(), so each
+            # leaderboard reads only its first rows from an index
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_by_score "
+                               "ON scores (score DESC, id)")
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_by_difficulty "
+                               "ON scores (difficulty, score DESC)")
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_by_player_score "
+                               "ON scores (player, score DESC, id)")
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_by_player "
+                               "ON scores (player, difficulty, score DESC)")
+            if version == 0:
+                connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+                self._import_legacy(connection, os.path.join(
+                    os.path.dirname(os.path.abspath(path)), LEGACY_SCORE_FILE))
+    
+    @staticmethod
+    def _import_legacy(connection, legacy_path):
+        """Carry over the single high score kept by older versions."""
+        try:
+            with open(legacy_path, 'r') as file:
+                high_score = json.load(file).get('high_score', 0)
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return
+        if high_score:
+            connection.execute(
+                "INSERT INTO scores (player, difficulty, score, played_at) VALUES (?, ?, ?, ?)",
+                ("legacy", "medium", high_score, os.path.getmtime(legacy_path)))
+    
+    def record(self, player, difficulty, score, word=None):
+        """
+        Add a score, written together with others once the batch is full.
+        
+        Args:
+            player (str): Player name
+            difficulty (str): Game difficulty
+            score (int): Points scored
+            word (str): Word that was guessed
+        """
+        with self._lock:
+            self._pending.append((player, difficulty, score, word, time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+    
+    def flush(self):
+        """Write all buffered scores in one transaction."""
+        with self._lock:
+            self._write_pending()
+    
+    def _write_pending(self):
+        if self._pending:
+            with self._connection as connection:
+                connection.executemany(
+                    "INSERT INTO scores (player, difficulty, score, word, played_at) "
+                    "VALUES (?, ?, ?, ?, ?)", self._pending)
+            self._pending.clear()
+    
+    def _query(self, sql, parameters):
+        """Run a read, after writing buffered scores so they are included."""
+        with self._lock:
+            self._write_pending()
+            return self._connection.execute(sql, parameters).fetchall()
+    
+    @staticmethod
+    def _filters(player, difficulty):
+        clauses, parameters = [], []
+        if player is not None:
+            clauses.append("player = ?")
+            parameters.append(player)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            parameters.append(difficulty)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+    
+    def high_score(self, player=None, difficulty=None):
+        """
+        Get the best score, optionally for one player or difficulty.
+        
+        Args:
+            player (str): Player name, or None for everyone
+            difficulty (str): Difficulty, or None for all
+        
+        Returns:
+            int: Best score, or 0 if there is none
+        """
+        where, parameters = self._filters(player, difficulty)
+        (best,), = self._query(f"SELECT MAX(score) FROM scores{where}", parameters)
+        return best or 0
+    
+    def top(self, limit=10, player=None, difficulty=None):
+        """
+        Get a leaderboard.
+        
+        Args:
+            limit (int): Number of entries
+            player (str): Player name, or None for everyone
+            difficulty (str): Difficulty, or None for all
+        
+        Returns:
+            list: (player, difficulty, score, word) tuples, best first
+        """
+        where, parameters = self._filters(player, difficulty)
+        return self._query(
+            f"SELECT player, difficulty, score, word FROM scores{where} "
+            f"ORDER BY score DESC, id LIMIT ?", parameters + [limit])
+    
+    def close(self):
+        """Write buffered scores and close the database."""
+        self.flush()
+        self._connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class FrequencyStrategy:
+    """Guesses letters from most to least common in English."""
+    def guess(self, category, pattern, guessed_letters):
+        """Pick the most common letter not guessed yet."""
+        for letter in LETTER_FREQUENCY_ORDER:
+            if letter not in guessed_letters:
+                return letter
+        return None
+
+class RandomStrategy:
+    """Guesses random letters, as a baseline."""
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng (random.Random): Random source (default: a new one)
+        """
+        self.rng = rng or random.Random()
+
+    def guess(self, category, pattern, guessed_letters):
+        """Pick a random letter not guessed yet."""
+        letters = [letter for letter in string.ascii_lowercase
+                   if letter not in guessed_letters]
+        return self.rng.choice(letters) if letters else None
+
+class SolverStrategy:
+    """Guesses the letter a HangmanSolver suggests."""
+    def __init__(self, word_store):
+        """
+        Args:
+            word_store (WordStore): Store the words are drawn from
+        """
+        self.word_store = word_store
+
+    def guess(self, category, pattern, guessed_letters):
+        """Pick the most informative letter for the category's words."""
+        letter, _ = self.word_store.solver(category, len(pattern)).suggest(
+            pattern, guessed_letters)
+        if letter is None:
+            return FrequencyStrategy().guess(category, pattern, guessed_letters)
+        return letter
+
+def make_strategy(name, word_store, rng=None):
+    """
+    Create a guessing strategy by name.
+    
+    Args:
+        name (str): One of HANGMAN_STRATEGIES
+        word_store (WordStore): Store the words are drawn from
+        rng (random.Random): Random source for the random strategy
+    
+    Returns:
+        Object with a guess(category, pattern, guessed_letters) method
+    """
+    if name == "frequency":
+        return FrequencyStrategy()
+    if name == "random":
+        return RandomStrategy(rng)
+    if name == "solver":
+        return SolverStrategy(word_store)
+    raise ValueError(f"Unknown strategy: {name!r}")
+
+class TerminalRenderer:
+    """
+    Draws game frames on a terminal, rewriting only the lines that changed.
+    
+    The first frame clears the screen. Later frames move the cursor to each
+    changed line with ANSI escape codes and overwrite it, then erase what
+    was printed below the previous frame (prompts, hints). Every frame is
+    sent with a single write. Streams that are not terminals get each
+    frame in full, without escape codes.
+    """
+    CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+    def __init__(self, stream=None, ansi=None):
+        """
+        Args:
+            stream: Text stream to draw on (default: sys.stdout)
+            ansi (bool): Use escape codes (default: if stream is a terminal)
+        """
+        self.stream = stream or sys.stdout
+        if ansi is None:
+            ansi = hasattr(self.stream, 'isatty') and self.stream.isatty()
+            if ansi and os.name == 'nt':
+                # Turns on escape code handling in the Windows console
+                os.system('')
+        self.ansi = ansi
+        self.lines = None
+
+    def reset(self):
+        """Forget the last frame, so the next one is drawn in full."""
+        self.lines = None
+
+    def render(self, lines):
+        """
+        Draw a frame and leave the cursor on the line below it.
+        
+        Args:
+            lines (list): Lines of the frame, without newlines
+        
+        Returns:
+            str: Text written to the stream
+        """
+        previous = self.lines
+        if not self.ansi:
+            text = '\n'.join(lines) + '\n'
+        elif previous is None:
+            text = self.CLEAR_SCREEN + '\n'.join(lines) + '\n'
+        else:
+            parts = [f"\x1b[{row}H{line}\x1b[K"
+                     for row, line in enumerate(lines, 1)
+                     if row > len(previous) or line != previous[row - 1]]
+            # Erase leftover lines of a longer frame and anything printed below it
+            parts.append(f"\x1b[{len(lines) + 1}H\x1b[J")
+            text = ''.join(parts)
+        self.lines = list(lines)
+        self.stream.write(text)
+        self.stream.flush()
+        return text
 
 class HangmanGame:
     """
@@ -29,9 +811,9 @@ class HangmanGame:
         ]
     }
 
-    # Detailed ASCII art for hangman stages
+    # Detailed ASCII art for hangman stages, from no wrong guesses to the
+    # full figure; _stage_index spreads them over the allowed attempts
     HANGMAN_STAGES = [
-        # More detailed ASCII art for each stage of the hangman
         """\
     ╔═══════════╗
     ║           |
@@ -50,21 +832,140 @@ class HangmanGame:
     ║           
     ║           
     ╚═══════════╩═════""",
-        # ... (rest of the stages would be similarly detailed)
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║           |
+    ║           
+    ║           
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║          /|
+    ║           
+    ║           
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║          /|\\
+    ║           
+    ║           
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║          /|\\
+    ║           |
+    ║           
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║          /|\\
+    ║           |
+    ║          / 
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           O
+    ║          /|\\
+    ║           |
+    ║          / \\
+    ║           
+    ╚═══════════╩═════""",
+        """\
+    ╔═══════════╗
+    ║           |
+    ║           X
+    ║          /|\\
+    ║           |
+    ║          / \\
+    ║           
+    ╚═══════════╩═════""",
     ]
 
-    def __init__(self, difficulty="medium"):
+    # Store built from WORD_CATEGORIES on first use
+    _default_word_store = None
+
+    def __init__(self, difficulty="medium", word_store=None, ai_player=False,
+                 score_store=None, player="player", renderer=None):
         """
         Initialize the Hangman game with configurable settings.
         
         Args:
             difficulty (str): Game difficulty level 
             (easy, medium, hard) affecting attempts and word selection.
+            word_store (WordStore): Words to play with (default: the
+            built-in WORD_CATEGORIES)
+            ai_player (bool): Let the computer make the guesses
+            score_store (ScoreStore): Where scores are kept (default: a
+            ScoreStore on SCORE_DATABASE, opened when first needed)
+            player (str): Name scores are recorded under
+            renderer (TerminalRenderer): Draws the game (default: a
+            TerminalRenderer on standard output)
         """
         self.difficulty = difficulty
+        self.word_store = word_store or self.default_word_store()
+        self.ai_player = ai_player
+        self.renderer = renderer or TerminalRenderer()
+        self.category = None
+        self.player = player
+        self._score_store = score_store
+        self._owns_score_store = False
         self.max_attempts = self._set_attempts()
         self.score = 0
-        self.high_score = self._load_high_score()
+        # Loaded from the score store when a game is played
+        self.high_score = 0
+
+    @property
+    def score_store(self):
+        """
+        Get the score store, opening the default one on first use.
+        
+        Games that never record or show scores, such as headless ones,
+        never touch the database.
+        
+        Returns:
+            ScoreStore: Where scores are kept
+        """
+        if self._score_store is None:
+            self._score_store = ScoreStore()
+            self._owns_score_store = True
+        return self._score_store
+
+    def close(self):
+        """
+        Close the score store if this game opened it.
+        """
+        if self._owns_score_store:
+            self._score_store.close()
+            self._score_store = None
+            self._owns_score_store = False
+
+    @classmethod
+    def default_word_store(cls):
+        """
+        Get the in-memory store of the built-in word categories.
+        
+        Returns:
+            WordStore: Store shared by all games
+        """
+        if cls._default_word_store is None:
+            cls._default_word_store = WordStore.from_categories(cls.WORD_CATEGORIES)
+        return cls._default_word_store
 
     def _set_attempts(self):
         """
@@ -82,24 +983,20 @@ class HangmanGame:
 
     def _load_high_score(self):
         """
-        Load high score from a JSON file.
+        Load the best score for this difficulty from the score store.
         
         Returns:
             int: Highest score achieved previously.
         """
-        try:
-            with open('hangman_scores.json', 'r') as file:
-                scores = json.load(file)
-                return scores.get('high_score', 0)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return 0
+        return self.score_store.high_score(difficulty=self.difficulty)
 
-    def _save_high_score(self):
+    def _save_high_score(self, word=None):
         """
-        Save the current high score to a JSON file.
+        Record the current score in the score store.
         """
-        with open('hangman_scores.json', 'w') as file:
-            json.dump({'high_score': max(self.score, self.high_score)}, file)
+        self.score_store.record(self.player, self.difficulty, self.score, word)
+        self.score_store.flush()
+        self.high_score = max(self.score, self.high_score)
 
     def choose_word_category(self):
         """
@@ -108,17 +1005,28 @@ class HangmanGame:
         Returns:
             str: Chosen category of words.
         """
+        categories = self.word_store.categories
         print("\n--- Word Categories ---")
-        for idx, category in enumerate(self.WORD_CATEGORIES.keys(), 1):
+        for idx, category in enumerate(categories, 1):
             print(f"{idx}. {category.capitalize()}")
         
         while True:
             try:
                 choice = int(input("\nChoose a category (number): "))
-                category = list(self.WORD_CATEGORIES.keys())[choice - 1]
-                return random.choice(self.WORD_CATEGORIES[category])
+                if choice < 1:
+                    raise IndexError(choice)
+                category = categories[choice - 1]
             except (ValueError, IndexError):
                 print("Invalid category. Try again.")
+                continue
+            # Prefer words matching the difficulty, if the category has any
+            word = self.word_store.random_word(category, self.difficulty)
+            if word is None:
+                word = self.word_store.random_word(category)
+            if word is not None:
+                self.category = category
+                return word
+            print("That category has no words. Try again.")
 
     def play(self):
         """
@@ -126,65 +1034,181 @@ class HangmanGame:
         """
         # Word selection with category choice
         word = self.choose_word_category()
+        self.high_score = self._load_high_score()
         guessed_letters = set()
         attempts_left = self.max_attempts
+        message = "--- Hangman Game Started ---"
         
-        print("\n--- Hangman Game Started ---")
-        
+        # The last guess's outcome stays on screen as part of the next
+        # frame, so there is no need to pause before redrawing
+        self.renderer.reset()
         while attempts_left > 0:
-            # Clear screen for clean display
-            os.system('cls' if os.name == 'nt' else 'clear')
-            
             # Display game state
-            self._display_game_state(word, guessed_letters, attempts_left)
+            self._display_game_state(word, guessed_letters, attempts_left, message)
             
-            # Player guess input
-            guess = self._get_player_guess(guessed_letters)
+            # Player or computer guess input
+            if self.ai_player:
+                guess, _ = self.suggest_letter(word, guessed_letters)
+                time.sleep(AI_TURN_DELAY)
+                message = f"🤖 Computer guesses: {guess}. "
+            else:
+                guess = self._get_player_guess(guessed_letters, word)
+                message = ""
             
-            # Process guess
+            # Process guess; wrong letters are remembered too, so they
+            # cannot be guessed twice and the solver can rule them out
+            guessed_letters.add(guess)
             if guess in word:
-                print("\n✅ Correct guess!")
-                guessed_letters.add(guess)
+                message += "✅ Correct guess!"
                 
                 # Win condition check
                 if set(word) <= guessed_letters:
+                    self._display_game_state(word, guessed_letters, attempts_left, message)
                     self._handle_win(word)
                     break
             else:
                 attempts_left -= 1
-                print(f"\n❌ Wrong guess! {attempts_left} attempts remaining.")
-            
-            # Pause for readability
-            time.sleep(1)
+                message += f"❌ Wrong guess! {attempts_left} attempts remaining."
         
         # Game over handling
         if attempts_left == 0:
+            self._display_game_state(word, guessed_letters, attempts_left, message)
             self._handle_loss(word)
 
-    def _display_game_state(self, word, guessed_letters, attempts_left):
+    def play_headless(self, word, strategy, category=None):
+        """
+        Play one game without input, output or pauses.
+        
+        Follows the same rules as play(), with guesses coming from a
+        strategy. Scores are not recorded.
+        
+        Args:
+            word (str): Secret word
+            strategy: Object with a guess(category, pattern, guessed_letters)
+            method returning a new letter, or None to give up
+            category (str): Category of the word, passed to the strategy
+        
+        Returns:
+            GameResult: Whether the word was found and how many guesses,
+            wrong ones included, it took
+        """
+        positions = {}
+        for index, letter in enumerate(word):
+            positions.setdefault(letter, []).append(index)
+        pattern = ['_'] * len(word)
+        hidden_letters = len(positions)
+        guessed_letters = set()
+        attempts_left = self.max_attempts
+        
+        while attempts_left > 0:
+            guess = strategy.guess(category, ''.join(pattern), guessed_letters)
+            if guess is None or guess in guessed_letters:
+                break
+            guessed_letters.add(guess)
+            found = positions.get(guess)
+            if found:
+                for index in found:
+                    pattern[index] = guess
+                hidden_letters -= 1
+                if not hidden_letters:
+                    return GameResult(True, self.max_attempts - attempts_left,
+                                      len(guessed_letters))
+            else:
+                attempts_left -= 1
+        return GameResult(False, self.max_attempts - attempts_left, len(guessed_letters))
+
+    def _display_game_state(self, word, guessed_letters, attempts_left, message=""):
         """
         Render current game state with hangman art and word progress.
         """
-        # Display hangman stage
-        print(self.HANGMAN_STAGES[self.max_attempts - attempts_left])
+        self.renderer.render(self._game_frame(word, guessed_letters, attempts_left, message))
+
+    def _stage_index(self, attempts_left):
+        """
+        Pick the hangman stage for the wrong guesses made so far.
         
-        # Display word progress
-        display_word = ''.join(
+        Returns:
+            int: Index into HANGMAN_STAGES; the last stage is reached when
+            no attempts are left, whatever the difficulty.
+        """
+        wrong_guesses = self.max_attempts - attempts_left
+        return wrong_guesses * (len(self.HANGMAN_STAGES) - 1) // self.max_attempts
+
+    def _game_frame(self, word, guessed_letters, attempts_left, message=""):
+        """
+        Lines of the game screen.
+        
+        Args:
+            word (str): Secret word
+            guessed_letters (set): Letters guessed so far
+            attempts_left (int): Wrong guesses still allowed
+            message (str): Outcome of the last guess
+        
+        Returns:
+            list: Lines of text, without newlines
+        """
+        # Hangman stage, then word progress
+        lines = self.HANGMAN_STAGES[self._stage_index(attempts_left)].split('\n')
+        lines += [
+            "",
+            f"Word: {self._word_pattern(word, guessed_letters)}",
+            f"Attempts Left: {attempts_left}",
+            f"High Score: {self.high_score}",
+            "",
+            message
+        ]
+        return lines
+
+    @staticmethod
+    def _word_pattern(word, guessed_letters):
+        """
+        Word progress as the player sees it.
+        
+        Returns:
+            str: The word with unguessed letters replaced by '_'.
+        """
+        return ''.join(
             letter if letter in guessed_letters else '_' 
             for letter in word
         )
-        print(f"\nWord: {display_word}")
-        print(f"Attempts Left: {attempts_left}")
-        print(f"High Score: {self.high_score}")
 
-    def _get_player_guess(self, guessed_letters):
+    def suggest_letter(self, word, guessed_letters):
+        """
+        Suggest the most informative next guess.
+        
+        Only what the player can see is used: the category, the revealed
+        pattern and the letters guessed so far.
+        
+        Args:
+            word (str): Secret word, for its pattern
+            guessed_letters (set): Letters guessed so far
+        
+        Returns:
+            tuple: (letter, number of words still possible)
+        """
+        pattern = self._word_pattern(word, guessed_letters)
+        letter, count = None, 0
+        if self.category is not None:
+            letter, count = self.word_store.solver(self.category, len(word)).suggest(
+                pattern, guessed_letters)
+        if letter is None:
+            letter = next((letter for letter in LETTER_FREQUENCY_ORDER
+                           if letter not in guessed_letters), None)
+        return letter, count
+
+    def _get_player_guess(self, guessed_letters, word=None):
         """
         Validate and return player's letter guess.
+        
+        Entering '?' shows a hint for the current word instead.
         """
         while True:
-            guess = input("\nGuess a letter: ").lower()
+            guess = input("\nGuess a letter (? for a hint): ").lower()
             
-            if len(guess) != 1:
+            if guess == '?' and word is not None:
+                letter, count = self.suggest_letter(word, guessed_letters)
+                print(f"💡 Hint: try '{letter}' ({count} possible words)")
+            elif len(guess) != 1:
                 print("Please enter a single letter.")
             elif not guess.isalpha():
                 print("Please enter a valid letter.")
@@ -199,7 +1223,7 @@ class HangmanGame:
         """
         print(f"\n🎉 Congratulations! You guessed the word: {word}")
         self.score += len(word)
-        self._save_high_score()
+        self._save_high_score(word)
 
     def _handle_loss(self, word):
         """
@@ -208,17 +1232,251 @@ class HangmanGame:
         print(f"\n😢 Game Over! The word was: {word}")
         print(f"Your score: {self.score}")
 
-def main():
+class SelfPlayReport:
+    """Win counts of headless games, overall and by category and length."""
+    def __init__(self, difficulty, strategy):
+        """
+        Args:
+            difficulty (str): Difficulty the games were played at
+            strategy (str): Name of the guessing strategy
+        """
+        self.difficulty = difficulty
+        self.strategy = strategy
+        self.games = 0
+        self.wins = 0
+        self.wrong_guesses = 0
+        self.category_games = Counter()
+        self.category_wins = Counter()
+        self.length_games = Counter()
+        self.length_wins = Counter()
+
+    def add(self, category, word, result):
+        """
+        Count one game.
+        
+        Args:
+            category (str): Category of the word
+            word (str): Secret word
+            result (GameResult): Outcome of the game
+        """
+        self.games += 1
+        self.wrong_guesses += result.wrong_guesses
+        self.category_games[category] += 1
+        self.length_games[len(word)] += 1
+        if result.won:
+            self.wins += 1
+            self.category_wins[category] += 1
+            self.length_wins[len(word)] += 1
+
+    def merge(self, other):
+        """
+        Add the counts from another report.
+        
+        Args:
+            other (SelfPlayReport): Report to fold into this one
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.wrong_guesses += other.wrong_guesses
+        self.category_games.update(other.category_games)
+        self.category_wins.update(other.category_wins)
+        self.length_games.update(other.length_games)
+        self.length_wins.update(other.length_wins)
+
+    def as_dict(self):
+        """
+        Convert the report into plain, JSON-serializable data.
+        
+        Returns:
+            dict: Totals plus (wins, games) by category and word length
+        """
+        return {
+            'difficulty': self.difficulty,
+            'strategy': self.strategy,
+            'games': self.games,
+            'wins': self.wins,
+            'wrong_guesses': self.wrong_guesses,
+            'categories': {category: (self.category_wins[category], games)
+                           for category, games in sorted(self.category_games.items())},
+            'lengths': {length: (self.length_wins[length], games)
+                        for length, games in sorted(self.length_games.items())}
+        }
+
+# Word store of a self-play worker process, set by _init_self_play_worker
+_self_play_store = None
+
+def _init_self_play_worker(words_path):
+    """Open the word store once per worker process."""
+    global _self_play_store
+    _self_play_store = WordStore(words_path) if words_path else HangmanGame.default_word_store()
+
+def _self_play_chunk(task):
+    """Worker entry point: play one chunk of games and summarize them."""
+    difficulty, strategy_name, seed, chunk, count = task
+    store = _self_play_store
+    # One stream per chunk keeps results independent of the worker count
+    rng = random.Random(f"{seed}/{difficulty}/{chunk}")
+    game = HangmanGame(difficulty, store)
+    strategy = make_strategy(strategy_name, store, rng)
+    categories = store.categories
+    report = SelfPlayReport(difficulty, strategy_name)
+    for _ in range(count):
+        category = rng.choice(categories)
+        word = (store.random_word(category, difficulty, rng=rng)
+                or store.random_word(category, rng=rng))
+        if word is not None:
+            report.add(category, word, game.play_headless(word, strategy, category))
+    return report
+
+def simulate_games(games, difficulty, strategy="frequency", seed=None, workers=None,
+                   words_path=None, chunk_size=SELF_PLAY_CHUNK_SIZE):
+    """
+    Play many headless games on several processes.
+    
+    Words are drawn like HangmanGame.choose_word_category does: a random
+    category, preferring words of the game's difficulty. Reports are
+    identical for any number of workers.
+    
+    Args:
+        games (int): Number of games
+        difficulty (str): Difficulty, which sets the allowed wrong guesses
+        strategy (str): One of HANGMAN_STRATEGIES
+        seed (int): Seed for word choice and the random strategy
+        workers (int): Number of worker processes (default: CPU count)
+        words_path (str): Word index to play with (default: built-in words)
+        chunk_size (int): Games per worker task
+    
+    Returns:
+        SelfPlayReport: Aggregated results
+    """
+    if strategy not in HANGMAN_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy!r}")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(difficulty, strategy, seed, chunk, min(chunk_size, games - start))
+             for chunk, start in enumerate(range(0, games, chunk_size))]
+    
+    report = SelfPlayReport(difficulty, strategy)
+    if workers == 1:
+        _init_self_play_worker(words_path)
+        for task in tasks:
+            report.merge(_self_play_chunk(task))
+        return report
+    
+    with multiprocessing.Pool(workers, initializer=_init_self_play_worker,
+                              initargs=(words_path,)) as pool:
+        for chunk_report in pool.imap_unordered(_self_play_chunk, tasks):
+            report.merge(chunk_report)
+    return report
+
+def print_self_play_report(report, elapsed):
+    """
+    Print win rates of a self-play run.
+    
+    Args:
+        report (SelfPlayReport): Simulation results
+        elapsed (float): Seconds the run took
+    """
+    games = max(report.games, 1)
+    print(f"\n📊 {report.difficulty.capitalize()}: {report.games} games with the "
+          f"{report.strategy} strategy, {report.games / elapsed:,.0f} games/s")
+    print(f"Win rate: {report.wins / games:.1%}, "
+          f"average wrong guesses: {report.wrong_guesses / games:.2f}")
+    print("By category:")
+    for category, played in sorted(report.category_games.items()):
+        print(f"  {category:<16} {report.category_wins[category] / played:6.1%} of {played}")
+    print("By word length:")
+    for length, played in sorted(report.length_games.items()):
+        print(f"  {length:>4} letters     {report.length_wins[length] / played:6.1%} of {played}")
+
+def default_player_name():
+    """Login name of the current user, or 'player' if it is unknown."""
+    try:
+        return getpass.getuser()
+    except (ImportError, KeyError, OSError):
+        return "player"
+
+def print_leaderboard(entries, difficulty=None):
+    """
+    Print leaderboard entries as a table.
+    
+    Args:
+        entries (list): Rows returned by ScoreStore.top
+        difficulty (str): Difficulty shown in the title, or None for all
+    """
+    print(f"\n🏆 Top scores ({difficulty or 'all difficulties'})")
+    if not entries:
+        print("No scores yet.")
+    for rank, (player, level, score, word) in enumerate(entries, 1):
+        print(f"{rank:>3}. {player:<16} {level:<7} {score:>5}  {word or ''}")
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Advanced Hangman game.")
+    parser.add_argument('--words', metavar='INDEX',
+                        help="play with words from a word index built by --build-words")
+    parser.add_argument('--ai', action='store_true',
+                        help="watch the computer guess using the hint solver")
+    parser.add_argument('--player', default=None,
+                        help="name to record scores under (default: your login name)")
+    parser.add_argument('--scores', default=SCORE_DATABASE, metavar='DATABASE',
+                        help=f"score database (default: {SCORE_DATABASE})")
+    parser.add_argument('--leaderboard', nargs='?', const='all', metavar='DIFFICULTY',
+                        help="show the top scores (for one difficulty) and exit")
+    parser.add_argument('--top', type=int, default=10,
+                        help="leaderboard entries to show (default: 10)")
+    parser.add_argument('--simulate', type=int, metavar='GAMES',
+                        help="play GAMES headless games per difficulty and report win rates")
+    parser.add_argument('--strategy', choices=HANGMAN_STRATEGIES, default='frequency',
+                        help="guessing strategy for --simulate (default: frequency)")
+    parser.add_argument('--difficulty', choices=('easy', 'medium', 'hard'),
+                        help="simulate only this difficulty (default: all)")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes for --simulate (default: CPU count)")
+    parser.add_argument('--seed', type=int, help="random seed for --simulate")
+    parser.add_argument('--build-words', metavar='DIRECTORY',
+                        help="build the --words index from DIRECTORY/<category>.txt "
+                             "word lists and exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main game execution function with difficulty selection.
     """
+    args = parse_args(argv)
+    if args.build_words:
+        if not args.words:
+            raise SystemExit("--build-words requires --words INDEX")
+        with WordStore.build_from_directory(args.build_words, args.words) as store:
+            total = sum(store.count(category) for category in store.categories)
+            print(f"Built {args.words}: {total} words in {len(store.categories)} categories")
+        return
+    
+    if args.simulate is not None:
+        for difficulty in [args.difficulty] if args.difficulty else ['easy', 'medium', 'hard']:
+            started = time.perf_counter()
+            report = simulate_games(args.simulate, difficulty, args.strategy, args.seed,
+                                    args.workers, args.words)
+            print_self_play_report(report, time.perf_counter() - started)
+        return
+    
+    score_store = ScoreStore(args.scores)
+    if args.leaderboard:
+        difficulty = None if args.leaderboard == 'all' else args.leaderboard
+        print_leaderboard(score_store.top(args.top, difficulty=difficulty), difficulty)
+        score_store.close()
+        return
+    
+    player = args.player or default_player_name()
+    word_store = WordStore(args.words) if args.words else None
     print("🎲 Welcome to Advanced Hangman! 🎲")
     
     while True:
         difficulty = input("\nSelect difficulty (easy/medium/hard): ").lower()
         
         if difficulty in ['easy', 'medium', 'hard']:
-            game = HangmanGame(difficulty)
+            game = HangmanGame(difficulty, word_store, args.ai, score_store, player)
             game.play()
             
             play_again = input("\nPlay again? (yes/no): ").lower()
@@ -227,6 +1485,7 @@ def main():
                 break
         else:
             print("Invalid difficulty. Choose easy, medium, or hard.")
+    score_store.close()
 
 if __name__ == "__main__":
     main()